@@ -0,0 +1,186 @@
+"""Compact, array-backed graph of node names, without networkx.
+
+Names are interned to integers in the order they are first seen and edges are stored
+in compressed sparse row form: the successors of node i are
+`out_targets[out_offsets[i]:out_offsets[i + 1]]`, and likewise its predecessors in the
+`in_` arrays. That is a few machine words per node and per edge, instead of networkx's
+dict of dicts, and sorting it needs nothing but the arrays.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+from pipelines._internal import graph
+
+TYPECODE: str = "q"  # signed 64 bit
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """Graph of dependencies, from each node's dependencies to the node."""
+
+    names: list[str]
+    index: dict[str, int]
+    out_offsets: array
+    out_targets: array
+    in_offsets: array
+    in_targets: array
+
+    @classmethod
+    def of(cls, nodes: Iterable[graph.Node]) -> "CSRGraph":
+        """Builds the graph of nodes, including dependencies that are not among them."""
+        index: dict[str, int] = {}
+        names: list[str] = []
+
+        def intern(name: str) -> int:
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            return index[name]
+
+        sources: array = array(TYPECODE)
+        targets: array = array(TYPECODE)
+        for node in nodes:
+            target: int = intern(node.name)
+            for dependency in dict.fromkeys(node.depends_on):
+                sources.append(intern(dependency))
+                targets.append(target)
+        out_offsets, out_targets = _compress(
+            keys=sources, values=targets, size=len(names)
+        )
+        in_offsets, in_targets = _compress(
+            keys=targets, values=sources, size=len(names)
+        )
+        return cls(
+            names=names,
+            index=index,
+            out_offsets=out_offsets,
+            out_targets=out_targets,
+            in_offsets=in_offsets,
+            in_targets=in_targets,
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def successors(self, name: str) -> Iterator[str]:
+        position: int = self.index[name]
+        for target in self.out_targets[
+            self.out_offsets[position] : self.out_offsets[position + 1]
+        ]:
+            yield self.names[target]
+
+    def predecessors(self, name: str) -> Iterator[str]:
+        position: int = self.index[name]
+        for source in self.in_targets[
+            self.in_offsets[position] : self.in_offsets[position + 1]
+        ]:
+            yield self.names[source]
+
+    def in_degree(self, name: str) -> int:
+        position: int = self.index[name]
+        return self.in_offsets[position + 1] - self.in_offsets[position]
+
+    def out_degree(self, name: str) -> int:
+        position: int = self.index[name]
+        return self.out_offsets[position + 1] - self.out_offsets[position]
+
+    @property
+    def roots(self) -> list[str]:
+        return [
+            name
+            for position, name in enumerate(self.names)
+            if self.in_offsets[position] == self.in_offsets[position + 1]
+        ]
+
+    @property
+    def leaves(self) -> list[str]:
+        return [
+            name
+            for position, name in enumerate(self.names)
+            if self.out_offsets[position] == self.out_offsets[position + 1]
+        ]
+
+    def generations(self) -> list[list[str]]:
+        """Names of the nodes by depth, each node one level after its deepest dependency.
+
+        Raises:
+            graph.CycleError: raises if the graph has a dependency cycle.
+        """
+        remaining: array = array(
+            TYPECODE,
+            (
+                self.in_offsets[position + 1] - self.in_offsets[position]
+                for position in range(len(self.names))
+            ),
+        )
+        generation: list[int] = [
+            position for position, count in enumerate(remaining) if count == 0
+        ]
+        generations: list[list[str]] = []
+        while generation:
+            generations.append([self.names[position] for position in generation])
+            following: list[int] = []
+            for position in generation:
+                for target in self.out_targets[
+                    self.out_offsets[position] : self.out_offsets[position + 1]
+                ]:
+                    remaining[target] -= 1
+                    if remaining[target] == 0:
+                        following.append(target)
+            generation = following
+        if sum(len(names) for names in generations) < len(self.names):
+            cyclic: list[str] = [
+                self.names[position]
+                for position, count in enumerate(remaining)
+                if count > 0
+            ]
+            path: list[str] = self._cycle(remaining=remaining)
+            msg = f"Could not sort: {sorted(cyclic)}. Check for dependency cycles: {' -> '.join(path)}."
+            raise graph.CycleError(msg, path=path)
+        return generations
+
+    def _cycle(self, remaining: array) -> list[str]:
+        "Follows dependencies between the nodes left unsorted until one repeats."
+        position: int = next(
+            position for position, count in enumerate(remaining) if count > 0
+        )
+        seen: dict[int, int] = {}  # position: step it was reached at
+        while position not in seen:
+            seen[position] = len(seen)
+            position = next(
+                source
+                for source in self.in_targets[
+                    self.in_offsets[position] : self.in_offsets[position + 1]
+                ]
+                if remaining[source] > 0
+            )
+        cycle: list[int] = list(seen)[seen[position] :][::-1]
+        return [self.names[position] for position in cycle + cycle[:1]]
+
+    def topological_order(self) -> list[str]:
+        """Names of the nodes, each after all of its dependencies.
+
+        Raises:
+            ValueError: raises if the graph has a dependency cycle.
+        """
+        return [name for generation in self.generations() for name in generation]
+
+
+def _compress(keys: array, values: array, size: int) -> tuple[array, array]:
+    "Sorts (key, value) pairs by key with a counting sort, into offsets and values."
+    offsets: array = array(TYPECODE, bytes(array(TYPECODE).itemsize * (size + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for position in range(size):
+        offsets[position + 1] += offsets[position]
+    filled: array = offsets[:-1]
+    packed: array = array(TYPECODE, bytes(array(TYPECODE).itemsize * len(values)))
+    for key, value in zip(keys, values):
+        packed[filled[key]] = value
+        filled[key] += 1
+    return offsets, packed
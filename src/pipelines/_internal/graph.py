@@ -1,11 +1,24 @@
-"Simplified wrapper of nx.DiGraph"
+"""Simplified wrapper of a dependency graph, kept in networkx or in compact arrays.
 
+The "csr" backend never imports networkx, which keeps large generated pipelines small
+in memory and quick to start. Choose it per DAG, or for every DAG with the
+PIPELINES_GRAPH_BACKEND environment variable. `DAG.graph` builds a networkx graph on
+demand with either backend.
+"""
+
+import contextlib
+import functools
 import itertools
-from collections.abc import Iterator
+import os
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
-from typing import Generic, Protocol, TypeVar
+from enum import Enum
+from typing import TYPE_CHECKING, Generic, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    import networkx as nx
 
-import networkx as nx
+    from pipelines._internal import csr
 
 
 class Node(Protocol):
@@ -18,52 +31,418 @@ class Node(Protocol):
 NodeType = TypeVar("NodeType", bound=Node)
 
 
+class Adjacency(Protocol):
+    "Protocol for graphs of node names, like nx.DiGraph."
+
+    def predecessors(self, n: str) -> Iterable[str]: ...
+
+    def successors(self, n: str) -> Iterable[str]: ...
+
+
+class Backends(Enum):
+    NETWORKX = "networkx"
+    CSR = "csr"
+
+
+def default_backend() -> Backends:
+    return Backends(os.environ.get("PIPELINES_GRAPH_BACKEND", Backends.NETWORKX.value))
+
+
+class CycleError(ValueError):
+    "Raised when a dependency would close a cycle, with the cycle as `path`."
+
+    def __init__(self, msg: str, path: list[str]) -> None:
+        super().__init__(msg)
+        self.path = path
+
+
+@dataclass(frozen=True)
+class Reachability:
+    """Ancestors and descendants of every node of a DAG, as bitsets.
+
+    Bit i stands for the node at position i of `names`, in topological order. Each
+    node's bitset includes the node itself, so closures of many nodes are a union of
+    integers instead of a traversal.
+    """
+
+    names: list[str]
+    index: dict[str, int]
+    ancestors: list[int]
+    descendants: list[int]
+
+    @classmethod
+    def of(cls, graph: Adjacency, order: list[str]) -> "Reachability":
+        """Indexes a graph in one pass in topological `order` and one in reverse."""
+        names: list[str] = order
+        index: dict[str, int] = {name: position for position, name in enumerate(names)}
+        ancestors: list[int] = [1 << position for position in range(len(names))]
+        descendants: list[int] = ancestors.copy()
+        for position, name in enumerate(names):
+            for parent in graph.predecessors(name):
+                ancestors[position] |= ancestors[index[parent]]
+        for position in reversed(range(len(names))):
+            for child in graph.successors(names[position]):
+                descendants[position] |= descendants[index[child]]
+        return cls(
+            names=names, index=index, ancestors=ancestors, descendants=descendants
+        )
+
+    def bits(self, names: Iterable[str]) -> int:
+        """Bitset of the given nodes."""
+        bits: int = 0
+        for name in names:
+            bits |= 1 << self.index[name]
+        return bits
+
+    def upstream(self, names: Iterable[str]) -> int:
+        """Bitset of the given nodes and all of their ancestors."""
+        bits: int = 0
+        for name in names:
+            bits |= self.ancestors[self.index[name]]
+        return bits
+
+    def downstream(self, names: Iterable[str]) -> int:
+        """Bitset of the given nodes and all of their descendants."""
+        bits: int = 0
+        for name in names:
+            bits |= self.descendants[self.index[name]]
+        return bits
+
+    def names_of(self, bits: int) -> list[str]:
+        """Names of the nodes in a bitset, in topological order."""
+        names: list[str] = []
+        while bits:
+            lowest: int = bits & -bits
+            names.append(self.names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return names
+
+
 @dataclass
 class DAG(Generic[NodeType]):
-    """DAG Class."""
+    """DAG Class.
+
+    The graph, node map, topological order and the indexes derived from them are built
+    on first use and cached. `add`, `add_dependency` and `remove_dependency` update the
+    graph, node map and order in place, reordering only the nodes between the two ends
+    of a new edge (Pearce and Kelly's dynamic topological sort) and rejecting an edge
+    that would close a cycle before changing anything. `remove` drops the order, and
+    the rest is rebuilt when next needed. After changing `nodes` or a node's
+    dependencies directly, call `invalidate`.
+
+    Cached values are shared between callers and must not be modified.
+    """
 
     nodes: list[NodeType]
-    _graph: nx.DiGraph = field(default_factory=nx.DiGraph)
+    backend: Backends = field(default_factory=default_backend)
 
     def __getitem__(self, key: str) -> NodeType:
         return self.node_map[key]
 
     def __iter__(self) -> Iterator[NodeType]:
-        for node in nx.topological_sort(G=self.graph):
-            yield self.node_map[node]
+        for name in self.order:
+            yield self.node_map[name]
 
-    @property
-    def graph(self) -> nx.DiGraph:
+    @functools.cached_property
+    def graph(self) -> "nx.DiGraph":
         """Internal networkx DiGraph."""
+        import networkx as nx
 
+        graph = nx.DiGraph()
         for node in self.nodes:
-            self._graph.add_node(node_for_adding=node.name)
-            if node.depends_on:
-                self._graph.add_edges_from(
-                    ebunch_to_add=set(
-                        zip(node.depends_on, itertools.repeat(object=node.name))
-                    )
-                )
-        return self._graph
+            self._add_to_graph(graph=graph, node=node)
+        return graph
 
-    @property
+    @functools.cached_property
     def node_map(self) -> dict[str, NodeType]:
         return {node.name: node for node in self.nodes}
 
+    @functools.cached_property
+    def csr_graph(self) -> "csr.CSRGraph":
+        """Array-backed graph of the nodes."""
+        from pipelines._internal import csr
+
+        return csr.CSRGraph.of(nodes=self.nodes)
+
+    @functools.cached_property
+    def order(self) -> list[str]:
+        """Names of the nodes in topological order.
+
+        Raises:
+            ValueError: raises if the graph has a dependency cycle.
+        """
+        if self.backend is Backends.CSR:
+            return self.csr_graph.topological_order()
+        import networkx as nx
+
+        try:
+            return list(nx.topological_sort(G=self.graph))
+        except nx.NetworkXUnfeasible:
+            path: list[str] = [edge[0] for edge in nx.find_cycle(G=self.graph)]
+            msg = f"Could not sort: {' -> '.join(path + path[:1])}. Check for dependency cycles."
+            raise CycleError(msg, path=path + path[:1]) from None
+
+    @functools.cached_property
+    def reachability(self) -> Reachability:
+        """Index of the ancestors and descendants of every node."""
+        return Reachability.of(graph=self._adjacency, order=self.order)
+
+    @functools.cached_property
+    def generations(self) -> list[list[str]]:
+        """Names of the nodes by level, in topological order within each level.
+
+        A node's level is one more than its deepest dependency's, so the nodes of a
+        level only depend on earlier levels and could all run at once.
+        """
+        generations: list[list[str]] = []
+        for name, level in self._levels.items():
+            if level == len(generations):
+                generations.append([])
+            generations[level].append(name)
+        return generations
+
     @property
+    def widths(self) -> list[int]:
+        """Number of nodes at each level, none of which depend on one another."""
+        return [len(generation) for generation in self.generations]
+
+    def level_of(self, name: str) -> int:
+        """Level of a node: 0 for a root, or one more than its deepest dependency's."""
+        return self._levels[name]
+
+    @functools.cached_property
     def roots(self) -> list[str]:
         """Gets roots of DAG."""
+        if self.backend is Backends.CSR:
+            return self.csr_graph.roots
         return [
             node
             for node in self.graph.nodes()
             if self.graph.in_degree(nbunch=node) == 0
         ]
 
-    @property
+    @functools.cached_property
     def leaves(self) -> list[str]:
         """Gets leaf nodes of DAG."""
+        if self.backend is Backends.CSR:
+            return self.csr_graph.leaves
         return [
             node
             for node in self.graph.nodes()
             if self.graph.out_degree(nbunch=node) == 0
         ]
+
+    @functools.cached_property
+    def _positions(self) -> dict[str, int]:
+        return {name: position for position, name in enumerate(self.order)}
+
+    @functools.cached_property
+    def _levels(self) -> dict[str, int]:
+        "Level of every node, in one pass in topological order."
+        adjacency: Adjacency = self._adjacency
+        levels: dict[str, int] = {}
+        for name in self.order:
+            levels[name] = max(
+                (levels[dependency] + 1 for dependency in adjacency.predecessors(name)),
+                default=0,
+            )
+        return levels
+
+    @functools.cached_property
+    def _dependents(self) -> dict[str, list[str]]:
+        dependents: dict[str, list[str]] = {}
+        for node in self.nodes:
+            self._add_dependents(dependents=dependents, node=node)
+        return dependents
+
+    @property
+    def _adjacency(self) -> Adjacency:
+        return self.csr_graph if self.backend is Backends.CSR else self.graph
+
+    def add(self, node: NodeType) -> None:
+        """Adds a node, updating the cached graph and order with just its edges.
+
+        Raises:
+            CycleError: raises, leaving the DAG unchanged, if the node's dependencies already depend on it.
+        """
+        with contextlib.suppress(CycleError):  # a cyclic DAG has no order to check
+            self.order  # noqa: B018
+        self.nodes.append(node)
+        if "node_map" in self.__dict__:
+            self.node_map[node.name] = node
+        if "graph" in self.__dict__:
+            self._add_to_graph(graph=self.graph, node=node)
+        if "_dependents" in self.__dict__:
+            self._add_dependents(dependents=self._dependents, node=node)
+        if "order" in self.__dict__:
+            try:
+                for dependency in dict.fromkeys(node.depends_on):
+                    self._reorder(source=dependency, target=node.name)
+                self._place(name=node.name)
+            except CycleError:
+                self.nodes.pop()
+                self.invalidate()  # drops the caches the node was added to
+                raise
+        self._invalidate_derived()
+
+    def add_dependency(self, name: str, dependency: str) -> None:
+        """Makes node `name` depend on `dependency`, reordering only what it must.
+
+        Args:
+            name (str): name of the node to add the dependency to.
+            dependency (str): name of the node it should depend on.
+
+        Raises:
+            CycleError: raises, leaving the DAG unchanged, if `dependency` already depends on `name`.
+        """
+        node: NodeType = self.node_map[name]
+        if dependency in node.depends_on:
+            return
+        self._reorder(source=dependency, target=name)
+        node.depends_on.append(dependency)
+        if "graph" in self.__dict__:
+            self.graph.add_edge(u_of_edge=dependency, v_of_edge=name)
+        self._dependents.setdefault(dependency, []).append(name)
+        self._invalidate_derived()
+
+    def remove_dependency(self, name: str, dependency: str) -> None:
+        """Stops node `name` depending on `dependency`, which keeps the order valid."""
+        node: NodeType = self.node_map[name]
+        if dependency not in node.depends_on:
+            return
+        node.depends_on[:] = [other for other in node.depends_on if other != dependency]
+        if "graph" in self.__dict__:
+            self.graph.remove_edge(u=dependency, v=name)
+        if "_dependents" in self.__dict__:
+            self._dependents[dependency].remove(name)
+        if dependency not in self.node_map and not self._dependents.get(dependency):
+            self.invalidate()  # nothing refers to the dependency any more
+        self._invalidate_derived()
+
+    def remove(self, name: str) -> None:
+        """Removes a node, updating the cached graph with just its edges.
+
+        A node that others still depend on stays in the graph, without dependencies of
+        its own, as it would if the graph were built without it.
+        """
+        self.nodes[:] = [node for node in self.nodes if node.name != name]
+        if "node_map" in self.__dict__:
+            self.node_map.pop(name, None)
+        if "graph" in self.__dict__ and name in self.graph:
+            graph: "nx.DiGraph" = self.graph
+            dependencies: list[str] = list(graph.predecessors(name))
+            graph.remove_edges_from(
+                ebunch=zip(dependencies, itertools.repeat(object=name))
+            )
+            for candidate in [name, *dependencies]:
+                if (
+                    graph.degree(nbunch=candidate) == 0
+                    and candidate not in self.node_map
+                ):
+                    graph.remove_node(n=candidate)
+        self.__dict__.pop("_dependents", None)
+        self._invalidate_order()
+        self._invalidate_derived()
+
+    def refresh(self) -> None:
+        """Drops every cached value if nodes were added to or removed from `nodes` directly."""
+        if "node_map" in self.__dict__ and len(self.node_map) != len(self.nodes):
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drops every cached value, to be rebuilt from `nodes` when next needed."""
+        for name in ["graph", "node_map", "_dependents"]:
+            self.__dict__.pop(name, None)
+        self._invalidate_order()
+        self._invalidate_derived()
+
+    def _invalidate_order(self) -> None:
+        for name in ["order", "_positions"]:
+            self.__dict__.pop(name, None)
+
+    def _invalidate_derived(self) -> None:
+        for name in [
+            "csr_graph",
+            "reachability",
+            "generations",
+            "_levels",
+            "roots",
+            "leaves",
+        ]:
+            self.__dict__.pop(name, None)
+
+    def _place(self, name: str) -> None:
+        "Appends a node that is not in the order yet, after everything else."
+        if name not in self._positions:
+            self._positions[name] = len(self.order)
+            self.order.append(name)
+
+    def _reorder(self, source: str, target: str) -> None:
+        """Restores the order for a new edge from `source` to `target`.
+
+        Only the nodes placed between the two ends can be out of order: those reachable
+        from `target` are moved after those that reach `source`, within the positions
+        they already take up.
+
+        Raises:
+            CycleError: raises, leaving the order unchanged, if `source` is reachable from `target`.
+        """
+        if source == target:
+            msg = f"Cannot run: {target} after itself."
+            raise CycleError(msg, path=[source, target])
+        self._place(name=source)
+        self._place(name=target)
+        positions: dict[str, int] = self._positions
+        lower, upper = positions[target], positions[source]
+        if lower > upper:
+            return
+
+        forward: dict[str, str | None] = {
+            target: None
+        }  # node: where it was reached from
+        stack: list[str] = [target]
+        while stack:
+            current: str = stack.pop()
+            for dependent in self._dependents.get(current, []):
+                if dependent == source:
+                    path: list[str] = [source, current]
+                    while (previous := forward[path[-1]]) is not None:
+                        path.append(previous)
+                    path = [source] + path[::-1]
+                    msg = f"Cannot run: {target} after: {source} because {source} already runs after {target}: {' -> '.join(path)}."
+                    raise CycleError(msg, path=path)
+                if dependent not in forward and positions[dependent] < upper:
+                    forward[dependent] = current
+                    stack.append(dependent)
+        backward: set[str] = {source}
+        stack = [source]
+        while stack:
+            current = stack.pop()
+            node: NodeType | None = self.node_map.get(current)
+            for dependency in node.depends_on if node is not None else []:
+                if dependency not in backward and positions[dependency] > lower:
+                    backward.add(dependency)
+                    stack.append(dependency)
+
+        moved: list[str] = sorted(backward, key=positions.__getitem__) + sorted(
+            forward, key=positions.__getitem__
+        )
+        for position, name in zip(sorted(positions[name] for name in moved), moved):
+            self.order[position] = name
+            positions[name] = position
+
+    @staticmethod
+    def _add_dependents(dependents: dict[str, list[str]], node: NodeType) -> None:
+        dependents.setdefault(node.name, [])
+        for dependency in dict.fromkeys(node.depends_on):
+            dependents.setdefault(dependency, []).append(node.name)
+
+    @staticmethod
+    def _add_to_graph(graph: "nx.DiGraph", node: NodeType) -> None:
+        graph.add_node(node_for_adding=node.name)
+        if node.depends_on:
+            graph.add_edges_from(
+                ebunch_to_add=set(
+                    zip(node.depends_on, itertools.repeat(object=node.name))
+                )
+            )
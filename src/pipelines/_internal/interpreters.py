@@ -0,0 +1,181 @@
+"Pool of pre-warmed interpreters for running src-only tasks without a cold start."
+
+import importlib
+import io
+import multiprocessing
+import os
+import queue
+import runpy
+import subprocess
+import sys
+import traceback
+from concurrent import futures
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pipelines import runs, timeouts
+
+STREAMS: tuple[str, ...] = ("stdout", "stderr")
+
+
+class _QueueWriter(io.TextIOBase):
+    "Text stream that forwards complete lines to the parent process."
+
+    def __init__(self, output: Any, stream: str) -> None:
+        self._output = output
+        self._stream = stream
+        self._buffer = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._buffer += text
+        if "\n" in self._buffer:
+            lines, _, self._buffer = self._buffer.rpartition("\n")
+            self._output.put((self._stream, lines + "\n"))
+        return len(text)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._output.put((self._stream, self._buffer))
+            self._buffer = ""
+
+
+def _preload(modules: list[str]) -> None:
+    for module in modules:
+        importlib.import_module(name=module)
+
+
+def _exit_code(code: Any) -> int:
+    "Mirrors how the interpreter turns a SystemExit code into a process exit code."
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_src(
+    src: str, output: Any, timeout: float | None = None
+) -> tuple[int, runs.Usage | None]:
+    with timeouts.alarm(seconds=timeout):
+        return runs.measure(_run_script, src, output)
+
+
+def _run_script(src: str, output: Any) -> int:
+    saved_streams = sys.stdout, sys.stderr
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.stdout, sys.stderr = (_QueueWriter(output=output, stream=s) for s in STREAMS)
+    sys.argv = [src]
+    sys.path.insert(0, str(Path(src).parent if Path(src).is_file() else Path(src)))
+    try:
+        runpy.run_path(path_name=src, run_name="__main__")
+        return 0
+    except SystemExit as exit:
+        return _exit_code(code=exit.code)
+    except timeouts.TaskTimeoutError:
+        raise
+    except BaseException:  # noqa: BLE001
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = saved_streams
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        output.put(None)
+
+
+@dataclass
+class WarmInterpreterPool:
+    """Runs src scripts in reusable interpreters that have already imported `preload`.
+
+    Interpreters are forked from a forkserver that imported `preload` once, and each
+    worker imports it again on start in case the forkserver was already running. Output
+    written by a script is streamed back to this process' stdout and stderr as it is
+    produced, and a non-zero exit code raises `subprocess.CalledProcessError`.
+    """
+
+    preload: list[str] = field(default_factory=list)
+    max_workers: int | None = None
+    _manager: Any = field(default=None, init=False, repr=False)
+    _processes: futures.ProcessPoolExecutor | None = field(
+        default=None, init=False, repr=False
+    )
+    _threads: futures.ThreadPoolExecutor | None = field(
+        default=None, init=False, repr=False
+    )
+
+    def __enter__(self) -> "WarmInterpreterPool":
+        workers: int = self.max_workers or os.cpu_count() or 1
+        context = multiprocessing.get_context(method="forkserver")
+        context.set_forkserver_preload(module_names=self.preload)
+        self._manager = context.Manager()
+        self._processes = futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_preload,
+            initargs=(self.preload,),
+        )
+        self._threads = futures.ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="pipelines-interpreters",
+        )
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        if self._threads is not None:
+            self._threads.shutdown()
+        if self._processes is not None:
+            self._processes.shutdown()
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def submit(self, src: Path, timeout: float | None = None) -> futures.Future:
+        """Schedules a src script to run, returning a future for its completion."""
+        if self._threads is None:
+            raise RuntimeError("WarmInterpreterPool must be used as a context manager.")
+        return self._threads.submit(self.run, src, timeout)
+
+    def run(self, src: Path, timeout: float | None = None) -> runs.Usage | None:
+        """Runs a src script in a warm interpreter, streaming its output.
+
+        Args:
+            src (Path): the script.
+            timeout (float | None, optional): seconds after which the script is interrupted with timeouts.TaskTimeoutError. Defaults to None.
+
+        Returns:
+            runs.Usage | None: resources used by the script, or None where they cannot be measured.
+
+        Raises:
+            subprocess.CalledProcessError: raises if the script exits with a non-zero code.
+            timeouts.TaskTimeoutError: raises if the script runs for longer than `timeout`.
+        """
+        if self._processes is None:
+            raise RuntimeError("WarmInterpreterPool must be used as a context manager.")
+        output = self._manager.Queue()
+        result: futures.Future = self._processes.submit(
+            _run_src, str(src), output, timeout
+        )
+        while True:
+            try:
+                item: tuple[str, str] | None = output.get(timeout=0.1)
+            except queue.Empty:
+                if result.done():
+                    break
+                continue
+            if item is None:
+                break
+            stream, text = item
+            getattr(sys, stream).write(text)
+            getattr(sys, stream).flush()
+
+        returncode, usage = result.result()
+        if returncode:
+            raise subprocess.CalledProcessError(
+                returncode=returncode, cmd=["python", str(src)]
+            )
+        return usage
@@ -0,0 +1,195 @@
+"Bookkeeping for running the nodes of a DAG as soon as their dependencies finish."
+
+import heapq
+import itertools
+import statistics
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Generic
+
+from pipelines._internal import graph
+
+
+def expected_durations(
+    names: Iterable[str], durations: Mapping[str, float]
+) -> dict[str, float]:
+    """Expected duration of each node, the mean of the known durations when unknown.
+
+    Falls back to 1 when no durations are known at all.
+    """
+    names = list(names)
+    known: list[float] = [durations[name] for name in names if name in durations]
+    default: float = statistics.fmean(known) if known else 1.0
+    return {name: durations.get(name, default) for name in names}
+
+
+def critical_path_lengths(
+    downstream: Mapping[str, list[str]],
+    upstream: Mapping[str, set[str]],
+    durations: Mapping[str, float],
+) -> dict[str, float]:
+    """Length of the longest path from each node to a leaf, including the node itself.
+
+    Nodes without a duration are weighted by the mean of the known durations, or by 1
+    when none are known, in which case the length is the node's height in the graph.
+
+    Args:
+        downstream (Mapping[str, list[str]]): nodes that depend on each node.
+        upstream (Mapping[str, set[str]]): nodes each node depends on.
+        durations (Mapping[str, float]): expected duration of each node.
+    """
+    expected: dict[str, float] = expected_durations(
+        names=downstream, durations=durations
+    )
+    remaining: dict[str, int] = {name: len(downstream[name]) for name in downstream}
+    stack: list[str] = [name for name, count in remaining.items() if count == 0]
+    lengths: dict[str, float] = {}
+    while stack:
+        name: str = stack.pop()
+        lengths[name] = expected[name] + max(
+            (lengths[child] for child in downstream[name]), default=0.0
+        )
+        for parent in upstream[name]:
+            remaining[parent] -= 1
+            if remaining[parent] == 0:
+                stack.append(parent)
+    return lengths
+
+
+@dataclass
+class Scheduler(Generic[graph.NodeType]):
+    """Tracks which nodes of a DAG are ready, running and done.
+
+    Ready nodes are handed out longest critical path first: the node with the longest
+    chain of expected `durations` between it and a leaf goes first, so long serial
+    chains start early. Without durations this falls back to the node's height.
+
+    Dependencies on nodes that are not part of the DAG are ignored, matching how
+    `graph.DAG` treats a subset of a pipeline's tasks.
+    """
+
+    dag: graph.DAG[graph.NodeType]
+    durations: Mapping[str, float] = field(default_factory=dict)
+    priorities: dict[str, float] = field(init=False)
+    _node_map: dict[str, graph.NodeType] = field(init=False, repr=False)
+    _waiting_on: dict[str, set[str]] = field(init=False, repr=False)
+    _downstream: dict[str, list[str]] = field(init=False, repr=False)
+    _ready: list[tuple[float, int, str]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _order: Iterator[int] = field(
+        default_factory=itertools.count, init=False, repr=False
+    )
+    _running: set[str] = field(default_factory=set, init=False, repr=False)
+    _done: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._node_map = self.dag.node_map
+        self._waiting_on = {
+            name: set(node.depends_on) & self._node_map.keys()
+            for name, node in self._node_map.items()
+        }
+        self._downstream = {name: [] for name in self._node_map}
+        for name, dependencies in self._waiting_on.items():
+            for dependency in dependencies:
+                self._downstream[dependency].append(name)
+        self.priorities = critical_path_lengths(
+            downstream=self._downstream,
+            upstream=self._waiting_on,
+            durations=self.durations,
+        )
+        self._push_ready(
+            names=[name for name, waiting in self._waiting_on.items() if not waiting]
+        )
+
+    @property
+    def finished(self) -> bool:
+        """Whether every node in the DAG is done."""
+        return len(self._done) == len(self._waiting_on)
+
+    @property
+    def has_ready(self) -> bool:
+        """Whether any node is ready to start."""
+        return bool(self._ready)
+
+    @property
+    def running(self) -> set[str]:
+        return set(self._running)
+
+    @property
+    def pending(self) -> set[str]:
+        """Names of the nodes that have not started yet."""
+        return self._waiting_on.keys() - self._running - self._done
+
+    def critical_path(self) -> list[str]:
+        """Names of the nodes on the longest chain of expected durations, in order."""
+        downstream_names: set[str] = {
+            name for names in self._downstream.values() for name in names
+        }
+        path: list[str] = []
+        candidates: list[str] = [
+            name for name in self._downstream if name not in downstream_names
+        ]
+        while candidates:
+            path.append(max(candidates, key=self.priorities.__getitem__))
+            candidates = self._downstream[path[-1]]
+        return path
+
+    def take_ready(
+        self,
+        limit: int | None = None,
+        fits: Callable[[graph.NodeType], bool] | None = None,
+    ) -> Iterator[graph.NodeType]:
+        """Yields ready nodes, marking each one as running.
+
+        Nodes are considered in priority order. A node rejected by `fits` stays ready and
+        is passed over for the next one, so smaller nodes can fill the gap.
+
+        Args:
+            limit (int | None, optional): maximum number of nodes to hand out. Defaults to None.
+            fits (Callable[[graph.NodeType], bool] | None, optional): whether a node can start now, checked just before it would be yielded. Defaults to None.
+        """
+        passed_over: list[tuple[float, int, str]] = []
+        try:
+            while self._ready and (limit is None or limit > 0):
+                item: tuple[float, int, str] = heapq.heappop(self._ready)
+                node: graph.NodeType = self._node_map[item[2]]
+                if fits is not None and not fits(node):
+                    passed_over.append(item)
+                    continue
+                self._running.add(item[2])
+                if limit is not None:
+                    limit -= 1
+                yield node
+        finally:
+            for item in passed_over:
+                heapq.heappush(self._ready, item)
+
+    def take(self, names: list[str]) -> None:
+        """Marks nodes as running before they are ready, to run along with a ready node."""
+        self._running.update(names)
+        self._ready = [item for item in self._ready if item[2] not in self._running]
+        heapq.heapify(self._ready)
+
+    def mark_done(self, name: str) -> list[str]:
+        """Marks a running node as done.
+
+        Returns:
+            list[str]: names of the nodes that became ready as a result.
+        """
+        self._running.discard(name)
+        self._done.add(name)
+        newly_ready: list[str] = []
+        for downstream in self._downstream[name]:
+            self._waiting_on[downstream].discard(name)
+            if not self._waiting_on[downstream] and downstream not in self._running:
+                newly_ready.append(downstream)
+        self._push_ready(names=newly_ready)
+        return newly_ready
+
+    def _push_ready(self, names: list[str]) -> None:
+        for name in names:
+            heapq.heappush(
+                self._ready,
+                (-self.priorities.get(name, 0.0), next(self._order), name),
+            )
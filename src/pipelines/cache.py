@@ -0,0 +1,246 @@
+"Content-addressed cache of task results, and manifests of previous runs."
+
+import datetime
+import decimal
+import enum
+import hashlib
+import inspect
+import json
+import marshal
+import os
+import pickle
+import time
+import types
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from pipelines import task
+
+SUFFIX: str = ".pkl"
+
+
+class FingerprintError(ValueError):
+    "Raised when a task's inputs have no stable encoding to fingerprint."
+
+
+class CacheError(Exception):
+    "Raised when a result cannot be stored."
+
+
+def _source(node: task.Task) -> str:
+    if node.action is not None:
+        try:
+            return inspect.getsource(node.action)
+        except (OSError, TypeError):
+            code: types.CodeType | None = getattr(node.action, "__code__", None)
+            if code is None:  # builtins only change with the interpreter
+                return f"{node.action.__module__}.{node.action.__qualname__}"
+            return marshal.dumps(code).hex()
+    if node.src.is_file():
+        return node.src.read_text()
+    return _directory_digest(directory=node.src)
+
+
+def _directory_digest(directory: Path) -> str:
+    "Digest of the names and contents of the files under a directory."
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*")):
+        relative: Path = path.relative_to(directory)
+        if not path.is_file() or any(
+            part.startswith(".") or part == "__pycache__" for part in relative.parts
+        ):
+            continue
+        digest.update(relative.as_posix().encode())
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _encode(value: Any) -> Any:
+    "JSON encoding of the values JSON has no type for, when it is complete and stable."
+    if isinstance(value, datetime.date | datetime.time | datetime.timedelta):
+        return repr(value)
+    if isinstance(value, Path | enum.Enum | decimal.Decimal):
+        return repr(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, set | frozenset):
+        return sorted(
+            json.dumps(item, sort_keys=True, default=_encode) for item in value
+        )
+    msg = f"Parameter values of type: {type(value).__name__} cannot be fingerprinted. Use JSON types, dates, paths or enums, or run without the cache."
+    raise FingerprintError(msg)
+
+
+def fingerprint(
+    node: task.Task,
+    run_time_parameters: dict[str, Any],
+    upstream_fingerprints: Iterable[str],
+) -> str:
+    """Fingerprints everything a task's result depends on.
+
+    Args:
+        node (task.Task): the task.
+        run_time_parameters (dict[str, Any]): parameters merged over the task's parameters.
+        upstream_fingerprints (Iterable[str]): fingerprints of the task's dependencies.
+
+    Returns:
+        str: hex digest that changes whenever the task's action source, the files of its
+            src directory, merged parameters, dependency list or any upstream
+            fingerprint changes.
+
+    Raises:
+        FingerprintError: raises if a parameter value has no complete, stable encoding, like a DataFrame, whose repr leaves out most of its content.
+    """
+    digest = hashlib.sha256()
+    for part in [
+        _source(node=node),
+        json.dumps(
+            node.parameters | run_time_parameters, sort_keys=True, default=_encode
+        ),
+        json.dumps(sorted(node.depends_on)),
+        *sorted(upstream_fingerprints),
+    ]:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+@dataclass
+class ResultCache:
+    """On disk cache of task results keyed by fingerprint.
+
+    Results are pickled to one file per key. Reading a result refreshes its
+    modification time, and once the cache grows beyond `max_bytes` the least recently
+    used results are evicted.
+    """
+
+    directory: Path
+    max_bytes: int = 2**30
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key=key).exists()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Looks up a result.
+
+        Returns:
+            tuple[bool, Any]: whether the key was found, and the stored result if it was.
+        """
+        path: Path = self._path(key=key)
+        try:
+            with path.open("rb") as f:
+                value: Any = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return False, None
+        self._touch(path=path)
+        self.hits += 1
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a result, evicting least recently used results if over `max_bytes`.
+
+        Raises:
+            CacheError: raises, storing nothing, if the result cannot be pickled.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path: Path = self._path(key=key)
+        partial: Path = path.with_suffix(".partial")
+        try:
+            with partial.open("wb") as f:
+                pickle.dump(value, f)
+        except Exception as exception:  # noqa: BLE001
+            partial.unlink(missing_ok=True)
+            msg = (
+                f"Cannot cache: {value!r} because it cannot be pickled: {exception!r}."
+            )
+            raise CacheError(msg) from exception
+        partial.replace(path)
+        self._touch(path=path)
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes every stored result."""
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> CacheStats:
+        entries: list[Path] = self._entries()
+        return CacheStats(
+            entries=len(entries),
+            size_bytes=sum(path.stat().st_size for path in entries),
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        # explicit timestamps keep ns precision, implicit ones only kernel tick precision
+        now: int = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob(f"*{SUFFIX}"))
+
+    def _evict(self) -> None:
+        entries: list[tuple[int, int, Path]] = sorted(
+            (stat.st_mtime_ns, stat.st_size, path)
+            for path in self._entries()
+            for stat in [path.stat()]
+        )
+        size: int = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            self.evictions += 1
+
+
+@dataclass
+class Manifest:
+    """Fingerprints of the tasks that succeeded in previous runs of a pipeline.
+
+    A task whose fingerprint matches the manifest ran successfully with the same
+    action source, parameters, dependencies and upstream tasks, so its output is
+    still valid.
+    """
+
+    path: Path
+
+    def load(self) -> dict[str, str]:
+        if not self.path.exists():
+            return {}
+        with self.path.open() as f:
+            return json.load(f)
+
+    def save(self, fingerprints: dict[str, str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial: Path = self.path.with_suffix(".partial")
+        with partial.open("w") as f:
+            json.dump(fingerprints, f, indent=2, sort_keys=True)
+        partial.replace(self.path)
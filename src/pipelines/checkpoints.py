@@ -0,0 +1,124 @@
+"""Checkpoints of in-progress runs, so that a failed run can be resumed.
+
+A checkpoint is removed once its run succeeds. Pipelines keep the checkpoints of
+their last `MAX_CHECKPOINTS` failed runs, so failures do not pile up pickled results
+on disk.
+"""
+
+import contextlib
+import pickle
+import sqlite3
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+MAX_CHECKPOINTS: int = 10
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS options (name TEXT PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS results (task_name TEXT PRIMARY KEY, value BLOB NOT NULL);
+"""
+
+
+class CheckpointError(Exception):
+    "Raised when run state cannot be saved."
+
+
+@dataclass
+class Checkpoint:
+    """State of a run, saved to a SQLite database as the run progresses.
+
+    Holds the options the run was started with and the pickled result of every task
+    that completed, each committed as soon as the task finishes so that a crash loses
+    nothing that already ran.
+    """
+
+    path: Path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def start(self, options: dict[str, Any]) -> None:
+        """Saves the options of a new run.
+
+        Raises:
+            CheckpointError: raises, without creating the checkpoint, if the options cannot be pickled.
+        """
+        rows: list[tuple[str, bytes]] = [
+            (name, self._dumps(value=value)) for name, value in options.items()
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO options (name, value) VALUES (?, ?)", rows
+            )
+
+    def options(self) -> dict[str, Any]:
+        with self._connect() as connection:
+            return {
+                name: pickle.loads(value)
+                for name, value in connection.execute("SELECT name, value FROM options")
+            }
+
+    def complete(self, task_name: str, result: Any) -> None:
+        """Saves the result of a completed task.
+
+        Raises:
+            CheckpointError: raises if the result cannot be pickled.
+        """
+        value: bytes = self._dumps(value=result)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (task_name, value) VALUES (?, ?)",
+                (task_name, value),
+            )
+
+    def completed(self) -> dict[str, Any]:
+        """Result of each task that completed, by task name."""
+        with self._connect() as connection:
+            return {
+                task_name: pickle.loads(value)
+                for task_name, value in connection.execute(
+                    "SELECT task_name, value FROM results"
+                )
+            }
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+        with contextlib.suppress(OSError):  # the run directory may hold profiles
+            self.path.parent.rmdir()
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        try:
+            return pickle.dumps(value)
+        except Exception as exception:  # noqa: BLE001
+            msg = f"Cannot checkpoint: {value!r} because it cannot be pickled: {exception!r}."
+            raise CheckpointError(msg) from exception
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.executescript(SCHEMA)
+            with connection:  # commits, or rolls back on error
+                yield connection
+        finally:
+            connection.close()
+
+
+def prune(directory: Path, keep: int = MAX_CHECKPOINTS) -> None:
+    """Removes all but the `keep` most recently written checkpoints under `directory`.
+
+    Args:
+        directory (Path): directory holding a run directory with a checkpoint for each run.
+        keep (int, optional): number of checkpoints to keep. Defaults to MAX_CHECKPOINTS.
+    """
+    saved: list[Path] = sorted(
+        directory.glob("*/checkpoint.sqlite"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in saved[keep:]:
+        Checkpoint(path=path).clear()
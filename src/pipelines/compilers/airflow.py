@@ -1,5 +1,6 @@
 import dataclasses
 import inspect
+import itertools
 import json
 import pathlib
 from dataclasses import dataclass
@@ -8,8 +9,10 @@ from typing import Any
 
 from airflow import models
 from airflow.models import variable
+from airflow.models.mappedoperator import MappedOperator
 from airflow.providers.google.cloud.operators import kubernetes_engine
 from airflow.providers.slack.hooks.slack_webhook import SlackWebhookHook
+from kubernetes.client import models as k8s
 
 from pipelines import pipeline, port, utils
 
@@ -82,10 +85,20 @@ def get_operator(
     parameters: dict[str, Any],
     retries: int = 3,
     retry_delay: timedelta = timedelta(minutes=1),
-) -> kubernetes_engine.GKEStartPodOperator:
-    return kubernetes_engine.GKEStartPodOperator(
-        task_id=task_id,
-        cmds=[
+    cpu: float | None = None,
+    memory: str | None = None,
+    execution_timeout: timedelta | None = None,
+    pool: str | None = None,
+    map_over: dict[str, list[Any]] | None = None,
+) -> kubernetes_engine.GKEStartPodOperator | MappedOperator:
+    requests: dict[str, str] = {
+        resource: str(quantity)
+        for resource, quantity in {"cpu": cpu, "memory": memory}.items()
+        if quantity is not None
+    }
+
+    def get_cmds(parameters: dict[str, Any]) -> list[str]:
+        return [
             "uv",
             "run",
             "python",
@@ -93,7 +106,10 @@ def get_operator(
             f"{action}",
             "--parameters",
             f"{json.dumps(obj=parameters)}",
-        ],
+        ]
+
+    operator_args: dict[str, Any] = dict(
+        task_id=task_id,
         is_delete_operator_pod=True,
         gcp_conn_id="gcp_conn",
         use_internal_ip=True,
@@ -103,6 +119,11 @@ def get_operator(
         log_events_on_failure=True,
         retries=retries,
         retry_delay=retry_delay,
+        execution_timeout=execution_timeout,
+        pool=pool,
+        container_resources=(
+            k8s.V1ResourceRequirements(requests=requests) if requests else None
+        ),
         sla=timedelta(hours=24),
         on_failure_callback=get_slack_alert_from_context,
         on_retry_callback=get_slack_alert_from_context,
@@ -117,6 +138,20 @@ def get_operator(
         name="algo-features",
         image=f"us-west2-docker.pkg.dev/res-nbcupea-mgmt-003/algo-docker/offline:{variable.Variable.get(key='TAG')}",
     )
+    if map_over is None:
+        return kubernetes_engine.GKEStartPodOperator(
+            cmds=get_cmds(parameters=parameters), **operator_args
+        )
+    # one mapped task instance per combination of the mapped values, without an
+    # SLA, which Airflow does not support for mapped tasks
+    return kubernetes_engine.GKEStartPodOperator.partial(
+        **operator_args | {"sla": None}
+    ).expand(
+        cmds=[
+            get_cmds(parameters=parameters | dict(zip(map_over, values)))
+            for values in itertools.product(*map_over.values())
+        ]
+    )
 
 
 # TODO: need abstraction for run time parameters that gets compiled
@@ -124,6 +159,10 @@ def get_operator(
 class Airflow:
     def compile(self, object: object) -> str:
         if isinstance(object, pipeline.Pipeline):
+            if any(task.streams_from is not None for task in object.tasks):
+                raise NotImplementedError(
+                    "Streaming tasks can only run locally, through Pipeline.run."
+                )
             return utils.read_template(
                 template_path=TEMPLATE_PATH
                 / "dag.py.jinja2",  # TODO: should be a function
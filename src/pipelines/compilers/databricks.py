@@ -1,8 +1,9 @@
+import json
 from dataclasses import asdict, dataclass
 
 from databricks.sdk.service import compute, jobs
 
-from pipelines import pipeline, port, task, trigger
+from pipelines import mapping, pipeline, port, task, trigger
 
 
 @dataclass
@@ -32,6 +33,10 @@ class Databricks:
         self, object: object, deploy_args: DatabricksDeploymentArgs
     ) -> jobs.JobSettings:
         if isinstance(object, pipeline.Pipeline):
+            if any(task.streams_from is not None for task in object.tasks):
+                raise NotImplementedError(
+                    "Streaming tasks can only run locally, through Pipeline.run."
+                )
             return jobs.JobSettings(
                 name=object.name,
                 edit_mode=jobs.JobEditMode.UI_LOCKED,
@@ -66,7 +71,34 @@ class Databricks:
             jobs.TaskDependency(task_key=name) for name in task.depends_on
         ]
         cluster_spec = self._get_cluster_spec(deploy_args=deploy_args)
+        timeout_seconds: int | None = (
+            int(task.timeout.total_seconds()) if task.timeout is not None else None
+        )
 
+        if task.map_over is not None:
+            # one iteration per combination of the mapped values, each reading its
+            # values from the {{input}} reference
+            return jobs.Task(
+                task_key=task.name,
+                depends_on=depends_on,
+                for_each_task=jobs.ForEachTask(
+                    inputs=json.dumps(obj=mapping.combinations(map_over=task.map_over)),
+                    task=jobs.Task(
+                        task_key=f"{task.name}_iteration",
+                        libraries=[compute.Library(whl=deploy_args.whl_path)],
+                        python_wheel_task=jobs.PythonWheelTask(
+                            package_name=deploy_args.package_name,
+                            entry_point=task.src.stem,
+                            named_parameters={
+                                parameter: f"{{{{input.{parameter}}}}}"
+                                for parameter in task.map_over
+                            },
+                        ),
+                        new_cluster=cluster_spec,
+                        timeout_seconds=timeout_seconds,
+                    ),
+                ),
+            )
         return jobs.Task(
             task_key=task.name,
             depends_on=depends_on,
@@ -76,6 +108,7 @@ class Databricks:
                 entry_point=task.src.stem,
             ),
             new_cluster=cluster_spec,
+            timeout_seconds=timeout_seconds,
         )
 
     def _get_cluster_spec(self, deploy_args: DatabricksDeploymentArgs):
@@ -57,7 +57,7 @@ class Yaml:
                 raise NotImplementedError
 
     def _task_to_dict(self, task: task.Task) -> dict[str, Any]:
-        return {
+        task_dict: dict[str, Any] = {
             "name": task.name,
             "src": str(task.src),
             "action": (
@@ -68,6 +68,17 @@ class Yaml:
             "retries": task.retries,
             "retry_delay": task.retry_delay.total_seconds(),
         }
+        # optional fields are only written when set
+        for optional in ["cpu", "memory", "streams_from", "pool", "map_over"]:
+            if getattr(task, optional) is not None:
+                task_dict[optional] = getattr(task, optional)
+        if task.timeout is not None:
+            task_dict["timeout"] = task.timeout.total_seconds()
+        if task.reduce is not None:
+            task_dict["reduce"] = task.reduce.__name__
+        if task.tags:
+            task_dict["tags"] = task.tags
+        return task_dict
 
     def _dict_to_task(self, task_dict: dict[str, Any]) -> task.Task:
         action = (
@@ -86,4 +97,22 @@ class Yaml:
             src=Path(task_dict["src"]),
             retries=task_dict.get("retries", 3),
             retry_delay=timedelta(seconds=task_dict.get("retry_delay", 60)),
+            cpu=task_dict.get("cpu"),
+            memory=task_dict.get("memory"),
+            streams_from=task_dict.get("streams_from"),
+            pool=task_dict.get("pool"),
+            map_over=task_dict.get("map_over"),
+            tags=task_dict.get("tags", []),
+            reduce=(
+                search.find_function(
+                    name=task_dict["reduce"], directory=Path(task_dict["src"])
+                )
+                if "reduce" in task_dict
+                else None
+            ),
+            timeout=(
+                timedelta(seconds=task_dict["timeout"])
+                if "timeout" in task_dict
+                else None
+            ),
         )
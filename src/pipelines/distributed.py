@@ -0,0 +1,318 @@
+"""Coordinator and workers for running a pipeline's tasks on several machines.
+
+The coordinator is the worker pool of a `LocalExecutor` run with the "distributed"
+executor: tasks are handed out in the order the run's scheduler makes them ready, to
+whichever worker asks for work next. Workers connect over TCP or a Unix socket, run
+one task at a time and send a heartbeat while it runs. A task whose worker disconnects
+or misses heartbeats for `heartbeat_timeout` seconds is handed to another worker.
+
+Start workers on each machine, pointing at the address the run listens on:
+
+    python -m pipelines.distributed --address coordinator-host:7000
+
+Messages are pickled, so workers must share the pipeline's code and the coordinator's
+authkey, set with the PIPELINES_AUTHKEY environment variable. A coordinator that
+other machines can reach refuses to start without it. One listening on a loopback
+address or a Unix socket generates a random authkey when it is unset, and logs it
+for its workers.
+"""
+
+import argparse
+import collections
+import contextlib
+import ipaddress
+import itertools
+import os
+import pickle
+import secrets
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent import futures
+from dataclasses import dataclass, field
+from multiprocessing import connection
+from typing import Any
+
+from pipelines import utils
+
+logger = utils.get_logger(name="port")
+
+HEARTBEAT_SECONDS: float = 1.0
+HEARTBEAT_TIMEOUT: float = 10.0
+CONNECT_TIMEOUT: float = 30.0
+_POLL_SECONDS: float = 0.1
+AUTHKEY_VARIABLE: str = "PIPELINES_AUTHKEY"
+
+Address = str | tuple[str, int]
+
+
+def parse_address(address: str) -> Address:
+    """Reads "host:port" as a TCP address, and anything else as a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def is_local(address: Address) -> bool:
+    "Whether only processes on this machine can connect to `address`."
+    if isinstance(address, str):
+        return True
+    host: str = address[0]
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:  # a host name, which may resolve to any interface
+        return False
+
+
+def get_authkey(address: Address | None = None) -> bytes:
+    """Authkey set with PIPELINES_AUTHKEY, or a random one for a local coordinator.
+
+    Args:
+        address (Address | None, optional): where the coordinator listens, or None for a worker, which always needs PIPELINES_AUTHKEY. Defaults to None.
+
+    Returns:
+        bytes: the authkey.
+
+    Raises:
+        ValueError: raises if PIPELINES_AUTHKEY is unset and `address` is None or can be reached from other machines.
+    """
+    authkey: str | None = os.environ.get(AUTHKEY_VARIABLE)
+    if authkey:
+        return authkey.encode()
+    if address is None:
+        msg = f"Set {AUTHKEY_VARIABLE} to the authkey of the coordinator to connect to it."
+        raise ValueError(msg)
+    if not is_local(address=address):
+        msg = f"Set {AUTHKEY_VARIABLE} to a secret shared by the coordinator and its workers to listen on: {address}."
+        raise ValueError(msg)
+    return secrets.token_hex(16).encode()
+
+
+@dataclass
+class _Call:
+    id: int
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: futures.Future = field(default_factory=futures.Future)
+
+
+@dataclass
+class Coordinator(futures.Executor):
+    """Executor that hands submitted calls to remote workers as they ask for work.
+
+    Listens on `address` from the moment it is entered as a context manager. Without
+    an `authkey` it uses `get_authkey` for its address.
+    """
+
+    address: Address = ("localhost", 0)
+    authkey: bytes | None = field(default=None, repr=False)
+    heartbeat_timeout: float = HEARTBEAT_TIMEOUT
+    _pending: collections.deque[_Call] = field(
+        default_factory=collections.deque, init=False, repr=False
+    )
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False
+    )
+    _ids: Iterator[int] = field(default_factory=itertools.count, init=False, repr=False)
+    _stopping: bool = field(default=False, init=False, repr=False)
+    _listener: connection.Listener | None = field(default=None, init=False, repr=False)
+    _threads: list[threading.Thread] = field(
+        default_factory=list, init=False, repr=False
+    )
+
+    def __enter__(self) -> "Coordinator":
+        generated: bool = self.authkey is None and not os.environ.get(AUTHKEY_VARIABLE)
+        if self.authkey is None:
+            self.authkey = get_authkey(address=self.address)
+        self._listener = connection.Listener(address=self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._start_thread(target=self._accept, name="pipelines-coordinator")
+        logger.info(f"Coordinator listening on: {self.address}")
+        if generated:
+            logger.info(
+                f"Start its workers with: {AUTHKEY_VARIABLE}={self.authkey.decode()}"
+            )
+        return self
+
+    def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+        call = _Call(id=next(self._ids), fn=fn, args=args, kwargs=kwargs)
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("Cannot submit to a coordinator that is shut down.")
+            self._pending.append(call)
+            self._condition.notify()
+        return call.future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._condition:
+            self._stopping = True
+            if cancel_futures:
+                for call in self._pending:
+                    call.future.cancel()
+                self._pending.clear()
+            self._condition.notify_all()
+        if self._listener is not None:
+            # wakes the accept loop, which only checks for shutdown between workers
+            with contextlib.suppress(OSError, EOFError):
+                connection.Client(address=self.address, authkey=self.authkey).close()
+            self._listener.close()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout=self.heartbeat_timeout)
+
+    def _start_thread(self, target: Callable[..., None], name: str, *args) -> None:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _accept(self) -> None:
+        while not self._stopping:
+            try:
+                worker: connection.Connection = self._listener.accept()
+            except (OSError, EOFError, connection.AuthenticationError):
+                continue
+            if self._stopping:
+                worker.close()
+                return
+            self._start_thread(self._serve, "pipelines-coordinator-worker", worker)
+
+    def _next_call(self) -> _Call | None:
+        "Waits for a call to hand out, or returns None once shut down."
+        with self._condition:
+            while True:
+                while self._pending:
+                    call: _Call = self._pending.popleft()
+                    if (
+                        call.future.running()
+                        or call.future.set_running_or_notify_cancel()
+                    ):
+                        return call
+                if self._stopping:
+                    return None
+                self._condition.wait()
+
+    def _requeue(self, call: _Call) -> None:
+        with self._condition:
+            self._pending.appendleft(call)
+            self._condition.notify()
+
+    def _serve(self, worker: connection.Connection) -> None:
+        assigned: _Call | None = None
+        try:
+            while True:
+                if not worker.poll(self.heartbeat_timeout):
+                    raise TimeoutError("missed heartbeats")
+                message: tuple[Any, ...] = worker.recv()
+                match message:
+                    case ("ready",):
+                        assigned = self._next_call()
+                        if assigned is None:
+                            worker.send(("stop",))
+                            return
+                        worker.send(
+                            (
+                                "call",
+                                assigned.id,
+                                assigned.fn,
+                                assigned.args,
+                                assigned.kwargs,
+                            )
+                        )
+                    case ("heartbeat", _):
+                        continue
+                    case ("result", call_id, succeeded, value):
+                        if assigned is not None and assigned.id == call_id:
+                            if succeeded:
+                                assigned.future.set_result(value)
+                            else:
+                                assigned.future.set_exception(value)
+                        assigned = None
+        except (OSError, EOFError, TimeoutError) as error:
+            if assigned is not None:
+                logger.warning(
+                    f"Lost the worker running call: {assigned.id} with: {error!r}. Handing it to another worker."
+                )
+                self._requeue(call=assigned)
+        finally:
+            worker.close()
+
+
+def _connect(address: Address, authkey: bytes, timeout: float) -> connection.Connection:
+    deadline: float = time.monotonic() + timeout
+    while True:
+        try:
+            return connection.Client(address=address, authkey=authkey)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(_POLL_SECONDS)
+
+
+def _outcome(running: futures.Future) -> tuple[bool, Any]:
+    "Result of a call, with anything that cannot be sent back replaced by an error."
+    exception: BaseException | None = running.exception()
+    succeeded, value = (
+        (True, running.result()) if exception is None else (False, exception)
+    )
+    try:
+        pickle.dumps(value)
+    except Exception as error:  # noqa: BLE001
+        return False, RuntimeError(f"Cannot send back: {value!r}. {error!r}")
+    return succeeded, value
+
+
+def work(
+    address: Address,
+    authkey: bytes | None = None,
+    heartbeat_seconds: float = HEARTBEAT_SECONDS,
+    connect_timeout: float = CONNECT_TIMEOUT,
+) -> None:
+    """Runs tasks handed out by a coordinator, one at a time, until it shuts down.
+
+    Args:
+        address (Address): where the coordinator listens.
+        authkey (bytes | None, optional): the coordinator's authkey. Defaults to PIPELINES_AUTHKEY.
+        heartbeat_seconds (float, optional): interval between heartbeats while a task runs. Defaults to HEARTBEAT_SECONDS.
+        connect_timeout (float, optional): how long to wait for the coordinator to start listening. Defaults to CONNECT_TIMEOUT.
+
+    Raises:
+        ValueError: raises if there is no `authkey` and PIPELINES_AUTHKEY is unset.
+    """
+    coordinator: connection.Connection = _connect(
+        address=address, authkey=authkey or get_authkey(), timeout=connect_timeout
+    )
+    with coordinator, futures.ThreadPoolExecutor(max_workers=1) as runner:
+        while True:
+            try:
+                coordinator.send(("ready",))
+                message: tuple[Any, ...] = coordinator.recv()
+            except (OSError, EOFError):
+                return
+            if message[0] == "stop":
+                return
+            _, call_id, fn, args, kwargs = message
+            running: futures.Future = runner.submit(fn, *args, **kwargs)
+            while not futures.wait([running], timeout=heartbeat_seconds).done:
+                coordinator.send(("heartbeat", call_id))
+            coordinator.send(("result", call_id, *_outcome(running=running)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=work.__doc__)
+    parser.add_argument(
+        "--address", required=True, help='"host:port", or the path of a Unix socket.'
+    )
+    parser.add_argument("--heartbeat-seconds", type=float, default=HEARTBEAT_SECONDS)
+    arguments = parser.parse_args()
+    work(
+        address=parse_address(address=arguments.address),
+        heartbeat_seconds=arguments.heartbeat_seconds,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1083 @@
+"Local execution backends for running a pipeline's DAG of tasks."
+
+import asyncio
+import collections
+import contextlib
+import functools
+import heapq
+import inspect
+import itertools
+import math
+import os
+import pickle
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent import futures
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from pipelines import cache as cache_base
+from pipelines import checkpoints, distributed
+from pipelines import history as history_base
+from pipelines import (
+    mapping,
+    pools,
+    profiling,
+    resources,
+    runs,
+    streams,
+    task,
+    timeouts,
+    utils,
+)
+from pipelines._internal import graph, interpreters, scheduler
+
+logger = utils.get_logger(name="port")
+
+
+class Executors(Enum):
+    SERIAL = "serial"
+    THREADS = "threads"
+    PROCESSES = "processes"
+    DISTRIBUTED = "distributed"
+
+
+def call_action(
+    action: Callable[..., Any],
+    parameters: dict[str, Any],
+    timeout: float | None = None,
+) -> tuple[Any, runs.Usage | None]:
+    with timeouts.alarm(seconds=timeout):
+        return runs.measure(functools.partial(action, **parameters))
+
+
+def run_src(src: Path, timeout: float | None = None) -> runs.Usage | None:
+    """Runs a src script in a fresh interpreter.
+
+    Args:
+        src (Path): the script.
+        timeout (float | None, optional): seconds after which the interpreter is killed. Defaults to None.
+
+    Returns:
+        runs.Usage | None: resources used by the interpreter, or None on platforms without os.wait4, like Windows.
+
+    Raises:
+        subprocess.CalledProcessError: raises if the script exits with a non-zero code.
+        timeouts.TaskTimeoutError: raises if the interpreter was killed for running longer than `timeout`.
+    """
+    process = subprocess.Popen(["python", src])
+    killed = threading.Event()
+
+    def kill() -> None:
+        killed.set()
+        process.kill()
+
+    killer: threading.Timer | None = None
+    if timeout is not None:
+        killer = threading.Timer(interval=timeout, function=kill)
+        killer.start()
+    usage: runs.Usage | None = None
+    if hasattr(os, "wait4"):
+        # waiting on the pid directly also collects the resource usage of that child only
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        usage = runs.Usage.from_rusage(usage=rusage)
+    else:
+        process.wait()
+    if killer is not None:
+        killer.cancel()
+    if killed.is_set() and process.returncode:
+        msg = f"Timed out after {timeout}s."
+        raise timeouts.TaskTimeoutError(msg)
+    if process.returncode:
+        raise subprocess.CalledProcessError(
+            returncode=process.returncode, cmd=["python", str(src)]
+        )
+    return usage
+
+
+def backoff_seconds(retry_delay: timedelta, attempt: int) -> float:
+    """Seconds to wait before retrying a task that failed on attempt number `attempt`.
+
+    The delay doubles with every attempt, and half of it is randomised so that tasks
+    which failed together do not all retry at the same moment.
+    """
+    backoff: float = retry_delay.total_seconds() * 2 ** (attempt - 1)
+    return backoff / 2 + random.uniform(0, backoff / 2)
+
+
+def _seconds(duration: timedelta | None) -> float | None:
+    return duration.total_seconds() if duration is not None else None
+
+
+def stop_pool(pool: futures.Executor) -> None:
+    """Shuts a pool down without waiting for the calls still running in it.
+
+    Worker processes are terminated, since a call cannot be stopped otherwise. Threads
+    cannot be stopped at all, and keep running their call in the background.
+    """
+    if isinstance(pool, futures.ProcessPoolExecutor):
+        # no public way to stop a running call before Python 3.14's terminate_workers
+        for process in list(pool._processes.values()):  # noqa: SLF001
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def validate_picklable(
+    task_name: str,
+    action: Callable[..., Any] | None,
+    parameters: dict[str, Any],
+) -> None:
+    """Checks that a task's action and parameters can be shipped to a worker process.
+
+    Raises:
+        ValueError: raises if the action or any parameter cannot be pickled.
+    """
+    for description, candidate in [("action", action)] + [
+        (f"parameter: {key}", value) for key, value in parameters.items()
+    ]:
+        try:
+            pickle.dumps(candidate)
+        except Exception as exception:  # noqa: BLE001
+            msg = f"Cannot run task: {task_name} in a worker process because its {description} cannot be pickled: {exception!r}.\nActions must be module level functions."
+            raise ValueError(msg) from exception
+
+
+class _InlineExecutor(futures.Executor):
+    """Runs each submitted call immediately in the calling thread.
+
+    Where a timeout cannot interrupt the calling thread, because it is not the main
+    thread or there is no SIGALRM, each call runs on a thread of its own instead, so
+    that the caller can stop waiting for it.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+        future: futures.Future = futures.Future()
+        if timeouts.can_interrupt():
+            self._call(future, fn, args, kwargs)
+        else:
+            threading.Thread(
+                target=self._call,
+                args=(future, fn, args, kwargs),
+                name="pipelines-serial",
+                daemon=True,
+            ).start()
+        return future
+
+    @staticmethod
+    def _call(
+        future: futures.Future,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exception:  # noqa: BLE001
+            future.set_exception(exception)
+
+
+@dataclass
+class WorkerBudget:
+    """Tasks running in any of the runs that share one set of workers.
+
+    Runs sharing a budget, like the days of a backfill, count each other's running
+    tasks against `LocalExecutor.workers`, `capacity` and `pools`, not just their own.
+    Each running unit of work is kept with the tasks it runs, several for a stream
+    group.
+    """
+
+    running: dict[futures.Future, list[task.Task]] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    # completion queues of the runs using the budget, woken when a slot frees up
+    listeners: list[queue.SimpleQueue] = field(default_factory=list)
+
+    def release(self, future: futures.Future) -> None:
+        with self.lock:
+            if self.running.pop(future, None) is None:
+                return
+            listeners: list[queue.SimpleQueue] = list(self.listeners)
+        for listener in listeners:
+            listener.put(None)
+
+
+@dataclass
+class LocalExecutor:
+    """Runs a DAG of tasks locally, starting each task as soon as its dependencies finish.
+
+    With `retry`, a failed task is retried up to `Task.retries` times with exponential
+    backoff. While it waits out its delay other tasks keep running. Without it, a task
+    fails on its first error. Once a task has no retries left no new tasks are
+    started; tasks already running are allowed to finish before the failure is raised,
+    unless `fail_fast` is set, in which case they are cancelled and the failure is
+    raised straight away.
+
+    An attempt that runs for longer than its `Task.timeout` fails with
+    timeouts.TaskTimeoutError. Actions running in the main thread of a process with
+    SIGALRM, as with the processes executor, or the serial executor when the run is
+    in the main thread, are interrupted by it, and src scripts are killed. Elsewhere
+    the run stops waiting for the attempt, which is left running in the background; a
+    thread cannot be stopped. The serial executor runs each action on a thread of its
+    own when it cannot interrupt it, such as in a backfill's days.
+
+    Cancelled and timed out calls cannot be taken back from a shared `pool`. A run
+    that owns its pool stops it without waiting for them, terminating worker processes.
+
+    With a `cache`, a task whose fingerprint matches a stored result is skipped and
+    the stored result is reused. With a `manifest`, a task whose fingerprint matches
+    the one recorded by a previous successful run is skipped, and the manifest is
+    updated as tasks succeed.
+
+    Ready tasks are started longest critical path first, weighted by each task's
+    typical duration from `history`.
+
+    Tasks that declare `cpu` or `memory` are packed against `capacity`, which defaults
+    to this machine's CPUs and available memory: a ready task only starts while the
+    requests of the running tasks leave room for it, and smaller tasks are started in
+    the meantime. A task that requests more than the whole capacity runs on its own.
+
+    Tasks in a `Task.pool` also take one of the slots in `pools`, the number of tasks
+    of each pool that may run at once. Pools without a size are not limited.
+
+    With a `profile`, the actions of the chosen tasks run under cProfile and/or
+    tracemalloc, in whichever worker runs them.
+
+    Runs share the workers of `pool` when one is given, instead of starting their own.
+    Concurrent runs that also share a `budget` stay within one limit of `workers`, one
+    `capacity` and one set of `pools` between them.
+
+    With a `checkpoint`, the result of each task is saved as soon as it completes, and
+    tasks already completed in the checkpoint are skipped, reusing their result.
+
+    The distributed executor listens on `address` for workers started with
+    `python -m pipelines.distributed`, which pull ready tasks as they have capacity.
+
+    Tasks that stream from each other run together as one unit of work, with at most
+    `stream_depth` batches waiting between two of them. The unit is retried as a whole,
+    as many times as its first task allows, and is never skipped unless every task in
+    it is in the checkpoint.
+
+    A task that maps over parameters runs once for every combination of their values,
+    the instances in parallel, followed by its reduce step, as described in `mapping`.
+    """
+
+    executor: Executors = Executors.SERIAL
+    max_workers: int | None = None
+    preload: list[str] | None = None
+    cache: cache_base.ResultCache | None = None
+    manifest: cache_base.Manifest | None = None
+    history: history_base.History | None = None
+    capacity: resources.Capacity | None = None
+    profile: profiling.Profile | None = None
+    pool: futures.Executor | None = None
+    checkpoint: checkpoints.Checkpoint | None = None
+    stream_depth: int = streams.QUEUE_DEPTH
+    address: distributed.Address | None = None
+    fail_fast: bool = False
+    pools: dict[str, int] = field(default_factory=dict)
+    retry: bool = False
+    budget: WorkerBudget | None = None
+
+    @property
+    def workers(self) -> int:
+        """Number of tasks that may run at the same time."""
+        match self.executor:
+            case Executors.SERIAL:
+                return 1
+            case Executors.THREADS:
+                return self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+            case Executors.PROCESSES:
+                return self.max_workers or os.cpu_count() or 1
+            case Executors.DISTRIBUTED:
+                # ready tasks wait at the coordinator until a worker asks for one
+                return self.max_workers or sys.maxsize
+
+    def run(
+        self,
+        dag: graph.DAG[task.Task],
+        run_time_parameters: dict[str, Any],
+        on_complete: Callable[[task.Task], None],
+        on_attempt: Callable[[runs.TaskAttempt], None] | None = None,
+    ) -> dict[str, Any]:
+        """Runs every task in the DAG.
+
+        Args:
+            dag (graph.DAG[task.Task]): tasks to run.
+            run_time_parameters (dict[str, Any]): parameters merged over each task's parameters.
+            on_complete (Callable[[task.Task], None]): called with each task as it succeeds, in completion order.
+            on_attempt (Callable[[runs.TaskAttempt], None] | None, optional): called with a record of each attempt at running a task as it finishes. Defaults to None.
+
+        Returns:
+            dict[str, Any]: the value returned by each task's action, by task name.
+        """
+        streams.validate(nodes=dag.nodes)
+        mapping.validate(nodes=dag.nodes)
+        pools.validate(nodes=dag.nodes, sizes=self.pools)
+        reductions: dict[str, list[str]] = mapping.reductions(nodes=dag.nodes)
+        dag = graph.DAG(nodes=mapping.expand(nodes=dag.nodes))
+        if self.executor in [Executors.PROCESSES, Executors.DISTRIBUTED]:
+            for node in dag.nodes:
+                validate_picklable(
+                    task_name=node.name,
+                    action=node.action,
+                    parameters=node.parameters | run_time_parameters,
+                )
+
+        with (
+            self._get_interpreters() as warm_interpreters,
+            contextlib.ExitStack() as own_pool,
+        ):
+            pool: futures.Executor = self.pool or own_pool.enter_context(
+                self.open_pool()
+            )
+            run = _Run(
+                executor=self,
+                dag=dag,
+                pool=pool,
+                warm_interpreters=warm_interpreters,
+                run_time_parameters=run_time_parameters,
+                on_complete=on_complete,
+                on_attempt=on_attempt or (lambda attempt: None),
+                reductions=reductions,
+            )
+            try:
+                run.execute()
+            finally:
+                if run.abandoned and self.pool is None:
+                    own_pool.pop_all()  # exiting the pool would wait for them
+                    stop_pool(pool=pool)
+                if self.manifest is not None:
+                    self.manifest.save(fingerprints=run.valid_fingerprints)
+        return run.results
+
+    def open_pool(self) -> futures.Executor:
+        """Starts workers of this executor's kind, `workers` of them."""
+        match self.executor:
+            case Executors.SERIAL:
+                return _InlineExecutor()
+            case Executors.THREADS:
+                return futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="pipelines"
+                )
+            case Executors.PROCESSES:
+                # worker processes are started once and reused for every task in the run
+                return futures.ProcessPoolExecutor(max_workers=self.workers)
+            case Executors.DISTRIBUTED:
+                return distributed.Coordinator(address=self.address or ("localhost", 0))
+
+    def _get_interpreters(
+        self,
+    ) -> contextlib.AbstractContextManager[interpreters.WarmInterpreterPool | None]:
+        if self.preload is None or self.executor is Executors.DISTRIBUTED:
+            return contextlib.nullcontext()
+        return interpreters.WarmInterpreterPool(
+            preload=self.preload, max_workers=self.workers
+        )
+
+
+@dataclass
+class _Run:
+    "State of a single `LocalExecutor.run`."
+
+    executor: LocalExecutor
+    dag: graph.DAG[task.Task]
+    pool: futures.Executor
+    warm_interpreters: interpreters.WarmInterpreterPool | None
+    run_time_parameters: dict[str, Any]
+    on_complete: Callable[[task.Task], None]
+    on_attempt: Callable[[runs.TaskAttempt], None]
+    reductions: dict[str, list[str]] = field(default_factory=dict)
+    instances: dict[str, str] = field(init=False)
+    budget: WorkerBudget = field(init=False)
+    dag_scheduler: scheduler.Scheduler[task.Task] = field(init=False)
+    stream_groups: dict[str, list[task.Task]] = field(init=False)
+    capacity: resources.Capacity = field(init=False)
+    completed: queue.SimpleQueue[futures.Future | None] = field(
+        default_factory=queue.SimpleQueue
+    )
+    in_flight: dict[futures.Future, task.Task] = field(default_factory=dict)
+    deadlines: dict[futures.Future, float] = field(default_factory=dict)
+    abandoned: bool = False
+    skipped: collections.deque[task.Task] = field(default_factory=collections.deque)
+    attempts: collections.Counter[str] = field(default_factory=collections.Counter)
+    retries: list[tuple[float, str, task.Task]] = field(default_factory=list)
+    created: float = field(default_factory=time.time)
+    queued: dict[str, float] = field(default_factory=dict)
+    started: dict[str, float] = field(default_factory=dict)
+    fingerprints: dict[str, str] = field(default_factory=dict)
+    unfingerprinted: set[str] = field(default_factory=set)
+    valid_fingerprints: dict[str, str] = field(default_factory=dict)
+    checkpointed: dict[str, Any] = field(default_factory=dict)
+    results: dict[str, Any] = field(default_factory=dict)
+    failure: BaseException | None = None
+
+    def __post_init__(self) -> None:
+        self.budget = self.executor.budget or WorkerBudget()
+        self.instances = {
+            instance: name
+            for name, instances in self.reductions.items()
+            for instance in instances
+        }
+        self.dag_scheduler = scheduler.Scheduler(
+            dag=self.dag,
+            durations=(
+                self.executor.history.typical_durations()
+                if self.executor.history is not None
+                else {}
+            ),
+        )
+        self.capacity = self.executor.capacity or (
+            resources.Capacity(cpu=math.inf, memory=math.inf)
+            if self.executor.executor is Executors.DISTRIBUTED
+            else resources.machine_capacity()
+        )
+        self.stream_groups = streams.groups(nodes=self.dag.nodes)
+        if self.executor.manifest is not None:
+            self.valid_fingerprints = self.executor.manifest.load()
+        if self.executor.checkpoint is not None:
+            self.checkpointed = self.executor.checkpoint.completed()
+
+    def execute(self) -> None:
+        with self.budget.lock:
+            self.budget.listeners.append(self.completed)
+        try:
+            self._execute()
+        finally:
+            with self.budget.lock:
+                self.budget.listeners.remove(self.completed)
+
+    def _execute(self) -> None:
+        while not self.dag_scheduler.finished:
+            self._expire_deadlines()
+            if self.failure is None:
+                # an inline pool runs actions here, holding up the runs sharing the budget
+                with self.budget.lock:
+                    self._start_due_retries()
+                    for node in self.dag_scheduler.take_ready(
+                        limit=self.executor.workers - len(self.budget.running),
+                        fits=self._fits,
+                    ):
+                        self._start(node=node)
+            if self.skipped:
+                self._mark_done(name=self.skipped.popleft().name)
+                continue
+            if (
+                not self.in_flight
+                and (self.failure is not None or not self.retries)
+                and not self._waiting_for_budget()
+            ):
+                break
+
+            try:
+                future = self.completed.get(timeout=self._seconds_to_wait())
+            except queue.Empty:
+                continue
+            if future is None:  # a run sharing the budget freed a slot
+                continue
+            self.deadlines.pop(future, None)
+            self.budget.release(future=future)
+            node: task.Task | None = self.in_flight.pop(future, None)
+            if node is not None:  # otherwise it timed out or was cancelled
+                self._handle(future=future, node=node)
+
+        if self.failure is not None:
+            raise self.failure
+        if not self.dag_scheduler.finished:
+            msg = f"Could not schedule tasks: {sorted(self.dag_scheduler.pending)}. Check the pipeline for dependency cycles."
+            raise ValueError(msg)
+
+    def _start(self, node: task.Task) -> None:
+        if node.name in self.stream_groups:
+            self._start_stream_group(head=node, members=self.stream_groups[node.name])
+            return
+        if self._skip(node=node):
+            self.skipped.append(node)
+            return
+        self.attempts[node.name] += 1
+        self.started[node.name] = time.time()
+        timeout: float | None = _seconds(duration=node.timeout)
+        if node.action is not None:
+            future: futures.Future = self.pool.submit(
+                call_action,
+                (
+                    self.executor.profile.wrap(task_name=node.name, action=node.action)
+                    if self.executor.profile is not None
+                    else node.action
+                ),
+                self._parameters(node=node),
+                timeout,
+            )
+        elif self.warm_interpreters is not None:
+            future = self.warm_interpreters.submit(src=node.src, timeout=timeout)
+        else:
+            future = self.pool.submit(run_src, node.src, timeout)
+        self._watch(future=future, node=node)
+
+    def _start_stream_group(self, head: task.Task, members: list[task.Task]) -> None:
+        if head.name not in self.attempts:  # the rest of the group starts with its head
+            self.dag_scheduler.take(names=[member.name for member in members[1:]])
+            if all(member.name in self.checkpointed for member in members):
+                for member in members:
+                    logger.info(
+                        f"Task: {member.name} skipped, completed before the run resumed."
+                    )
+                    self._record(node=member, status=runs.Status.SKIPPED)
+                    self.results[member.name] = self.checkpointed[member.name]
+                self.skipped.extend(members)
+                return
+        for member in members:
+            self.attempts[member.name] += 1
+            self.started[member.name] = time.time()
+            # streamed values are never cached, so their descendants always rerun
+            self.unfingerprinted.add(member.name)
+            self.valid_fingerprints.pop(member.name, None)
+        future: futures.Future = self.pool.submit(
+            call_action,
+            streams.run_group,
+            {
+                "members": members,
+                "parameters": {
+                    member.name: member.parameters | self.run_time_parameters
+                    for member in members
+                },
+                "depth": self.executor.stream_depth,
+            },
+            _seconds(duration=head.timeout),
+        )
+        self._watch(future=future, node=head)
+
+    def _parameters(self, node: task.Task) -> dict[str, Any]:
+        "Parameters of a task's action, or the values of its instances for a reduce step."
+        if node.name in self.reductions:
+            return mapping.reduce_parameters(
+                instances=self.reductions[node.name], results=self.results
+            )
+        return node.parameters | self.run_time_parameters
+
+    def _waiting_for_budget(self) -> bool:
+        "Whether ready tasks are only held back by the tasks of runs sharing the budget."
+        with self.budget.lock:
+            return (
+                self.failure is None
+                and self.dag_scheduler.has_ready
+                and bool(self.budget.running)
+            )
+
+    def _watch(self, future: futures.Future, node: task.Task) -> None:
+        self.in_flight[future] = node
+        with self.budget.lock:
+            self.budget.running[future] = self.stream_groups.get(node.name, [node])
+        if node.timeout is not None:
+            self.deadlines[future] = time.monotonic() + node.timeout.total_seconds()
+        future.add_done_callback(self.completed.put)
+
+    def _expire_deadlines(self) -> None:
+        "Fails the attempts that ran past their timeout without reporting back."
+        now: float = time.monotonic()
+        for future, deadline in list(self.deadlines.items()):
+            if deadline > now or future.done() or future not in self.in_flight:
+                continue  # reported back, or cancelled by a failure handled here
+            node: task.Task = self.in_flight.pop(future)
+            del self.deadlines[future]
+            self.budget.release(future=future)
+            future.cancel()
+            self.abandoned = True
+            msg = f"Timed out after {node.timeout.total_seconds()}s."
+            self._fail(node=node, exception=timeouts.TaskTimeoutError(msg))
+
+    def _cancel_in_flight(self) -> None:
+        "Gives up on the running tasks and pending retries of a failed run."
+        for future, node in self.in_flight.items():
+            self.budget.release(future=future)
+            future.cancel()
+            for member in self.stream_groups.get(node.name, [node]):
+                logger.warning(f"Task: {member.name} cancelled, the run failed.")
+                self._record(node=member, status=runs.Status.CANCELLED)
+        self.abandoned = self.abandoned or bool(self.in_flight)
+        self.in_flight.clear()
+        self.deadlines.clear()
+        self.retries.clear()
+
+    def _skip(self, node: task.Task) -> bool:
+        "Whether a task can be skipped because a previous run's output is still valid."
+        if node.name in self.attempts:  # retried, so it was not skipped
+            return False
+        if self.executor.cache is not None or self.executor.manifest is not None:
+            self._fingerprint(node=node)
+        if node.name in self.checkpointed:
+            logger.info(f"Task: {node.name} skipped, completed before the run resumed.")
+            self._record(node=node, status=runs.Status.SKIPPED)
+            self.results[node.name] = self.checkpointed[node.name]
+            return True
+        if self.executor.cache is not None and node.name in self.fingerprints:
+            hit, value = self.executor.cache.get(key=self.fingerprints[node.name])
+            if hit:
+                logger.info(f"Task: {node.name} skipped, reusing cached result.")
+                self._record(node=node, status=runs.Status.SKIPPED)
+                self.results[node.name] = value
+                self._save_checkpoint(node=node)
+                self.on_complete(node)
+                return True
+        if self._unchanged(node=node) and self._reduction_unchanged(node=node):
+            logger.info(f"Task: {node.name} skipped, unchanged since the last run.")
+            self._record(node=node, status=runs.Status.SKIPPED)
+            return True
+        return False
+
+    def _unchanged(self, node: task.Task) -> bool:
+        "Whether a task's fingerprint matches the one it had when it last succeeded."
+        return (
+            node.name in self.fingerprints
+            and self.valid_fingerprints.get(node.name) == self.fingerprints[node.name]
+        )
+
+    def _reduction_unchanged(self, node: task.Task) -> bool:
+        """Whether the reduce step of a mapped task's instance is unchanged as well.
+
+        An instance skipped as unchanged has no result, so the instances of a mapped task
+        are only skipped when its reduce step will not need their results. Instances
+        share their dependencies, which have all finished, so every instance and the
+        reduce step can be fingerprinted as soon as the first instance is ready.
+        """
+        reduce_name: str | None = self.instances.get(node.name)
+        if reduce_name is None:
+            return True
+        for name in [*self.reductions[reduce_name], reduce_name]:
+            if name not in self.fingerprints and name not in self.unfingerprinted:
+                self._fingerprint(node=self.dag[name])
+        return self._unchanged(node=self.dag[reduce_name])
+
+    def _fingerprint(self, node: task.Task) -> None:
+        "Fingerprints a task, unless it or one of its dependencies cannot be fingerprinted."
+        # dependencies have all finished, so those of this run have a fingerprint unless
+        # they could not get one
+        if any(
+            dependency in self.unfingerprinted
+            or (dependency in self.dag.node_map and dependency not in self.fingerprints)
+            for dependency in node.depends_on
+        ):
+            self.unfingerprinted.add(node.name)
+            self.valid_fingerprints.pop(node.name, None)
+            return
+        try:
+            self.fingerprints[node.name] = cache_base.fingerprint(
+                node=node,
+                run_time_parameters=self.run_time_parameters,
+                upstream_fingerprints=[
+                    self.fingerprints[dependency]
+                    for dependency in node.depends_on
+                    if dependency in self.fingerprints
+                ],
+            )
+        except cache_base.FingerprintError as error:
+            logger.warning(f"Task: {node.name} and its descendants will rerun. {error}")
+            self.unfingerprinted.add(node.name)
+            self.valid_fingerprints.pop(node.name, None)
+
+    def _save_checkpoint(self, node: task.Task) -> None:
+        if self.executor.checkpoint is None:
+            return
+        try:
+            self.executor.checkpoint.complete(
+                task_name=node.name, result=self.results[node.name]
+            )
+        except checkpoints.CheckpointError as error:
+            logger.warning(f"Task: {node.name} will rerun if resumed. {error}")
+
+    def _fits(self, node: task.Task) -> bool:
+        "Whether a task's pool slots and resource requests fit next to the running tasks."
+        if not self.budget.running:
+            return True
+        heads: list[task.Task] = [
+            members[0] for members in self.budget.running.values()
+        ]
+        return pools.has_slots(
+            candidates=self.stream_groups.get(node.name, [node]),
+            running=[
+                member for members in self.budget.running.values() for member in members
+            ],
+            sizes=self.executor.pools,
+        ) and self.capacity.fits(
+            cpu=sum(running.cpu or 0 for running in heads) + (node.cpu or 0),
+            memory=sum(
+                resources.parse_memory(quantity=running.memory) for running in heads
+            )
+            + resources.parse_memory(quantity=node.memory),
+        )
+
+    def _start_due_retries(self) -> None:
+        while (
+            self.retries
+            and self.retries[0][0] <= time.monotonic()
+            and len(self.budget.running) < self.executor.workers
+            and self._fits(node=self.retries[0][2])
+        ):
+            self._start(node=heapq.heappop(self.retries)[2])
+
+    def _seconds_to_wait(self) -> float | None:
+        "Seconds until a retry is due or an attempt times out, or None to wait for a task."
+        seconds: list[float] = [
+            max(0.0, deadline - time.monotonic())
+            for deadline in self.deadlines.values()
+        ]
+        if (retry := self._seconds_to_next_retry()) is not None:
+            seconds.append(retry)
+        return min(seconds, default=None)
+
+    def _seconds_to_next_retry(self) -> float | None:
+        if not self.retries:
+            return None
+        if len(self.budget.running) >= self.executor.workers or not self._fits(
+            node=self.retries[0][2]
+        ):
+            return None  # no room until a running task completes
+        return max(0.0, self.retries[0][0] - time.monotonic())
+
+    def _mark_done(self, name: str) -> None:
+        now: float = time.time()
+        for ready in self.dag_scheduler.mark_done(name=name):
+            self.queued[ready] = now
+
+    def _record(
+        self,
+        node: task.Task,
+        status: runs.Status,
+        usage: runs.Usage | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        now: float = time.time()
+        self.on_attempt(
+            runs.TaskAttempt(
+                task_name=node.name,
+                attempt=max(self.attempts[node.name], 1),
+                status=status,
+                queued_at=self.queued.get(node.name, self.created),
+                started_at=self.started.get(node.name, now),
+                finished_at=now,
+                usage=usage,
+                error=repr(error) if error is not None else None,
+            )
+        )
+
+    def _handle(self, future: futures.Future, node: task.Task) -> None:
+        exception: BaseException | None = future.exception()
+        members: list[task.Task] = self.stream_groups.get(node.name, [node])
+        if exception is None:
+            if node.name in self.stream_groups:
+                values, usage = future.result()
+            elif node.action is not None:
+                value, usage = future.result()
+                values = {node.name: value}
+            else:
+                values, usage = {node.name: None}, future.result()
+            for member in members:
+                self._succeed(node=member, value=values[member.name], usage=usage)
+            return
+        self._fail(node=node, exception=exception)
+
+    def _fail(self, node: task.Task, exception: BaseException) -> None:
+        attempt: int = self.attempts[node.name]
+        retries: int = node.retries if self.executor.retry else 0
+        for member in self.stream_groups.get(node.name, [node]):
+            self._record(node=member, status=runs.Status.FAILED, error=exception)
+            self.valid_fingerprints.pop(member.name, None)
+        if isinstance(exception, Exception) and attempt <= retries:
+            delay: float = backoff_seconds(
+                retry_delay=node.retry_delay, attempt=attempt
+            )
+            logger.warning(
+                f"Task: {node.name} failed on attempt {attempt} of {retries + 1} with: {exception!r}. Retrying in {delay:.2f}s."
+            )
+            heapq.heappush(self.retries, (time.monotonic() + delay, node.name, node))
+            self.queued[node.name] = time.time() + delay
+        else:
+            logger.error(
+                f"Task: {node.name} failed on attempt {attempt} of {retries + 1} with: {exception!r}"
+            )
+            self.failure = self.failure or exception
+            if self.executor.fail_fast:
+                self._cancel_in_flight()
+
+    def _succeed(self, node: task.Task, value: Any, usage: runs.Usage | None) -> None:
+        self._record(node=node, status=runs.Status.SUCCEEDED, usage=usage)
+        self.results[node.name] = value
+        if node.name in self.fingerprints:
+            self.valid_fingerprints[node.name] = self.fingerprints[node.name]
+            if self.executor.cache is not None:
+                try:
+                    self.executor.cache.put(
+                        key=self.fingerprints[node.name],
+                        value=self.results[node.name],
+                    )
+                except cache_base.CacheError as error:
+                    logger.warning(f"Task: {node.name} will rerun. {error}")
+        self._save_checkpoint(node=node)
+        self._mark_done(name=node.name)
+        self.on_complete(node)
+
+
+@dataclass
+class AsyncExecutor:
+    """Runs a DAG of tasks on an asyncio event loop.
+
+    Coroutine actions are awaited concurrently, plain functions are offloaded to a
+    bounded thread pool and src tasks run as asyncio subprocesses. At most
+    `max_concurrency` tasks run at once, whatever their kind, and at most as many tasks
+    of a pool as its size in `pools`. With `retry`, failed tasks are retried like in
+    `LocalExecutor`, without holding a concurrency slot while they wait. Mapped tasks
+    are expanded like in `LocalExecutor`.
+
+    An attempt that runs for longer than its `Task.timeout` is cancelled and fails with
+    timeouts.TaskTimeoutError. Cancelling a coroutine interrupts it at its next await
+    and kills a src subprocess, but an action offloaded to the thread pool keeps
+    running in the background. With `fail_fast` the running tasks are cancelled the
+    same way as soon as a task fails for good.
+    """
+
+    max_concurrency: int | None = None
+    max_workers: int | None = None
+    fail_fast: bool = False
+    pools: dict[str, int] = field(default_factory=dict)
+    retry: bool = False
+
+    async def run(
+        self,
+        dag: graph.DAG[task.Task],
+        run_time_parameters: dict[str, Any],
+        on_complete: Callable[[task.Task], None],
+        on_attempt: Callable[[runs.TaskAttempt], None] | None = None,
+    ) -> dict[str, Any]:
+        """Runs every task in the DAG.
+
+        Args:
+            dag (graph.DAG[task.Task]): tasks to run.
+            run_time_parameters (dict[str, Any]): parameters merged over each task's parameters.
+            on_complete (Callable[[task.Task], None]): called with each task as it succeeds, in completion order.
+            on_attempt (Callable[[runs.TaskAttempt], None] | None, optional): called with a record of each attempt at running a task as it finishes. Defaults to None.
+
+        Returns:
+            dict[str, Any]: the value returned by each task's action, by task name.
+        """
+        if any(node.streams_from is not None for node in dag.nodes):
+            raise NotImplementedError(
+                "Streaming tasks can only run with LocalExecutor, through Pipeline.run."
+            )
+        mapping.validate(nodes=dag.nodes)
+        pools.validate(nodes=dag.nodes, sizes=self.pools)
+        reductions: dict[str, list[str]] = mapping.reductions(nodes=dag.nodes)
+        dag = graph.DAG(nodes=mapping.expand(nodes=dag.nodes))
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+        completed: asyncio.Queue[asyncio.Task] = asyncio.Queue()
+        in_flight: dict[asyncio.Task, task.Task] = {}
+        results: dict[str, Any] = {}
+        failure: BaseException | None = None
+        limit: asyncio.Semaphore | None = (
+            asyncio.Semaphore(value=self.max_concurrency)
+            if self.max_concurrency
+            else None
+        )
+        slots: dict[str, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(value=size) for name, size in self.pools.items()
+        }
+
+        pool = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipelines"
+        )
+        try:
+            while not dag_scheduler.finished:
+                if failure is None:
+                    for node in dag_scheduler.take_ready():
+                        running = asyncio.create_task(
+                            self._run_task(
+                                node=node,
+                                parameters=(
+                                    mapping.reduce_parameters(
+                                        instances=reductions[node.name],
+                                        results=results,
+                                    )
+                                    if node.name in reductions
+                                    else node.parameters | run_time_parameters
+                                ),
+                                pool=pool,
+                                limit=limit,
+                                slots=slots.get(node.pool),
+                                retries=node.retries if self.retry else 0,
+                                on_attempt=on_attempt or (lambda attempt: None),
+                            ),
+                            name=node.name,
+                        )
+                        in_flight[running] = node
+                        running.add_done_callback(completed.put_nowait)
+                if not in_flight:
+                    break
+
+                running = await completed.get()
+                node = in_flight.pop(running)
+                if running.cancelled():
+                    continue
+                exception: BaseException | None = running.exception()
+                if exception is not None:
+                    failure = failure or exception
+                    if self.fail_fast:
+                        for sibling in in_flight:
+                            sibling.cancel()
+                else:
+                    results[node.name] = running.result()
+                    dag_scheduler.mark_done(name=node.name)
+                    on_complete(node)
+        finally:
+            # every task has finished, so only abandoned actions can still be running
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if failure is not None:
+            raise failure
+        if not dag_scheduler.finished:
+            msg = f"Could not schedule tasks: {sorted(dag_scheduler.pending)}. Check the pipeline for dependency cycles."
+            raise ValueError(msg)
+        return results
+
+    @classmethod
+    async def _run_task(  # noqa: PLR0913
+        cls,
+        node: task.Task,
+        parameters: dict[str, Any],
+        pool: futures.Executor,
+        limit: asyncio.Semaphore | None,
+        slots: asyncio.Semaphore | None,
+        retries: int,
+        on_attempt: Callable[[runs.TaskAttempt], None],
+    ) -> Any:
+        queued_at: float = time.time()
+        for attempt in itertools.count(start=1):
+            started_at: float = queued_at
+            try:
+                # a pool slot first, so tasks waiting for one don't hold up the others
+                async with (
+                    slots or contextlib.nullcontext(),
+                    limit or contextlib.nullcontext(),
+                ):
+                    started_at = time.time()
+                    value, usage = await cls._attempt_within_timeout(
+                        node=node, parameters=parameters, pool=pool
+                    )
+            except asyncio.CancelledError:
+                logger.warning(f"Task: {node.name} cancelled, the run failed.")
+                on_attempt(
+                    runs.TaskAttempt(
+                        task_name=node.name,
+                        attempt=attempt,
+                        status=runs.Status.CANCELLED,
+                        queued_at=queued_at,
+                        started_at=started_at,
+                        finished_at=time.time(),
+                    )
+                )
+                raise
+            except Exception as exception:
+                on_attempt(
+                    runs.TaskAttempt(
+                        task_name=node.name,
+                        attempt=attempt,
+                        status=runs.Status.FAILED,
+                        queued_at=queued_at,
+                        started_at=started_at,
+                        finished_at=time.time(),
+                        error=repr(exception),
+                    )
+                )
+                if attempt > retries:
+                    logger.error(
+                        f"Task: {node.name} failed on attempt {attempt} of {retries + 1} with: {exception!r}"
+                    )
+                    raise
+                delay: float = backoff_seconds(
+                    retry_delay=node.retry_delay, attempt=attempt
+                )
+                logger.warning(
+                    f"Task: {node.name} failed on attempt {attempt} of {retries + 1} with: {exception!r}. Retrying in {delay:.2f}s."
+                )
+                await asyncio.sleep(delay)
+                queued_at = time.time()
+            else:
+                on_attempt(
+                    runs.TaskAttempt(
+                        task_name=node.name,
+                        attempt=attempt,
+                        status=runs.Status.SUCCEEDED,
+                        queued_at=queued_at,
+                        started_at=started_at,
+                        finished_at=time.time(),
+                        usage=usage,
+                    )
+                )
+                return value
+
+    @classmethod
+    async def _attempt_within_timeout(
+        cls,
+        node: task.Task,
+        parameters: dict[str, Any],
+        pool: futures.Executor,
+    ) -> tuple[Any, runs.Usage | None]:
+        if node.timeout is None:
+            return await cls._attempt(node=node, parameters=parameters, pool=pool)
+        # asyncio.wait rather than asyncio.timeout, which needs Python 3.11, and which
+        # raises the same TimeoutError as an action that times out by itself
+        attempt: asyncio.Task = asyncio.ensure_future(
+            cls._attempt(node=node, parameters=parameters, pool=pool)
+        )
+        try:
+            done, _ = await asyncio.wait(
+                {attempt}, timeout=_seconds(duration=node.timeout)
+            )
+        except asyncio.CancelledError:
+            await cls._cancel(attempt=attempt)
+            raise
+        if done:
+            return attempt.result()
+        await cls._cancel(attempt=attempt)
+        msg = f"Timed out after {node.timeout.total_seconds()}s."
+        raise timeouts.TaskTimeoutError(msg)
+
+    @staticmethod
+    async def _cancel(attempt: asyncio.Task) -> None:
+        "Cancels an attempt and waits for it to clean up, such as killing its interpreter."
+        attempt.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await attempt
+
+    @staticmethod
+    async def _attempt(
+        node: task.Task,
+        parameters: dict[str, Any],
+        pool: futures.Executor,
+    ) -> tuple[Any, runs.Usage | None]:
+        "Runs a task once. Usage is only measured for actions offloaded to the pool."
+        if node.action is None:
+            process = await asyncio.create_subprocess_exec("python", node.src)
+            try:
+                returncode: int = await process.wait()
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                raise
+            if returncode:
+                raise subprocess.CalledProcessError(
+                    returncode=returncode, cmd=["python", str(node.src)]
+                )
+            return None, None
+        if inspect.iscoroutinefunction(node.action):
+            return await node.action(**parameters), None
+        return await asyncio.get_running_loop().run_in_executor(
+            pool, call_action, node.action, parameters
+        )
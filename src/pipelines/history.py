@@ -0,0 +1,276 @@
+"""Persisted history of pipeline runs and task attempts, with duration analytics.
+
+Runs of every pipeline can share one SQLite database, since rows are keyed by pipeline
+name and task name. The scheduler, `Pipeline.plan` and reports all read durations from
+here, and only look at each task's most recent attempts so that old runs age out.
+Each pipeline keeps its last `MAX_RUNS` runs, so the database stays bounded.
+"""
+
+import contextlib
+import math
+import sqlite3
+import statistics
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pipelines import runs
+
+MAX_SAMPLES: int = 20
+MAX_RUNS: int = 1000
+MIN_OUTLIER_SAMPLES: int = 5
+OUTLIER_THRESHOLD: float = 3.5
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    pipeline_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    run_id TEXT NOT NULL,
+    pipeline_name TEXT NOT NULL,
+    task_name TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    queued_at REAL NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    cpu_seconds REAL,
+    peak_rss_bytes INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS attempts_of_task
+    ON attempts (pipeline_name, task_name, finished_at);
+CREATE INDEX IF NOT EXISTS attempts_of_run ON attempts (run_id);
+"""
+
+# runs of a pipeline beyond its most recent ones
+OLD_RUNS: str = """
+SELECT run_id FROM runs WHERE pipeline_name = ?
+ORDER BY started_at DESC LIMIT -1 OFFSET ?
+"""
+
+# most recent attempts of each task with one of the given statuses, oldest first
+RECENT_ATTEMPTS: str = """
+SELECT task_name, status, finished_at - started_at FROM (
+    SELECT *, ROW_NUMBER() OVER (
+        PARTITION BY task_name ORDER BY finished_at DESC
+    ) AS recency
+    FROM attempts
+    WHERE pipeline_name = ? AND status IN ({statuses})
+)
+WHERE recency <= ?
+ORDER BY task_name, finished_at
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class TaskStatistics:
+    """Durations and reliability of a task over its recent attempts.
+
+    Durations are those of successful attempts, in seconds. The trend is the slope of
+    a least squares fit of the durations against their order, in seconds per run, and
+    is None with fewer than two durations.
+    """
+
+    task_name: str
+    samples: int
+    p50_seconds: float | None
+    p95_seconds: float | None
+    failure_rate: float
+    trend_seconds_per_run: float | None
+
+
+@dataclass(frozen=True, slots=True)
+class Outlier:
+    """A task whose latest duration is unusual for it.
+
+    The score is the modified z-score of the latest duration against the ones before
+    it: its distance from their median, in units of their median absolute deviation.
+    """
+
+    task_name: str
+    seconds: float
+    typical_seconds: float
+    score: float
+
+
+@dataclass
+class History:
+    """Runs of a pipeline and every attempt at running its tasks.
+
+    Analytics only use each task's last `max_samples` attempts, and only the last
+    `max_runs` runs are kept.
+    """
+
+    path: Path
+    pipeline_name: str
+    max_samples: int = MAX_SAMPLES
+    max_runs: int = MAX_RUNS
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def record(self, record: runs.RunRecord) -> None:
+        """Saves a finished run and its attempts.
+
+        A resumed run keeps its run id, so its status is updated and the attempts it
+        made are added to the ones from before it was resumed. Runs beyond the last
+        `max_runs` are removed.
+        """
+        with self._lock, self._connect() as connection:  # concurrent runs share it
+            connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+                (
+                    record.run_id,
+                    self.pipeline_name,
+                    record.status.value,
+                    record.started_at,
+                    record.finished_at,
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record.run_id,
+                        self.pipeline_name,
+                        attempt.task_name,
+                        attempt.attempt,
+                        attempt.status.value,
+                        attempt.queued_at,
+                        attempt.started_at,
+                        attempt.finished_at,
+                        attempt.cpu_seconds,
+                        attempt.peak_rss_bytes,
+                        attempt.error,
+                    )
+                    for attempt in record.attempts
+                ],
+            )
+            for table in ("attempts", "runs"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE run_id IN ({OLD_RUNS})",
+                    (self.pipeline_name, self.max_runs),
+                )
+
+    def durations(self) -> dict[str, list[float]]:
+        """Durations of each task's recent successful attempts, oldest first."""
+        durations: dict[str, list[float]] = {}
+        for task_name, _, seconds in self._recent_attempts(
+            statuses=[runs.Status.SUCCEEDED]
+        ):
+            durations.setdefault(task_name, []).append(seconds)
+        return durations
+
+    def typical_durations(self) -> dict[str, float]:
+        """Median recent duration of each task."""
+        return {
+            task_name: statistics.median(samples)
+            for task_name, samples in self.durations().items()
+        }
+
+    def task_statistics(self) -> dict[str, TaskStatistics]:
+        """Duration percentiles, failure rate and duration trend of each task.
+
+        The failure rate is the share of recent attempts that failed, leaving out the
+        ones that were skipped or cancelled.
+        """
+        outcomes: dict[str, list[runs.Status]] = {}
+        for task_name, status, _ in self._recent_attempts(
+            statuses=[runs.Status.SUCCEEDED, runs.Status.FAILED]
+        ):
+            outcomes.setdefault(task_name, []).append(runs.Status(status))
+        durations: dict[str, list[float]] = self.durations()
+        return {
+            task_name: TaskStatistics(
+                task_name=task_name,
+                samples=len(samples := durations.get(task_name, [])),
+                p50_seconds=_percentile(samples=samples, percent=50),
+                p95_seconds=_percentile(samples=samples, percent=95),
+                failure_rate=statuses.count(runs.Status.FAILED) / len(statuses),
+                trend_seconds_per_run=(
+                    statistics.linear_regression(range(len(samples)), samples).slope
+                    if len(samples) > 1
+                    else None
+                ),
+            )
+            for task_name, statuses in outcomes.items()
+        }
+
+    def outliers(self, threshold: float = OUTLIER_THRESHOLD) -> list[Outlier]:
+        """Tasks whose latest duration is far from their typical duration.
+
+        Tasks need `MIN_OUTLIER_SAMPLES` recent durations to be judged, and are skipped
+        when the durations before the latest one do not vary at all.
+
+        Args:
+            threshold (float, optional): smallest modified z-score, either way, that counts as an outlier. Defaults to OUTLIER_THRESHOLD.
+
+        Returns:
+            list[Outlier]: the outliers, most unusual first.
+        """
+        outliers: list[Outlier] = []
+        for task_name, samples in self.durations().items():
+            if len(samples) < MIN_OUTLIER_SAMPLES:
+                continue
+            *previous, latest = samples
+            median: float = statistics.median(previous)
+            deviation: float = statistics.median(
+                abs(sample - median) for sample in previous
+            )
+            if deviation == 0:
+                continue
+            # 0.6745 scales the deviation to a standard deviation for normal data
+            score: float = 0.6745 * (latest - median) / deviation
+            if abs(score) >= threshold:
+                outliers.append(
+                    Outlier(
+                        task_name=task_name,
+                        seconds=latest,
+                        typical_seconds=median,
+                        score=score,
+                    )
+                )
+        return sorted(outliers, key=lambda outlier: -abs(outlier.score))
+
+    def _recent_attempts(
+        self, statuses: list[runs.Status]
+    ) -> list[tuple[str, str, float]]:
+        if not self.path.exists():
+            return []
+        with self._connect() as connection:
+            return connection.execute(
+                RECENT_ATTEMPTS.format(statuses=", ".join("?" * len(statuses))),
+                (
+                    self.pipeline_name,
+                    *(status.value for status in statuses),
+                    self.max_samples,
+                ),
+            ).fetchall()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            connection.executescript(SCHEMA)
+            with connection:  # commits, or rolls back on error
+                yield connection
+        finally:
+            connection.close()
+
+
+def _percentile(samples: list[float], percent: float) -> float | None:
+    "Linearly interpolated percentile, the same as numpy's default method."
+    if not samples:
+        return None
+    ordered: list[float] = sorted(samples)
+    position: float = (len(ordered) - 1) * percent / 100
+    lower: int = math.floor(position)
+    upper: int = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
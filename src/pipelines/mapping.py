@@ -0,0 +1,122 @@
+"""Mapped tasks, whose action runs once for every combination of some parameter values.
+
+A task that maps over parameters is expanded when a run starts, like Airflow's
+`expand`: one instance per combination of the values in `Task.map_over`, each with
+those values merged over the task's parameters. Instances run in parallel like any
+independent tasks, and are followed by a reduce step under the task's own name, so
+that downstream tasks wait for all of them.
+
+The reduce step gets the values returned by the instances, in order, as its `results`
+parameter, and its value is the task's result. Without a `Task.reduce` the result is
+that list. An incremental run only skips the instances of a mapped task when its
+reduce step is skipped too, so the reduce step always gets every instance's value.
+"""
+
+import dataclasses
+import itertools
+from collections.abc import Mapping
+from typing import Any
+
+from pipelines import task
+
+PARAMETER: str = "results"
+
+
+def combinations(map_over: Mapping[str, list[Any]]) -> list[dict[str, Any]]:
+    """Parameters of each instance of a mapped task, the product of the mapped values."""
+    return [
+        dict(zip(map_over, values)) for values in itertools.product(*map_over.values())
+    ]
+
+
+def instance_name(name: str, index: int) -> str:
+    return f"{name}[{index}]"
+
+
+def collect(results: list[Any]) -> list[Any]:
+    "Default reduce step, keeping the value of every instance."
+    return results
+
+
+def validate(nodes: list[task.Task]) -> None:
+    """Checks that mapped tasks have actions, map over lists and do not stream.
+
+    Raises:
+        ValueError: raises if a mapped task has no action, maps over no parameters or over values that are not a list, streams, or if a task that is not mapped has a reduce step.
+    """
+    streamed: set[str] = {
+        node.streams_from for node in nodes if node.streams_from is not None
+    }
+    for node in nodes:
+        if node.map_over is None:
+            if node.reduce is not None:
+                msg = f"Task: {node.name} has a reduce step but does not map over any parameters."
+                raise ValueError(msg)
+            continue
+        if node.action is None:
+            msg = f"Cannot map: {node.name} because it has no action."
+            raise ValueError(msg)
+        if not node.map_over:
+            msg = f"Cannot map: {node.name} over no parameters."
+            raise ValueError(msg)
+        for parameter, values in node.map_over.items():
+            if not isinstance(values, list):
+                msg = f"Cannot map: {node.name} over: {parameter} because its values are a: {type(values).__name__}, not a list."
+                raise ValueError(msg)
+        if node.streams_from is not None or node.name in streamed:
+            msg = f"Cannot map: {node.name} because it streams. Mapped tasks cannot stream to or from other tasks."
+            raise ValueError(msg)
+
+
+def reductions(nodes: list[task.Task]) -> dict[str, list[str]]:
+    """Names of the instances of each mapped task, in order, by the task's name."""
+    return {
+        node.name: [
+            instance_name(name=node.name, index=index)
+            for index in range(len(combinations(map_over=node.map_over)))
+        ]
+        for node in nodes
+        if node.map_over is not None
+    }
+
+
+def expand(nodes: list[task.Task]) -> list[task.Task]:
+    """Replaces each mapped task with its instances, followed by its reduce step.
+
+    Returns:
+        list[task.Task]: the tasks to run, with tasks that are not mapped unchanged.
+    """
+    expanded: list[task.Task] = []
+    for node in nodes:
+        if node.map_over is None:
+            expanded.append(node)
+            continue
+        instances: list[task.Task] = [
+            dataclasses.replace(
+                node,
+                name=instance_name(name=node.name, index=index),
+                parameters=node.parameters | parameters,
+                map_over=None,
+                reduce=None,
+            )
+            for index, parameters in enumerate(combinations(map_over=node.map_over))
+        ]
+        expanded.extend(instances)
+        expanded.append(
+            task.Task(
+                name=node.name,
+                action=node.reduce or collect,
+                depends_on=[instance.name for instance in instances],
+                src=node.src,
+                retries=node.retries,
+                retry_delay=node.retry_delay,
+            )
+        )
+    return expanded
+
+
+def reduce_parameters(
+    instances: list[str], results: Mapping[str, Any]
+) -> dict[str, Any]:
+    """Parameters of a reduce step, from the results of its instances."""
+    return {PARAMETER: [results[name] for name in instances]}
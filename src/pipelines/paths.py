@@ -1,13 +1,53 @@
 import os
+import sys
 from collections.abc import Generator
 from pathlib import Path
 
+APP_NAME: str = "pipelines"
+
+
+def get_user_directory(kind: str) -> Path:
+    """Per-user directory for files the package writes, outside of where it is installed.
+
+    Args:
+        kind (str): "cache" for results that can be rebuilt, "state" for run records.
+
+    Returns:
+        Path: $XDG_CACHE_HOME or $XDG_STATE_HOME, defaulting to ~/.cache and ~/.local/state, or %LOCALAPPDATA% on Windows, followed by "pipelines".
+    """
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+        return base / APP_NAME / kind
+    defaults: dict[str, tuple[str, Path]] = {
+        "cache": ("XDG_CACHE_HOME", Path.home() / ".cache"),
+        "state": ("XDG_STATE_HOME", Path.home() / ".local" / "state"),
+    }
+    variable, default = defaults[kind]
+    return Path(os.environ.get(variable) or default) / APP_NAME
+
 
 def get_path(path_type: str) -> Path:
-    project_root = Path(os.environ.get("PROJECT_ROOT") or Path(__file__).parent.parent)
+    """Directory or file of a kind, under PROJECT_ROOT when it is set.
+
+    Without PROJECT_ROOT, configs and pipelines are looked up next to the package, and
+    the cache and run records go to per-user directories, so that running a pipeline
+    never writes into an installed package.
+    """
+    configured_root: str | None = os.environ.get("PROJECT_ROOT")
+    project_root = Path(configured_root or Path(__file__).parent.parent)
     paths: dict[str, Path] = {
         "configs": project_root / "configs",
         "pipelines": project_root / Path("pipelines"),
+        "cache": (
+            project_root / ".pipelines" / "cache"
+            if configured_root
+            else get_user_directory(kind="cache")
+        ),
+        "runs": (
+            project_root / ".pipelines" / "runs"
+            if configured_root
+            else get_user_directory(kind="state") / "runs"
+        ),
         "dag_jinja": Path(__file__).parent.parent
         / "actions"
         / "orchestrators"
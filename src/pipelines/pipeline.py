@@ -1,11 +1,24 @@
+import collections
+import contextlib
+import dataclasses
+import datetime
+import functools
 import inspect
 import pathlib
-import subprocess
-from collections.abc import Callable
+import uuid
+from collections.abc import Callable, Iterator
+from concurrent import futures
 from dataclasses import dataclass, field
 from typing import Any
 
-from pipelines import adapters, paths, port, task
+from pipelines import adapters
+from pipelines import cache as cache_base
+from pipelines import checkpoints, distributed, executors
+from pipelines import history as history_base
+from pipelines import mapping, paths, plans, port, profiling, resources
+from pipelines import runs as runs_base
+from pipelines import selectors as selectors_base
+from pipelines import streams, task
 from pipelines import trigger as trigger_base
 from pipelines import utils
 from pipelines._internal import graph
@@ -18,30 +31,476 @@ class Pipeline(port.Port):
     name: str
     trigger: trigger_base.Trigger | None = None
     tasks: list[task.Task] = field(default_factory=list)
+    # tasks that succeeded in the most recent run, in completion order
     log: list[task.Task] = field(default_factory=list, init=False, compare=False)
+    # records of the most recent runs, oldest first
+    runs: collections.deque[runs_base.RunRecord] = field(
+        default_factory=lambda: collections.deque(maxlen=runs_base.MAX_RUNS),
+        init=False,
+        compare=False,
+        repr=False,
+    )
+    _dag: graph.DAG[task.Task] | None = field(
+        default=None, init=False, compare=False, repr=False
+    )
 
     def __getitem__(self, key: str) -> task.Task:
         return self.task_dict[key]
 
+    @functools.cached_property
+    def cache(self) -> cache_base.ResultCache:
+        """Local cache of task results, used by `run(use_cache=True)`."""
+        return cache_base.ResultCache(directory=paths.get_path("cache") / self.name)
+
+    @functools.cached_property
+    def manifest(self) -> cache_base.Manifest:
+        """Record of the tasks that succeeded, used by `run(incremental=True)`."""
+        return cache_base.Manifest(
+            path=paths.get_path("runs") / self.name / "manifest.json"
+        )
+
+    @functools.cached_property
+    def history(self) -> history_base.History:
+        """Previous runs and their task attempts, whose durations are used to start long critical paths first."""
+        return history_base.History(
+            path=paths.get_path("runs") / "history.sqlite", pipeline_name=self.name
+        )
+
+    @property
+    def dag(self) -> graph.DAG[task.Task]:
+        """Graph of the tasks, kept up to date by `add_task` and `remove_task`.
+
+        `add_task` updates its topological order in place and rejects a dependency cycle
+        as soon as it is introduced. It is rebuilt when `tasks` is replaced, or when
+        tasks are appended to or removed from it directly. After changing a task's
+        dependencies, or replacing one of the tasks, call `dag.invalidate()`.
+        """
+        if self._dag is None or self._dag.nodes is not self.tasks:
+            self._dag = graph.DAG(nodes=self.tasks)
+        else:
+            self._dag.refresh()
+        return self._dag
+
     @property  # TODO: cache?
     def task_dict(self) -> dict[str, task.Task]:
         return {task.name: task for task in self.tasks}
 
-    def run(
+    def select(self, selectors: str | list[str]) -> list[str]:
+        """Names of the tasks picked by selectors, in the pipeline's order.
+
+        Args:
+            selectors (str | list[str]): task names or selectors: "+name" adds the tasks name depends on, "name+" the tasks that depend on it and "tag:x" picks the tasks tagged x. Space separated selectors are combined into their union, comma separated ones into their intersection.
+
+        Returns:
+            list[str]: the selected task names.
+
+        Raises:
+            ValueError: raises if a selector matches no task.
+        """
+        return [
+            node.name
+            for node in self._get_nodes(
+                task_names=self._convert_to_list(candidate=selectors)
+            )
+        ]
+
+    def _get_nodes(self, task_names: list[str] | None) -> list[task.Task]:
+        if not task_names:
+            return self.tasks
+        return selectors_base.select(
+            selectors=task_names, nodes=self.tasks, dag=self.dag
+        )
+
+    def run(  # noqa: PLR0913
         self,
         run_time_parameters: dict[str, Any] | None = None,
         task_names: list[str] | None = None,
-    ) -> None:
-        nodes: list[task.Task] = (
-            [self.task_dict[name] for name in task_names] if task_names else self.tasks
+        executor: executors.Executors | str = executors.Executors.SERIAL,
+        max_workers: int | None = None,
+        preload: list[str] | None = None,
+        use_cache: bool = False,
+        incremental: bool = False,
+        profile: bool | list[str] = False,
+        profilers: list[profiling.Profilers | str] | None = None,
+        checkpoint: bool = False,
+        address: str | None = None,
+        fail_fast: bool = False,
+        pools: dict[str, int] | None = None,
+        retry: bool = False,
+    ) -> dict[str, Any]:
+        """Runs the pipeline's tasks locally.
+
+        Args:
+            run_time_parameters (dict[str, Any] | None, optional): parameters merged over each task's parameters. Defaults to None.
+            task_names (list[str] | None, optional): subset of tasks to run, by name or by selector, such as "+name" for a task and its upstream tasks. See `select`. Defaults to None.
+            executor (executors.Executors | str, optional): "serial" runs one task at a time, "threads" and "processes" start each task as soon as its dependencies finish, and "distributed" hands them to workers connected to `address`. Ready tasks with the longest expected chain of work behind them start first. Defaults to Executors.SERIAL.
+            max_workers (int | None, optional): maximum number of tasks running at once. Defaults to None.
+            preload (list[str] | None, optional): modules to import into a pool of warm interpreters that run tasks without an action. When None each of those tasks starts a fresh interpreter. Defaults to None.
+            use_cache (bool, optional): skip tasks whose action source, parameters and upstream tasks are unchanged since a cached run, reusing the cached result. Defaults to False.
+            incremental (bool, optional): only run tasks whose action source, parameters or dependencies changed since the last incremental run, and their descendants. Defaults to False.
+            profile (bool | list[str], optional): profile the actions of every task, or of the named tasks, writing the results to <pipeline name>/<run id> in the runs directory, see `paths.get_path`. Defaults to False.
+            profilers (list[profiling.Profilers | str] | None, optional): "cpu" runs profiled actions under cProfile, "memory" under tracemalloc. Defaults to both.
+            checkpoint (bool, optional): save the result of each task as it completes, so that a failed run can be continued with `resume`. Results must be picklable and are written to the runs directory, see `paths.get_path`. The checkpoint is removed once the run succeeds, and only the checkpoints of the last `checkpoints.MAX_CHECKPOINTS` failed runs of the pipeline are kept. Defaults to False.
+            address (str | None, optional): "host:port" or Unix socket path the distributed executor listens on for workers. Defaults to localhost on a free port.
+            fail_fast (bool, optional): cancel the running tasks as soon as a task fails for good, instead of letting them finish. Defaults to False.
+            pools (dict[str, int] | None, optional): number of tasks of each `Task.pool` that may run at once, on top of `max_workers`. Pools without a size are not limited. Defaults to None.
+            retry (bool, optional): retry a failed task up to `Task.retries` times, waiting `Task.retry_delay` with exponential backoff. Without it a task fails on its first error. Defaults to False.
+
+        Returns:
+            dict[str, Any]: the value returned by each task's action, by task name.
+
+        Raises:
+            subprocess.CalledProcessError: raises if a task without an action exits with a non-zero code.
+            timeouts.TaskTimeoutError: raises if a task runs for longer than its timeout on its last attempt.
+        """
+        run_id: str = uuid.uuid4().hex
+        options: dict[str, Any] = {
+            "run_time_parameters": run_time_parameters or {},
+            "task_names": task_names,
+            "executor": executors.Executors(executor),
+            "max_workers": max_workers,
+            "preload": preload,
+            "use_cache": use_cache,
+            "incremental": incremental,
+            "profile": profile,
+            "profilers": profilers,
+            "address": address,
+            "fail_fast": fail_fast,
+            "pools": pools,
+            "retry": retry,
+        }
+        run_checkpoint: checkpoints.Checkpoint | None = None
+        if checkpoint:
+            checkpoints.prune(
+                directory=paths.get_path("runs") / self.name,
+                keep=checkpoints.MAX_CHECKPOINTS - 1,
+            )
+            run_checkpoint = self._get_checkpoint(run_id=run_id)
+            try:
+                run_checkpoint.start(options=options)
+            except checkpoints.CheckpointError as error:
+                logger.warning(
+                    f"Run: {run_id} of {self.name} cannot be resumed. {error}"
+                )
+                run_checkpoint = None
+        return self._run(run_id=run_id, checkpoint=run_checkpoint, **options)
+
+    def resume(self, run_id: str) -> dict[str, Any]:
+        """Continues a failed run, skipping the tasks that already completed.
+
+        The run continues with the options it was started with, and the results of the
+        tasks it skips are restored from its checkpoint.
+
+        Args:
+            run_id (str): id of the failed run, from its record in `runs`.
+
+        Returns:
+            dict[str, Any]: the value returned by each task's action, by task name.
+
+        Raises:
+            ValueError: raises if there is no checkpoint of the run, because it succeeded, was run without checkpoint=True, or is older than the last `checkpoints.MAX_CHECKPOINTS` failed runs.
+        """
+        run_checkpoint: checkpoints.Checkpoint = self._get_checkpoint(run_id=run_id)
+        if not run_checkpoint.exists():
+            msg = f"Cannot resume run: {run_id} of {self.name} because it has no checkpoint. Only failed runs started with checkpoint=True can be resumed."
+            raise ValueError(msg)
+        return self._run(
+            run_id=run_id, checkpoint=run_checkpoint, **run_checkpoint.options()
+        )
+
+    def _get_checkpoint(self, run_id: str) -> checkpoints.Checkpoint:
+        return checkpoints.Checkpoint(
+            path=paths.get_path("runs") / self.name / run_id / "checkpoint.sqlite"
+        )
+
+    def _run(  # noqa: PLR0913
+        self,
+        run_id: str,
+        checkpoint: checkpoints.Checkpoint | None,
+        run_time_parameters: dict[str, Any],
+        task_names: list[str] | None,
+        executor: executors.Executors,
+        max_workers: int | None,
+        preload: list[str] | None,
+        use_cache: bool,
+        incremental: bool,
+        profile: bool | list[str],
+        profilers: list[profiling.Profilers | str] | None,
+        address: str | None,
+        fail_fast: bool,
+        pools: dict[str, int] | None,
+        retry: bool = False,
+    ) -> dict[str, Any]:
+        nodes: list[task.Task] = self._get_nodes(task_names=task_names)
+        with self._record_run(
+            run_time_parameters=run_time_parameters, run_id=run_id
+        ) as record:
+            results: dict[str, Any] = executors.LocalExecutor(
+                executor=executor,
+                max_workers=max_workers,
+                preload=preload,
+                cache=self.cache if use_cache else None,
+                manifest=self.manifest if incremental else None,
+                history=self.history,
+                profile=(
+                    profiling.Profile(
+                        directory=paths.get_path("runs") / self.name / record.run_id,
+                        task_names=profile if isinstance(profile, list) else None,
+                        profilers=frozenset(
+                            profiling.Profilers(profiler)
+                            for profiler in profilers or profiling.Profilers
+                        ),
+                    )
+                    if profile
+                    else None
+                ),
+                checkpoint=checkpoint,
+                address=(
+                    distributed.parse_address(address=address) if address else None
+                ),
+                fail_fast=fail_fast,
+                pools=pools or {},
+                retry=retry,
+            ).run(
+                dag=graph.DAG(nodes=nodes),
+                run_time_parameters=run_time_parameters,
+                on_complete=self.log.append,
+                on_attempt=record.add,
+            )
+        if checkpoint is not None:
+            checkpoint.clear()
+        return results
+
+    def plan(
+        self,
+        task_names: list[str] | None = None,
+        executor: executors.Executors | str = executors.Executors.THREADS,
+        max_workers: int | None = None,
+        pools: dict[str, int] | None = None,
+    ) -> plans.Plan:
+        """Plans a run of the pipeline's tasks without running any of them.
+
+        Each task is expected to take its typical duration from the pipeline's history,
+        and tasks are started in the order `run` would start them.
+
+        Args:
+            task_names (list[str] | None, optional): subset of tasks to plan, by name or by selector, such as "+name" for a task and its upstream tasks. See `select`. Defaults to None.
+            executor (executors.Executors | str, optional): kind of executor to plan for, which sets the default number of workers. Defaults to Executors.THREADS.
+            max_workers (int | None, optional): maximum number of tasks running at once. Defaults to None.
+            pools (dict[str, int] | None, optional): number of tasks of each `Task.pool` that may run at once, on top of `max_workers`. Pools without a size are not limited. Defaults to None.
+
+        Returns:
+            plans.Plan: waves of tasks with their expected start and finish times, the critical path and the expected makespan.
+
+        Raises:
+            ValueError: raises if the pipeline has a dependency cycle.
+        """
+        nodes: list[task.Task] = self._get_nodes(task_names=task_names)
+        return plans.simulate(
+            pipeline_name=self.name,
+            dag=graph.DAG(nodes=mapping.expand(nodes=nodes)),
+            workers=executors.LocalExecutor(
+                executor=executors.Executors(executor), max_workers=max_workers
+            ).workers,
+            durations=self.history.typical_durations(),
+            pool_sizes=pools,
         )
-        dag = graph.DAG(nodes=nodes)
-        for node in dag:
-            self.log.append(node)
-            if node.action is not None:
-                node.action(**node.parameters | (run_time_parameters or {}))
-            else:
-                subprocess.run(["python", node.src])
+
+    async def arun(
+        self,
+        run_time_parameters: dict[str, Any] | None = None,
+        task_names: list[str] | None = None,
+        max_concurrency: int | None = None,
+        max_workers: int | None = None,
+        fail_fast: bool = False,
+        pools: dict[str, int] | None = None,
+        retry: bool = False,
+    ) -> dict[str, Any]:
+        """Runs the pipeline's tasks on the running asyncio event loop.
+
+        Args:
+            run_time_parameters (dict[str, Any] | None, optional): parameters merged over each task's parameters. Defaults to None.
+            task_names (list[str] | None, optional): subset of tasks to run, by name or by selector, such as "+name" for a task and its upstream tasks. See `select`. Defaults to None.
+            max_concurrency (int | None, optional): maximum number of tasks running at once. Defaults to None.
+            max_workers (int | None, optional): size of the thread pool that runs actions which are not coroutine functions. Defaults to None.
+            fail_fast (bool, optional): cancel the running tasks as soon as a task fails for good, instead of letting them finish. Defaults to False.
+            pools (dict[str, int] | None, optional): number of tasks of each `Task.pool` that may run at once, on top of `max_concurrency`. Pools without a size are not limited. Defaults to None.
+            retry (bool, optional): retry a failed task up to `Task.retries` times, waiting `Task.retry_delay` with exponential backoff. Without it a task fails on its first error. Defaults to False.
+
+        Returns:
+            dict[str, Any]: the value returned by each task's action, by task name.
+        """
+        nodes: list[task.Task] = self._get_nodes(task_names=task_names)
+        with self._record_run(run_time_parameters=run_time_parameters or {}) as record:
+            return await executors.AsyncExecutor(
+                max_concurrency=max_concurrency,
+                max_workers=max_workers,
+                fail_fast=fail_fast,
+                pools=pools or {},
+                retry=retry,
+            ).run(
+                dag=graph.DAG(nodes=nodes),
+                run_time_parameters=run_time_parameters or {},
+                on_complete=self.log.append,
+                on_attempt=record.add,
+            )
+
+    def backfill(  # noqa: PLR0913
+        self,
+        start: datetime.date | str,
+        end: datetime.date | str,
+        max_concurrent_runs: int = 1,
+        depends_on_past: bool = False,
+        run_time_parameters: dict[str, Any] | None = None,
+        task_names: list[str] | None = None,
+        executor: executors.Executors | str = executors.Executors.THREADS,
+        max_workers: int | None = None,
+        pools: dict[str, int] | None = None,
+        retry: bool = False,
+    ) -> dict[datetime.date, runs_base.RunRecord]:
+        """Runs the pipeline once for every day from `start` to `end`, inclusive.
+
+        Each run gets the day as its "run_day" run time parameter, formatted like
+        Airflow's `ds`. Up to `max_concurrent_runs` days run at once and share a single
+        pool of workers: at most `max_workers` tasks run at once across all days, within
+        one machine capacity. A failed day does not stop the other days.
+
+        Args:
+            start (datetime.date | str): first day, or its ISO format.
+            end (datetime.date | str): last day, or its ISO format.
+            max_concurrent_runs (int, optional): maximum number of days running at once. Defaults to 1.
+            depends_on_past (bool, optional): only start a day once the previous day succeeded, skipping it otherwise. Defaults to False.
+            run_time_parameters (dict[str, Any] | None, optional): parameters merged over each task's parameters, before run_day. Defaults to None.
+            task_names (list[str] | None, optional): subset of tasks to run, by name or by selector, such as "+name" for a task and its upstream tasks. See `select`. Defaults to None.
+            executor (executors.Executors | str, optional): kind of workers shared by the runs. Defaults to Executors.THREADS.
+            max_workers (int | None, optional): maximum number of tasks running at once, across all days. Defaults to None.
+            pools (dict[str, int] | None, optional): number of tasks of each `Task.pool` that may run at once across all days, on top of `max_workers`. Pools without a size are not limited. Defaults to None.
+            retry (bool, optional): retry a failed task up to `Task.retries` times, waiting `Task.retry_delay` with exponential backoff. Without it a task fails on its first error. Defaults to False.
+
+        Returns:
+            dict[datetime.date, runs_base.RunRecord]: the record of each day's run, with its status.
+
+        Raises:
+            ValueError: raises if `end` is before `start`.
+        """
+        first_day: datetime.date = (
+            datetime.date.fromisoformat(start) if isinstance(start, str) else start
+        )
+        last_day: datetime.date = (
+            datetime.date.fromisoformat(end) if isinstance(end, str) else end
+        )
+        if last_day < first_day:
+            msg = f"Cannot backfill: {self.name} from {first_day} to {last_day} because the end is before the start."
+            raise ValueError(msg)
+        days: list[datetime.date] = [
+            first_day + datetime.timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+        nodes: list[task.Task] = self._get_nodes(task_names=task_names)
+        settings = executors.LocalExecutor(
+            executor=executors.Executors(executor),
+            max_workers=max_workers,
+            history=self.history,
+            pools=pools or {},
+            retry=retry,
+        )
+        self.log.clear()
+
+        day_runs: dict[datetime.date, futures.Future] = {}
+        with (
+            settings.open_pool() as pool,
+            futures.ThreadPoolExecutor(
+                max_workers=max_concurrent_runs, thread_name_prefix="pipelines-backfill"
+            ) as day_pool,
+        ):
+            # every day's run counts the tasks of the others against one set of limits
+            local_executor: executors.LocalExecutor = dataclasses.replace(
+                settings, pool=pool, budget=executors.WorkerBudget()
+            )
+            previous: futures.Future | None = None
+            for day in days:
+                previous = day_runs[day] = day_pool.submit(
+                    self._backfill_day,
+                    local_executor=local_executor,
+                    dag=graph.DAG(nodes=nodes),
+                    run_time_parameters=(run_time_parameters or {})
+                    | {"run_day": day.isoformat()},
+                    previous=previous if depends_on_past else None,
+                )
+            for finished, day_run in enumerate(
+                futures.as_completed(day_runs.values()), start=1
+            ):
+                record: runs_base.RunRecord = day_run.result()
+                logger.info(
+                    f"Backfill of: {self.name} for {record.run_time_parameters['run_day']} {record.status.value}. {finished} of {len(days)} days done."
+                )
+        return {day: day_run.result() for day, day_run in day_runs.items()}
+
+    def _backfill_day(
+        self,
+        local_executor: executors.LocalExecutor,
+        dag: graph.DAG[task.Task],
+        run_time_parameters: dict[str, Any],
+        previous: futures.Future | None,
+    ) -> runs_base.RunRecord:
+        if (
+            previous is not None
+            and previous.result().status is not runs_base.Status.SUCCEEDED
+        ):
+            record = runs_base.RunRecord(
+                pipeline_name=self.name, run_time_parameters=run_time_parameters
+            )
+            record.finish(status=runs_base.Status.SKIPPED)
+            self.runs.append(record)
+            return record
+
+        # a failed day is recorded as such, and must not stop the other days
+        try:
+            with self._record_run(
+                run_time_parameters=run_time_parameters, clear_log=False
+            ) as record:
+                local_executor.run(
+                    dag=dag,
+                    run_time_parameters=run_time_parameters,
+                    on_complete=self.log.append,
+                    on_attempt=record.add,
+                )
+        except Exception as error:  # noqa: BLE001
+            logger.error(
+                f"Backfill of: {self.name} for {run_time_parameters['run_day']} failed with: {error!r}"
+            )
+        return record
+
+    @contextlib.contextmanager
+    def _record_run(
+        self,
+        run_time_parameters: dict[str, Any],
+        clear_log: bool = True,
+        run_id: str | None = None,
+    ) -> Iterator[runs_base.RunRecord]:
+        "Starts a new run record, saved to `history` once it finishes, and clears `log` for the tasks of the new run. A record that cannot be saved is only logged."
+        record = runs_base.RunRecord(
+            pipeline_name=self.name, run_time_parameters=run_time_parameters
+        )
+        if run_id is not None:
+            record.run_id = run_id
+        self.runs.append(record)
+        if clear_log:
+            self.log.clear()
+        try:
+            yield record
+        except BaseException:
+            record.finish(status=runs_base.Status.FAILED)
+            raise
+        else:
+            record.finish(status=runs_base.Status.SUCCEEDED)
+        finally:
+            try:
+                self.history.record(record=record)
+            except Exception as error:  # noqa: BLE001
+                logger.warning(
+                    f"Cannot save run: {record.run_id} of {self.name} to its history: {error!r}"
+                )
 
     def show(self) -> utils.RenderMermaid:
         """Renders a graphical representation of the pipeline."""
@@ -60,30 +519,60 @@ class Pipeline(port.Port):
         parameters: dict[str, Any] | None = None,
         before: str | list[str] | None = None,
         after: str | list[str] | None = None,
+        cpu: float | None = None,
+        memory: str | None = None,
+        streams_from: str | None = None,
+        timeout: datetime.timedelta | None = None,
+        pool: str | None = None,
+        map_over: dict[str, list[Any]] | None = None,
+        reduce: Callable[[list[Any]], Any] | None = None,
+        tags: list[str] | None = None,
     ) -> None:
+        if memory is not None:  # raises early on a quantity the executor can't read
+            resources.parse_memory(quantity=memory)
         dependencies: list[str] = self._convert_to_list(candidate=after)
+        if streams_from is not None and streams_from not in dependencies:
+            dependencies.append(streams_from)
         self._validate_dependencies(task_name=name, dependencies=dependencies)
-        self._add_upstream_dependency(
-            new_dependency_name=name,
-            tasks_to_modify=self._convert_to_list(candidate=before),
+        if reduce is not None:
+            self._validate_reduce(task_name=name, action=action, reduce=reduce)
+        new_task = task.Task(
+            name=name,
+            action=action,
+            parameters=parameters or {},
+            depends_on=dependencies,
+            src=pathlib.Path(
+                inspect.getfile(action),
+            )
+            .relative_to(pathlib.Path(__file__).parent.parent.parent)
+            .parent,
+            cpu=cpu,
+            memory=memory,
+            streams_from=streams_from,
+            timeout=timeout,
+            pool=pool,
+            map_over=map_over,
+            reduce=reduce,
+            tags=tags or [],
         )
+        streams.validate(nodes=self.tasks + [new_task])
+        mapping.validate(nodes=self.tasks + [new_task])
+        dependents: list[str] = self._convert_to_list(candidate=before)
 
-        self.tasks.append(
-            task.Task(
-                name=name,
-                action=action,
-                parameters=parameters or {},
-                depends_on=dependencies,
-                src=pathlib.Path(
-                    inspect.getfile(action),
-                )
-                .relative_to(pathlib.Path(__file__).parent.parent.parent)
-                .parent,
+        self.dag.add(node=new_task)
+        try:
+            self._add_upstream_dependency(
+                new_dependency_name=name, tasks_to_modify=dependents
             )
-        )
+        except Exception:  # leaves the pipeline as it was
+            for task_name in dependents:
+                if task_name in self.dag.node_map:
+                    self.dag.remove_dependency(name=task_name, dependency=name)
+            self.dag.remove(name=name)
+            raise
 
     def remove_task(self, name: str) -> None:
-        self.tasks = [task for task in self.tasks if task.name != name]
+        self.dag.remove(name=name)
 
     def _add_upstream_dependency(
         self, new_dependency_name: str, tasks_to_modify: list[str]
@@ -92,7 +581,24 @@ class Pipeline(port.Port):
             task_name=new_dependency_name, dependencies=tasks_to_modify
         )
         for task_name in tasks_to_modify:
-            self.task_dict[task_name].depends_on.append(new_dependency_name)
+            self.dag.add_dependency(name=task_name, dependency=new_dependency_name)
+
+    @staticmethod
+    def _validate_reduce(
+        task_name: str, action: Callable[..., Any], reduce: Callable[[list[Any]], Any]
+    ) -> None:
+        "Saved pipelines keep a reduce step by name, and look it up from the action's directory."
+        name: str = getattr(reduce, "__name__", repr(reduce))
+        module = inspect.getmodule(reduce)
+        if (
+            not inspect.isfunction(reduce)
+            or getattr(module, name, None) is not reduce
+            or not pathlib.Path(inspect.getfile(reduce))
+            .resolve()
+            .is_relative_to(pathlib.Path(inspect.getfile(action)).resolve().parent)
+        ):
+            msg = f"Cannot use: {name} as the reduce step of task: {task_name}. It must be a function defined at the top level of a module in the directory of the task's action, or below it."
+            raise ValueError(msg)
 
     def _validate_dependencies(self, task_name: str, dependencies: list[str]) -> None:
         for node in dependencies:  # TODO: use sets, and issubset
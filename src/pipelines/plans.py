@@ -0,0 +1,169 @@
+"""Dry runs of a pipeline, estimating when each task would run from past durations.
+
+A plan replays the executor's scheduling, longest critical path first and never more
+than `workers` tasks at once nor more tasks of a pool than its size, with every task
+taking its typical duration from the pipeline's history. Nothing is executed, so a plan
+is cheap enough to compare worker counts before launching a large run.
+"""
+
+import heapq
+import itertools
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from pipelines import pools, task
+from pipelines._internal import graph, scheduler
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedTask:
+    """When a task is expected to run, in seconds from the start of the run.
+
+    Tasks in the same `wave` are started together, as soon as the tasks they depend on
+    finish and a worker is free.
+    """
+
+    task_name: str
+    wave: int
+    start_seconds: float
+    finish_seconds: float
+    estimated: bool
+
+    @property
+    def seconds(self) -> float:
+        return self.finish_seconds - self.start_seconds
+
+
+@dataclass
+class Plan:
+    """Expected schedule of a run, in the order tasks would start.
+
+    Tasks without a recorded duration are `estimated` with the mean of the recorded
+    durations, or one second when there are none.
+    """
+
+    pipeline_name: str
+    workers: int
+    tasks: list[PlannedTask] = field(default_factory=list)
+    critical_path: list[str] = field(default_factory=list)
+    # number of tasks at each level of the DAG
+    widths: list[int] = field(default_factory=list)
+
+    @property
+    def makespan(self) -> float:
+        """Expected duration of the whole run, in seconds."""
+        return max((planned.finish_seconds for planned in self.tasks), default=0.0)
+
+    @property
+    def critical_path_seconds(self) -> float:
+        """Expected duration of the critical path, the shortest the run could take."""
+        seconds: dict[str, float] = {
+            planned.task_name: planned.seconds for planned in self.tasks
+        }
+        return sum(seconds[name] for name in self.critical_path)
+
+    @property
+    def parallelism(self) -> int:
+        """Number of tasks in the widest level of the DAG.
+
+        Tasks of different levels can also run at once, so a run may keep more workers
+        than this busy, and be shortened by them.
+        """
+        return max(self.widths, default=0)
+
+    @property
+    def waves(self) -> list[list[str]]:
+        """Names of the tasks started together, wave by wave."""
+        return [
+            [planned.task_name for planned in wave]
+            for _, wave in itertools.groupby(self.tasks, key=lambda p: p.wave)
+        ]
+
+    def __str__(self) -> str:
+        width: int = max((len(planned.task_name) for planned in self.tasks), default=4)
+        lines: list[str] = [
+            f"Plan of: {self.pipeline_name} on {self.workers} workers, expected to take {self.makespan:.1f}s.",
+            f"{'wave':>4}  {'task':<{width}}  {'start':>9}  {'finish':>9}",
+        ] + [
+            f"{planned.wave:>4}  {planned.task_name:<{width}}  {planned.start_seconds:>8.1f}s  {planned.finish_seconds:>8.1f}s"
+            + ("  (estimated)" if planned.estimated else "")
+            for planned in self.tasks
+        ]
+        lines.append(
+            f"Critical path, {self.critical_path_seconds:.1f}s: {' -> '.join(self.critical_path)}"
+        )
+        lines.append(
+            f"Tasks by level: {self.widths}, {self.parallelism} in the widest."
+        )
+        return "\n".join(lines)
+
+
+def simulate(
+    pipeline_name: str,
+    dag: graph.DAG[task.Task],
+    workers: int,
+    durations: Mapping[str, float],
+    pool_sizes: Mapping[str, int] | None = None,
+) -> Plan:
+    """Plans a run of a DAG without executing any of its tasks.
+
+    Args:
+        pipeline_name (str): name of the pipeline the DAG belongs to.
+        dag (graph.DAG[task.Task]): tasks to plan.
+        workers (int): maximum number of tasks running at once.
+        durations (Mapping[str, float]): typical duration of each task, in seconds.
+        pool_sizes (Mapping[str, int] | None, optional): number of tasks of each pool that may run at once. Defaults to None.
+
+    Returns:
+        Plan: when each task is expected to run.
+
+    Raises:
+        ValueError: raises if the DAG has a dependency cycle.
+    """
+    dag_scheduler: scheduler.Scheduler[task.Task] = scheduler.Scheduler(
+        dag=dag, durations=durations
+    )
+    node_map: dict[str, task.Task] = dag.node_map
+    expected: dict[str, float] = scheduler.expected_durations(
+        names=node_map, durations=durations
+    )
+    plan = Plan(
+        pipeline_name=pipeline_name,
+        workers=workers,
+        critical_path=dag_scheduler.critical_path(),
+    )
+    running: list[tuple[float, int, str]] = []
+    order, waves = itertools.count(), itertools.count()
+    now: float = 0.0
+    while not dag_scheduler.finished:
+        started: list[task.Task] = list(
+            dag_scheduler.take_ready(
+                limit=workers - len(running),
+                fits=lambda node: pools.has_slots(
+                    candidates=[node],
+                    running=[node_map[name] for name in dag_scheduler.running],
+                    sizes=pool_sizes or {},
+                ),
+            )
+        )
+        wave: int = next(waves) if started else -1
+        for node in started:
+            finish: float = now + expected[node.name]
+            heapq.heappush(running, (finish, next(order), node.name))
+            plan.tasks.append(
+                PlannedTask(
+                    task_name=node.name,
+                    wave=wave,
+                    start_seconds=now,
+                    finish_seconds=finish,
+                    estimated=node.name not in durations,
+                )
+            )
+        if not running:
+            msg = f"Could not plan tasks: {sorted(dag_scheduler.pending)}. Check the pipeline for dependency cycles."
+            raise ValueError(msg)
+        now = running[0][0]
+        while running and running[0][0] == now:  # tasks finishing together
+            dag_scheduler.mark_done(name=heapq.heappop(running)[2])
+    plan.widths = dag.widths
+    return plan
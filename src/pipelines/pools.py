@@ -0,0 +1,50 @@
+"""Named pools of slots, limiting how many tasks of a kind run at once.
+
+Pools work like Airflow's: each task in a pool takes one of its slots while it runs,
+on top of the executor's limit on running tasks, so tasks that share a throttled
+resource can be held back while the rest of the pipeline runs wide.
+"""
+
+import collections
+from collections.abc import Iterable, Mapping
+
+from pipelines import task, utils
+
+logger = utils.get_logger(name="port")
+
+
+def validate(nodes: Iterable[task.Task], sizes: Mapping[str, int]) -> None:
+    """Checks pool sizes, and warns about pools without one, which are not limited.
+
+    Raises:
+        ValueError: raises if a pool has fewer than one slot.
+    """
+    for pool, size in sizes.items():
+        if size < 1:
+            msg = f"Invalid size: {size} of pool: {pool}. Pools need at least one slot."
+            raise ValueError(msg)
+    for pool in sorted({node.pool for node in nodes if node.pool is not None}):
+        if pool not in sizes:
+            logger.warning(f"Pool: {pool} has no size, so its tasks are not limited.")
+
+
+def has_slots(
+    candidates: Iterable[task.Task],
+    running: Iterable[task.Task],
+    sizes: Mapping[str, int],
+) -> bool:
+    """Whether `candidates` can start together next to the `running` tasks.
+
+    A pool without running tasks always has room, so that tasks which must start
+    together still run when there are more of them than slots.
+    """
+    used: collections.Counter[str | None] = collections.Counter(
+        node.pool for node in running
+    )
+    needed: collections.Counter[str | None] = collections.Counter(
+        node.pool for node in candidates if node.pool in sizes
+    )
+    return all(
+        used[pool] == 0 or used[pool] + count <= sizes[pool]
+        for pool, count in needed.items()
+    )
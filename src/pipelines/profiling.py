@@ -0,0 +1,154 @@
+"Opt-in profiling of task actions with cProfile and tracemalloc."
+
+import contextlib
+import cProfile
+import threading
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from pipelines import utils
+
+logger = utils.get_logger(name="port")
+
+TOP_ALLOCATIONS: int = 25
+
+
+class Profilers(Enum):
+    CPU = "cpu"
+    MEMORY = "memory"
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Which tasks to profile, how, and where to write the results.
+
+    Each profiled task writes `<task>.pstats` for the CPU profiler, readable with
+    `pstats` or snakeviz, and `<task>.allocations.txt` for the memory profiler, listing
+    the lines that allocated the most memory while the task ran.
+
+    A process runs one CPU profiler at a time, as Python 3.12 allows no more, so a task
+    that starts while another task in the same process is CPU profiled only gets the
+    memory profiler.
+    """
+
+    directory: Path
+    task_names: list[str] | None = None
+    profilers: frozenset[Profilers] = frozenset(Profilers)
+    top: int = TOP_ALLOCATIONS
+
+    def wrap(self, task_name: str, action: Callable[..., Any]) -> Callable[..., Any]:
+        """Wraps an action in the profilers if its task is one of `task_names`."""
+        if self.task_names is not None and task_name not in self.task_names:
+            return action
+        return ProfiledAction(action=action, task_name=task_name, profile=self)
+
+
+@dataclass(frozen=True)
+class ProfiledAction:
+    "An action that profiles itself while it runs. Picklable when its action is."
+
+    action: Callable[..., Any]
+    task_name: str
+    profile: Profile
+
+    def __call__(self, **parameters: Any) -> Any:
+        self.profile.directory.mkdir(parents=True, exist_ok=True)
+        with contextlib.ExitStack() as stack:
+            if Profilers.MEMORY in self.profile.profilers:
+                stack.enter_context(
+                    _trace_allocations(
+                        path=self.profile.directory
+                        / f"{self.task_name}.allocations.txt",
+                        top=self.profile.top,
+                    )
+                )
+            if Profilers.CPU in self.profile.profilers:
+                stack.enter_context(
+                    _profile_calls(
+                        path=self.profile.directory / f"{self.task_name}.pstats",
+                        task_name=self.task_name,
+                    )
+                )
+            return self.action(**parameters)
+
+
+_PROFILING = threading.Lock()  # held by the task being CPU profiled in this process
+
+
+@contextlib.contextmanager
+def _profile_calls(path: Path, task_name: str) -> Iterator[None]:
+    if not _PROFILING.acquire(blocking=False):
+        logger.warning(
+            f"Task: {task_name} not CPU profiled, another task in this process is."
+        )
+        yield
+        return
+    try:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as error:  # another profiler, outside of the pipeline
+            logger.warning(f"Task: {task_name} not CPU profiled. {error}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+    finally:
+        _PROFILING.release()
+
+
+@dataclass
+class _Tracing:
+    """Reference count of the tasks using tracemalloc in this process.
+
+    tracemalloc is process wide, so it keeps tracing until the last task that needs
+    it finishes. Tasks running in other threads at the same time show up in each
+    other's reports.
+    """
+
+    users: int = 0
+    started: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __enter__(self) -> None:
+        with self.lock:
+            if self.users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started = True
+            self.users += 1
+
+    def __exit__(self, *_: object) -> None:
+        with self.lock:
+            self.users -= 1
+            if self.users == 0 and self.started:
+                tracemalloc.stop()
+                self.started = False
+
+
+_TRACING = _Tracing()
+
+
+@contextlib.contextmanager
+def _trace_allocations(path: Path, top: int) -> Iterator[None]:
+    with _TRACING:
+        before: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            statistics: list[tracemalloc.StatisticDiff] = (
+                tracemalloc.take_snapshot().compare_to(before, key_type="lineno")
+            )
+            path.write_text(
+                "\n".join(
+                    [f"Top {top} allocations by size while the task ran:"]
+                    + [str(statistic) for statistic in statistics[:top]]
+                )
+                + "\n"
+            )
@@ -0,0 +1,69 @@
+"CPU and memory requests of tasks, and the capacity of the local machine."
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+MEMINFO: Path = Path("/proc/meminfo")
+
+# kubernetes quantity suffixes, which is how tasks declare memory
+MEMORY_UNITS: dict[str, int] = {
+    "": 1,
+    "k": 10**3,
+    "M": 10**6,
+    "G": 10**9,
+    "T": 10**12,
+    "Ki": 2**10,
+    "Mi": 2**20,
+    "Gi": 2**30,
+    "Ti": 2**40,
+}
+MEMORY_PATTERN: re.Pattern[str] = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*$")
+
+
+def parse_memory(quantity: str | int | None) -> int:
+    """Converts a memory quantity such as "512Mi" or "30Gi" to bytes.
+
+    Raises:
+        ValueError: raises if the quantity is not understood.
+    """
+    if quantity is None:
+        return 0
+    if isinstance(quantity, int):
+        return quantity
+    match = MEMORY_PATTERN.match(quantity)
+    if match is None or match.group(2) not in MEMORY_UNITS:
+        msg = f"Invalid memory quantity: {quantity}. Expected a number of bytes, optionally followed by one of: {', '.join(unit for unit in MEMORY_UNITS if unit)}"
+        raise ValueError(msg)
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+
+@dataclass(frozen=True)
+class Capacity:
+    cpu: float
+    memory: float
+
+    def fits(self, cpu: float, memory: float) -> bool:
+        return cpu <= self.cpu and memory <= self.memory
+
+
+def machine_capacity() -> Capacity:
+    """CPUs and available memory of this machine.
+
+    Memory is read from /proc/meminfo and is unbounded where that does not exist.
+    """
+    return Capacity(cpu=float(os.cpu_count() or 1), memory=_available_memory())
+
+
+def _available_memory() -> float:
+    try:
+        meminfo: str = MEMINFO.read_text()
+    except OSError:
+        return math.inf
+    for line in meminfo.splitlines():
+        key, _, value = line.partition(":")
+        if key == "MemAvailable":
+            return parse_memory(value.replace("kB", "Ki"))
+    return math.inf
@@ -0,0 +1,122 @@
+"""Structured records of pipeline runs and of every attempt at running a task.
+
+Pipelines keep their last `MAX_RUNS` records, so a long-lived process running a
+pipeline many times keeps a bounded amount of history in memory.
+"""
+
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import resource
+
+MAX_RUNS: int = 100
+
+
+class Status(Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+    RUNNING = "running"
+
+
+@dataclass(frozen=True, slots=True)
+class Usage:
+    """Resources used by a task attempt.
+
+    `peak_rss_bytes` is the high-water mark of the process that ran the attempt, which
+    for reused workers includes earlier attempts in the same process.
+    """
+
+    cpu_seconds: float
+    peak_rss_bytes: int
+
+    @classmethod
+    def from_rusage(cls, usage: "resource.struct_rusage") -> "Usage":
+        # ru_maxrss is in kilobytes, except on macOS where it is in bytes
+        scale: int = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            cpu_seconds=usage.ru_utime + usage.ru_stime,
+            peak_rss_bytes=usage.ru_maxrss * scale,
+        )
+
+
+def measure(function: Callable[..., Any], /, *args: Any) -> tuple[Any, Usage | None]:
+    """Calls `function`, measuring the CPU time of the calling thread.
+
+    Returns:
+        tuple[Any, Usage | None]: the value returned by `function` and the resources it used, or None where the resource module is unavailable, as on Windows.
+    """
+    try:
+        import resource
+    except ImportError:
+        return function(*args), None
+
+    start: float = time.thread_time()
+    value: Any = function(*args)
+    return value, Usage(
+        cpu_seconds=time.thread_time() - start,
+        peak_rss_bytes=Usage.from_rusage(
+            usage=resource.getrusage(resource.RUSAGE_SELF)
+        ).peak_rss_bytes,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class TaskAttempt:
+    """One attempt at running a task.
+
+    Timestamps are seconds since the epoch. A task is queued once its dependencies
+    finish, or once its retry delay has passed. Errors are kept as their repr so that a
+    record does not hold on to tracebacks and the objects they reference.
+    """
+
+    task_name: str
+    attempt: int
+    status: Status
+    queued_at: float
+    started_at: float
+    finished_at: float
+    usage: Usage | None = None
+    error: str | None = None
+
+    @property
+    def wall_seconds(self) -> float:
+        return self.finished_at - self.started_at
+
+    @property
+    def cpu_seconds(self) -> float | None:
+        return self.usage.cpu_seconds if self.usage is not None else None
+
+    @property
+    def peak_rss_bytes(self) -> int | None:
+        return self.usage.peak_rss_bytes if self.usage is not None else None
+
+
+@dataclass(slots=True)
+class RunRecord:
+    "Outcome of a single pipeline run, and every task attempt it made."
+
+    pipeline_name: str
+    run_time_parameters: dict[str, Any] = field(default_factory=dict)
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    status: Status = Status.RUNNING
+    attempts: list[TaskAttempt] = field(default_factory=list)
+
+    def add(self, attempt: TaskAttempt) -> None:
+        self.attempts.append(attempt)
+
+    def finish(self, status: Status) -> None:
+        self.status = status
+        self.finished_at = time.time()
+
+    def attempts_of(self, task_name: str) -> list[TaskAttempt]:
+        return [attempt for attempt in self.attempts if attempt.task_name == task_name]
@@ -0,0 +1,91 @@
+"""Selectors picking a slice of a pipeline's tasks, with their upstream or downstream.
+
+A selector is a task name or `tag:<tag>`, for every task with that tag, optionally
+with a `+` in front to add everything it depends on and/or a `+` after it to add
+everything that depends on it:
+
+    +load_sales          load_sales and its upstream tasks
+    load_sales+          load_sales and its downstream tasks
+    +tag:daily+          tasks tagged daily, with both
+
+Selectors separated by spaces, or given as separate strings, are combined into their
+union, and selectors joined by commas into their intersection, so
+"tag:daily,+report" selects the daily tasks that report depends on.
+"""
+
+from pipelines import task
+from pipelines._internal import graph
+
+TAG: str = "tag:"
+
+
+def select(
+    selectors: list[str],
+    nodes: list[task.Task],
+    dag: graph.DAG[task.Task] | None = None,
+) -> list[task.Task]:
+    """Selects tasks with selectors.
+
+    Args:
+        selectors (list[str]): selectors whose tasks are all selected.
+        nodes (list[task.Task]): tasks to select from.
+        dag (graph.DAG[task.Task] | None, optional): DAG of `nodes`, whose cached reachability index is reused between selections. Defaults to a new DAG of `nodes`.
+
+    Returns:
+        list[task.Task]: the selected tasks, in the order of `nodes`.
+
+    Raises:
+        ValueError: raises if a selector is empty, or its task name or tag matches no task.
+    """
+    if dag is None:
+        dag = graph.DAG(nodes=nodes)
+    reachability: graph.Reachability = dag.reachability
+    tags: dict[str, list[str]] = {}
+    for node in nodes:
+        for tag in node.tags:
+            tags.setdefault(tag, []).append(node.name)
+
+    selected: int = 0
+    for union in selectors:
+        for intersection in union.split():
+            bits: int = -1  # every node, until intersected
+            for selector in intersection.split(","):
+                bits &= _select_one(
+                    selector=selector,
+                    reachability=reachability,
+                    node_map=dag.node_map,
+                    tags=tags,
+                )
+            selected |= bits
+    names: set[str] = set(reachability.names_of(bits=selected))
+    return [node for node in nodes if node.name in names]
+
+
+def _select_one(
+    selector: str,
+    reachability: graph.Reachability,
+    node_map: dict[str, task.Task],
+    tags: dict[str, list[str]],
+) -> int:
+    upstream, body, downstream = (
+        selector.startswith("+"),
+        selector.strip("+"),
+        selector.endswith("+"),
+    )
+    if not body:
+        msg = f"Invalid selector: {selector!r}. Selectors need a task name or tag."
+        raise ValueError(msg)
+    if body.startswith(TAG):
+        names: list[str] = tags.get(body.removeprefix(TAG), [])
+    else:
+        names = [body] if body in node_map else []
+    if not names:
+        msg = f"Invalid selector: {selector}. No task matches: {body}."
+        raise ValueError(msg)
+
+    bits: int = reachability.bits(names=names)
+    if upstream:
+        bits |= reachability.upstream(names=names)
+    if downstream:
+        bits |= reachability.downstream(names=names)
+    return bits
@@ -0,0 +1,177 @@
+"""Streaming tasks, whose actions pass batches to each other through bounded queues.
+
+A task that `streams_from` an upstream task receives the batches its upstream action
+yields, as an iterator passed in the `batches` parameter, while the upstream action is
+still producing them. A chain of such tasks runs as one group, each action in its own
+thread, so the stages overlap and at most `depth` batches wait between two stages.
+"""
+
+import queue
+import threading
+from collections.abc import Iterator
+from concurrent import futures
+from typing import Any
+
+from pipelines import task
+
+QUEUE_DEPTH: int = 8
+PARAMETER: str = "batches"
+_POLL_SECONDS: float = 0.1
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    "Raised in a stage when another stage of its group failed."
+
+
+class _Channel:
+    "Bounded queue of batches from one stage to the next."
+
+    def __init__(self, depth: int, failed: threading.Event) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=depth)
+        self._failed = failed
+        self._closed = False
+
+    def close(self) -> None:
+        "Drops further batches, once the next stage stopped reading."
+        self._closed = True
+
+    def put(self, item: Any) -> None:
+        while True:
+            if self._failed.is_set():
+                raise _Cancelled
+            if self._closed:
+                return
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                item: Any = self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._failed.is_set():
+                    raise _Cancelled from None
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+
+def groups(nodes: list[task.Task]) -> dict[str, list[task.Task]]:
+    """Groups tasks connected by `streams_from`, which have to run together.
+
+    Returns:
+        dict[str, list[task.Task]]: members of each group, head first and every member
+            after the task it streams from, by the name of the group's head.
+    """
+    consumers: dict[str, list[task.Task]] = {}
+    for node in nodes:
+        if node.streams_from is not None:
+            consumers.setdefault(node.streams_from, []).append(node)
+    members_by_head: dict[str, list[task.Task]] = {}
+    for node in nodes:
+        if node.streams_from is None and node.name in consumers:
+            members: list[task.Task] = [node]
+            for member in members:  # grows as consumers are found, breadth first
+                members.extend(consumers.get(member.name, []))
+            members_by_head[node.name] = members
+    return members_by_head
+
+
+def validate(nodes: list[task.Task]) -> None:
+    """Checks that streaming tasks have actions and only depend on their stream.
+
+    Raises:
+        ValueError: raises if a streaming task, or the task it streams from, has no action, or if a streaming task has other dependencies.
+    """
+    node_map: dict[str, task.Task] = {node.name: node for node in nodes}
+    for node in nodes:
+        if node.streams_from is None:
+            continue
+        for streaming in [node, node_map.get(node.streams_from)]:
+            if streaming is not None and streaming.action is None:
+                msg = f"Cannot stream: {node.name} from {node.streams_from} because: {streaming.name} has no action."
+                raise ValueError(msg)
+        if node.depends_on != [node.streams_from]:
+            msg = f"Cannot stream: {node.name} from {node.streams_from} because it also depends on: {sorted(set(node.depends_on) - {node.streams_from})}.\nStreaming tasks can only depend on the task they stream from."
+            raise ValueError(msg)
+
+
+def run_group(
+    members: list[task.Task],
+    parameters: dict[str, dict[str, Any]],
+    depth: int = QUEUE_DEPTH,
+) -> dict[str, Any]:
+    """Runs a group of streaming tasks, each in its own thread.
+
+    Args:
+        members (list[task.Task]): the group, head first.
+        parameters (dict[str, dict[str, Any]]): parameters of each member, by task name.
+        depth (int, optional): maximum number of batches waiting between two stages. Defaults to QUEUE_DEPTH.
+
+    Returns:
+        dict[str, Any]: the value returned by each member that does not stream to
+            another, None for the others, by task name.
+    """
+    failed = threading.Event()
+    inputs: dict[str, _Channel] = {
+        member.name: _Channel(depth=depth, failed=failed)
+        for member in members
+        if member.streams_from is not None
+    }
+    outputs: dict[str, list[_Channel]] = {member.name: [] for member in members}
+    for member in members:
+        if member.streams_from is not None:
+            outputs[member.streams_from].append(inputs[member.name])
+
+    with futures.ThreadPoolExecutor(
+        max_workers=len(members), thread_name_prefix="pipelines-stream"
+    ) as pool:
+        stages: dict[str, futures.Future] = {
+            member.name: pool.submit(
+                _run_stage,
+                member,
+                parameters[member.name],
+                inputs.get(member.name),
+                outputs[member.name],
+                failed,
+            )
+            for member in members
+        }
+    for stage in stages.values():  # raise the failure that cancelled the others
+        if stage.exception() is not None and not isinstance(
+            stage.exception(), _Cancelled
+        ):
+            raise stage.exception()
+    return {name: stage.result() for name, stage in stages.items()}
+
+
+def _run_stage(
+    member: task.Task,
+    parameters: dict[str, Any],
+    batches: _Channel | None,
+    consumers: list[_Channel],
+    failed: threading.Event,
+) -> Any:
+    try:
+        if batches is not None:
+            parameters = parameters | {PARAMETER: iter(batches)}
+        value: Any = member.action(**parameters)
+        if not consumers:
+            return value
+        for batch in value:
+            for consumer in consumers:
+                consumer.put(batch)
+        for consumer in consumers:
+            consumer.put(_DONE)
+        return None
+    except BaseException:
+        failed.set()
+        raise
+    finally:
+        if batches is not None:
+            batches.close()
@@ -19,6 +19,14 @@ class Task(port.Port):
     src: Path = Path(__file__).parent
     retries: int = 3
     retry_delay: timedelta = timedelta(minutes=1)
+    cpu: float | None = None
+    memory: str | None = None
+    streams_from: str | None = None
+    timeout: timedelta | None = None
+    pool: str | None = None
+    map_over: dict[str, list[Any]] | None = None
+    reduce: Callable[[list[Any]], Any] | None = None
+    tags: list[str] = field(default_factory=list)
 
     def __eq__(self, other: object):
         self_action = (
@@ -39,6 +47,15 @@ class Task(port.Port):
                 self.depends_on == other.depends_on,
                 self.retries == other.retries,
                 self.retry_delay == other.retry_delay,
+                self.cpu == other.cpu,
+                self.memory == other.memory,
+                self.streams_from == other.streams_from,
+                self.timeout == other.timeout,
+                self.pool == other.pool,
+                self.map_over == other.map_over,
+                getattr(self.reduce, "__name__", None)
+                == getattr(other.reduce, "__name__", None),
+                self.tags == other.tags,
             ]
         ):
             return True
@@ -0,0 +1,43 @@
+"Enforcing `Task.timeout` in the process that runs a task."
+
+import contextlib
+import signal
+import threading
+from collections.abc import Iterator
+
+
+class TaskTimeoutError(TimeoutError):
+    "Raised when a task runs for longer than its timeout."
+
+
+def can_interrupt() -> bool:
+    "Whether `alarm` can interrupt code running in the calling thread."
+    return (
+        hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+
+
+@contextlib.contextmanager
+def alarm(seconds: float | None) -> Iterator[None]:
+    """Interrupts the code it wraps with TaskTimeoutError once `seconds` have passed.
+
+    Signals are only delivered to the main thread, so the code is only interrupted in
+    the main thread of a process on a platform with SIGALRM. Anywhere else this does
+    nothing, and the executor gives up waiting for the task instead.
+    """
+    if seconds is None or not can_interrupt():
+        yield
+        return
+
+    def interrupt(*_: object) -> None:
+        msg = f"Timed out after {seconds}s."
+        raise TaskTimeoutError(msg)
+
+    previous = signal.signal(signal.SIGALRM, interrupt)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -1,9 +1,11 @@
 import os
 import pathlib
 from collections.abc import Callable
+from datetime import timedelta
 
 import pytest
 from airflow import models
+from airflow.models.mappedoperator import MappedOperator
 from airflow.operators import empty
 
 from src.pipelines import pipeline, port, task
@@ -84,6 +86,90 @@ class TestPipeline:
         assert set(dag.task_ids) == {stub_task.name, stub_task_2.name}
         assert get_dag_edges(dag=dag) == {(stub_task.name, stub_task_2.name)}
 
+    @pytest.mark.slow
+    def test_compiles_resource_requests(
+        self,
+        get_stub_task: Callable[..., task.Task],
+        get_stub_pipeline: Callable[..., pipeline.Pipeline],
+        get_dag_from_string: Callable[..., models.DAG],
+    ) -> None:
+        compiler = airflow.Airflow()
+        stub_task: task.Task = get_stub_task()
+        stub_task.cpu, stub_task.memory = 2, "30Gi"
+        stub_pipeline: pipeline.Pipeline = get_stub_pipeline(tasks=[stub_task])
+
+        dag_definition: str = compiler.compile(stub_pipeline)
+        dag: models.DAG = get_dag_from_string(
+            dag_id=stub_pipeline.name, dag_definition=dag_definition
+        )
+
+        assert dag.get_task(stub_task.name).container_resources.requests == {
+            "cpu": "2",
+            "memory": "30Gi",
+        }
+
+    @pytest.mark.slow
+    def test_compiles_execution_timeout(
+        self,
+        get_stub_task: Callable[..., task.Task],
+        get_stub_pipeline: Callable[..., pipeline.Pipeline],
+        get_dag_from_string: Callable[..., models.DAG],
+    ) -> None:
+        compiler = airflow.Airflow()
+        stub_task: task.Task = get_stub_task()
+        stub_task.timeout = timedelta(minutes=90)
+        stub_pipeline: pipeline.Pipeline = get_stub_pipeline(tasks=[stub_task])
+
+        dag_definition: str = compiler.compile(stub_pipeline)
+        dag: models.DAG = get_dag_from_string(
+            dag_id=stub_pipeline.name, dag_definition=dag_definition
+        )
+
+        assert dag.get_task(stub_task.name).execution_timeout == timedelta(minutes=90)
+
+    @pytest.mark.slow
+    def test_compiles_pool(
+        self,
+        get_stub_task: Callable[..., task.Task],
+        get_stub_pipeline: Callable[..., pipeline.Pipeline],
+        get_dag_from_string: Callable[..., models.DAG],
+    ) -> None:
+        compiler = airflow.Airflow()
+        stub_task: task.Task = get_stub_task()
+        stub_task.pool = "warehouse"
+        stub_pipeline: pipeline.Pipeline = get_stub_pipeline(tasks=[stub_task])
+
+        dag_definition: str = compiler.compile(stub_pipeline)
+        dag: models.DAG = get_dag_from_string(
+            dag_id=stub_pipeline.name, dag_definition=dag_definition
+        )
+
+        assert dag.get_task(stub_task.name).pool == "warehouse"
+
+    @pytest.mark.slow
+    def test_compiles_mapped_task_as_expand(
+        self,
+        get_stub_task: Callable[..., task.Task],
+        get_stub_pipeline: Callable[..., pipeline.Pipeline],
+        get_dag_from_string: Callable[..., models.DAG],
+    ) -> None:
+        compiler = airflow.Airflow()
+        stub_task: task.Task = get_stub_task()
+        stub_task.map_over = {"region": ["us", "eu"]}
+        stub_pipeline: pipeline.Pipeline = get_stub_pipeline(tasks=[stub_task])
+
+        dag_definition: str = compiler.compile(stub_pipeline)
+        dag: models.DAG = get_dag_from_string(
+            dag_id=stub_pipeline.name, dag_definition=dag_definition
+        )
+
+        mapped_task = dag.get_task(stub_task.name)
+        assert isinstance(mapped_task, MappedOperator)
+        assert [cmds[-1] for cmds in mapped_task.expand_input.value["cmds"]] == [
+            '{"run_day": "{{ ds }}", "region": "us"}',
+            '{"run_day": "{{ ds }}", "region": "eu"}',
+        ]
+
     @pytest.mark.xfail
     @pytest.mark.slow
     def test_can_decompile_single_task(
@@ -1,3 +1,4 @@
+import json
 from collections.abc import Callable
 
 import pytest
@@ -63,6 +64,30 @@ class TestPipeline:
         assert task_dict[stub_task_2.name].depends_on[0].task_key == stub_task.name
         # TODO: increase coverage as implementation matures
 
+    @pytest.mark.slow
+    def test_compiles_mapped_task_as_for_each_task(
+        self,
+        get_stub_task: Callable[..., task.Task],
+        get_stub_pipeline: Callable[..., pipeline.Pipeline],
+    ) -> None:
+        compiler = databricks.Databricks()
+        stub_task: task.Task = get_stub_task()
+        stub_task.map_over = {"region": ["us", "eu"]}
+        stub_pipeline: pipeline.Pipeline = get_stub_pipeline(tasks=[stub_task])
+
+        databricks_pipeline = compiler.compile(
+            stub_pipeline, deploy_args=stub_deployment_args
+        )
+
+        for_each_task = databricks_pipeline.tasks[0].for_each_task
+        assert json.loads(for_each_task.inputs) == [
+            {"region": "us"},
+            {"region": "eu"},
+        ]
+        assert for_each_task.task.python_wheel_task.named_parameters == {
+            "region": "{{input.region}}"
+        }
+
     @pytest.mark.xfail
     @pytest.mark.slow
     def test_can_decompile_single_task(
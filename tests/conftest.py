@@ -16,6 +16,14 @@ sys.path.insert(0, TEST_ROOT)
 os.environ["PYTHONPATH"] = str(TEST_ROOT)
 
 
+@pytest.fixture(autouse=True)
+def project_root(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    monkeypatch.setenv("PROJECT_ROOT", str(tmp_path))
+    return tmp_path
+
+
 # TODO: to get sub tasks (multiple at once)
 @pytest.fixture(scope="function")
 def get_stub_task() -> Generator[Callable[..., task.Task], Any, None]:
@@ -1,6 +1,158 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+
 def stub_action() -> None:
     pass
 
 
 def stub_action_prints_test():
     print("test")
+
+
+def failing_action() -> None:
+    raise RuntimeError("stub failure")
+
+
+def make_lock() -> threading.Lock:
+    return threading.Lock()
+
+
+def lock_database(*args, **kwargs) -> None:
+    raise sqlite3.OperationalError("database is locked")
+
+
+def wait_for_barrier(barrier) -> None:
+    barrier.wait(timeout=5)
+
+
+def wait_for_event(event) -> None:
+    assert event.wait(timeout=5)
+
+
+def wait_until_logged(log: list) -> None:
+    deadline = time.monotonic() + 5
+    while not log:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def write_pid(path) -> None:
+    path.write_text(str(os.getpid()))
+
+
+async def async_handshake(own_event, other_event) -> None:
+    own_event.set()
+    await asyncio.wait_for(other_event.wait(), timeout=5)
+
+
+async def async_track_concurrency(counter: dict[str, int]) -> None:
+    counter["running"] += 1
+    counter["peak"] = max(counter["peak"], counter["running"])
+    await asyncio.sleep(0.01)
+    counter["running"] -= 1
+
+
+def flaky_action(attempts: dict[str, int], failures: int) -> None:
+    attempts["count"] += 1
+    if attempts["count"] <= failures:
+        raise RuntimeError("stub failure")
+
+
+def record_call(path, value: int = 0) -> int:
+    with path.open("a") as f:
+        f.write("called\n")
+    return value
+
+
+def track_concurrency(counter: dict[str, int], lock) -> None:
+    with lock:
+        counter["running"] += 1
+        counter["peak"] = max(counter["peak"], counter["running"])
+    time.sleep(0.05)
+    with lock:
+        counter["running"] -= 1
+
+
+def track_concurrency_on_day(run_day: str, counter: dict[str, int], lock) -> str:
+    track_concurrency(counter=counter, lock=lock)
+    return run_day
+
+
+def fail_on_day(run_day: str, failing_day: str) -> str:
+    if run_day == failing_day:
+        raise RuntimeError("stub failure")
+    return run_day
+
+
+def wait_for_barrier_on_day(run_day: str, barrier) -> str:
+    barrier.wait(timeout=5)
+    return run_day
+
+
+def fail_if_exists(path, value: int = 0) -> int:
+    if path.exists():
+        raise RuntimeError("stub failure")
+    return value
+
+
+def produce_batches(count: int, progress: dict[str, int]):
+    for batch in range(count):
+        progress["produced"] += 1
+        yield batch
+
+
+def double_batches(batches):
+    for batch in batches:
+        yield batch * 2
+
+
+def consume_batches(batches, progress: dict[str, int]) -> int:
+    total = 0
+    for batch in batches:
+        progress["consumed"] += 1
+        progress["lag"] = max(
+            progress["lag"], progress["produced"] - progress["consumed"]
+        )
+        total += batch
+    return total
+
+
+def fail_on_batch(batches) -> None:
+    for _ in batches:
+        raise RuntimeError("stub failure")
+
+
+def exit_once(path, value: int = 0) -> int:
+    if not path.exists():
+        path.touch()
+        os._exit(1)
+    return value
+
+
+def sleep_for(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def sleep_on_day(run_day: str, seconds: float) -> str:
+    time.sleep(seconds)
+    return run_day
+
+
+async def async_sleep_for(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+async def async_raise_timeout() -> None:
+    raise TimeoutError("stub timeout")
+
+
+def multiply(value: int, factor: int = 1) -> int:
+    return value * factor
+
+
+def total(results: list[int]) -> int:
+    return sum(results)
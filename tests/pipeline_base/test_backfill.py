@@ -0,0 +1,142 @@
+import datetime
+import threading
+
+import pytest
+
+from pipelines import pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_stub_pipeline(failing_day: str = "") -> pipeline.Pipeline:
+    return pipeline.Pipeline(
+        name="stub_pipeline",
+        tasks=[
+            task.Task(
+                name="stub_task",
+                action=pipelines_helpers.fail_on_day,
+                parameters={"failing_day": failing_day},
+                retries=0,
+            )
+        ],
+    )
+
+
+class TestBackfill:
+    def test_runs_every_day_inclusive(self) -> None:
+        stub_pipeline = get_stub_pipeline()
+
+        records = stub_pipeline.backfill(start="2024-01-30", end="2024-02-01")
+
+        assert {
+            day: record.run_time_parameters["run_day"]
+            for day, record in records.items()
+        } == {
+            datetime.date(2024, 1, 30): "2024-01-30",
+            datetime.date(2024, 1, 31): "2024-01-31",
+            datetime.date(2024, 2, 1): "2024-02-01",
+        }
+        assert {record.status for record in records.values()} == {runs.Status.SUCCEEDED}
+
+    def test_runs_days_concurrently(self) -> None:
+        barrier = threading.Barrier(parties=2)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.wait_for_barrier_on_day,
+                    parameters={"barrier": barrier},
+                    retries=0,
+                )
+            ],
+        )
+
+        records = stub_pipeline.backfill(
+            start="2024-01-01", end="2024-01-02", max_concurrent_runs=2, max_workers=2
+        )
+
+        assert len(stub_pipeline.log) == 2
+        assert {record.status for record in records.values()} == {runs.Status.SUCCEEDED}
+
+    @pytest.mark.parametrize("executor", ["serial", "threads"])
+    def test_limits_workers_across_days(self, executor: str) -> None:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.track_concurrency_on_day,
+                    parameters={"counter": counter, "lock": threading.Lock()},
+                )
+            ],
+        )
+
+        records = stub_pipeline.backfill(
+            start="2024-01-01",
+            end="2024-01-04",
+            max_concurrent_runs=4,
+            executor=executor,
+            max_workers=1,
+        )
+
+        assert counter["peak"] == 1
+        assert {record.status for record in records.values()} == {runs.Status.SUCCEEDED}
+
+    def test_limits_pools_across_days(self) -> None:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.track_concurrency_on_day,
+                    parameters={"counter": counter, "lock": threading.Lock()},
+                    pool="warehouse",
+                )
+            ],
+        )
+
+        records = stub_pipeline.backfill(
+            start="2024-01-01",
+            end="2024-01-04",
+            max_concurrent_runs=4,
+            executor="threads",
+            max_workers=4,
+            pools={"warehouse": 1},
+        )
+
+        assert counter["peak"] == 1
+        assert {record.status for record in records.values()} == {runs.Status.SUCCEEDED}
+
+    def test_failed_day_does_not_stop_other_days(self, caplog) -> None:
+        stub_pipeline = get_stub_pipeline(failing_day="2024-01-01")
+
+        records = stub_pipeline.backfill(start="2024-01-01", end="2024-01-02")
+
+        assert [record.status for record in records.values()] == [
+            runs.Status.FAILED,
+            runs.Status.SUCCEEDED,
+        ]
+        assert "Backfill of: stub_pipeline for 2024-01-01 failed" in caplog.text
+
+    def test_depends_on_past_skips_days_after_failure(self) -> None:
+        stub_pipeline = get_stub_pipeline(failing_day="2024-01-02")
+
+        records = stub_pipeline.backfill(
+            start="2024-01-01",
+            end="2024-01-04",
+            max_concurrent_runs=4,
+            depends_on_past=True,
+        )
+
+        assert [record.status for record in records.values()] == [
+            runs.Status.SUCCEEDED,
+            runs.Status.FAILED,
+            runs.Status.SKIPPED,
+            runs.Status.SKIPPED,
+        ]
+
+    def test_raises_if_end_is_before_start(self) -> None:
+        with pytest.raises(ValueError, match="the end is before the start"):
+            get_stub_pipeline().backfill(start="2024-01-02", end="2024-01-01")
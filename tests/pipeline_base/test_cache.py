@@ -0,0 +1,226 @@
+import pathlib
+
+import pytest
+
+from pipelines import cache, pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_calls(path: pathlib.Path) -> int:
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+class TestFingerprint:
+    def test_changes_with_parameters(self) -> None:
+        stub_task = task.Task(name="stub_task", action=pipelines_helpers.stub_action)
+
+        assert cache.fingerprint(
+            node=stub_task, run_time_parameters={}, upstream_fingerprints=[]
+        ) != cache.fingerprint(
+            node=stub_task, run_time_parameters={"run_day": 1}, upstream_fingerprints=[]
+        )
+
+    def test_changes_with_upstream_fingerprints(self) -> None:
+        stub_task = task.Task(name="stub_task", action=pipelines_helpers.stub_action)
+
+        assert cache.fingerprint(
+            node=stub_task, run_time_parameters={}, upstream_fingerprints=["a"]
+        ) != cache.fingerprint(
+            node=stub_task, run_time_parameters={}, upstream_fingerprints=["b"]
+        )
+
+    def test_changes_with_action_source(self) -> None:
+        assert cache.fingerprint(
+            node=task.Task(name="stub_task", action=pipelines_helpers.stub_action),
+            run_time_parameters={},
+            upstream_fingerprints=[],
+        ) != cache.fingerprint(
+            node=task.Task(name="stub_task", action=pipelines_helpers.failing_action),
+            run_time_parameters={},
+            upstream_fingerprints=[],
+        )
+
+    def test_changes_with_src_files(self, tmp_path: pathlib.Path) -> None:
+        (tmp_path / "__main__.py").write_text("print(1)\n")
+        src_task = task.Task(name="stub_task", src=tmp_path)
+        before: str = cache.fingerprint(
+            node=src_task, run_time_parameters={}, upstream_fingerprints=[]
+        )
+
+        (tmp_path / "__main__.py").write_text("print(2)\n")
+
+        assert before != cache.fingerprint(
+            node=src_task, run_time_parameters={}, upstream_fingerprints=[]
+        )
+
+    def test_raises_for_parameters_without_stable_encoding(self) -> None:
+        stub_task = task.Task(
+            name="stub_task",
+            action=pipelines_helpers.stub_action,
+            parameters={"frame": object()},
+        )
+
+        with pytest.raises(cache.FingerprintError, match="type: object"):
+            cache.fingerprint(
+                node=stub_task, run_time_parameters={}, upstream_fingerprints=[]
+            )
+
+
+class TestResultCache:
+    def test_round_trip(self, tmp_path: pathlib.Path) -> None:
+        result_cache = cache.ResultCache(directory=tmp_path)
+
+        result_cache.put(key="stub_key", value={"stub": 1})
+
+        assert result_cache.get(key="stub_key") == (True, {"stub": 1})
+        assert result_cache.get(key="missing_key") == (False, None)
+        assert (result_cache.stats().hits, result_cache.stats().misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path: pathlib.Path) -> None:
+        result_cache = cache.ResultCache(directory=tmp_path, max_bytes=10**6)
+        for key in ["first", "second"]:
+            result_cache.put(key=key, value=b"x" * 400_000)
+        result_cache.get(key="first")
+
+        result_cache.put(key="third", value=b"x" * 400_000)
+
+        assert "first" in result_cache
+        assert "second" not in result_cache
+        assert "third" in result_cache
+        assert result_cache.stats().evictions == 1
+
+    def test_raises_for_unpicklable_result(self, tmp_path: pathlib.Path) -> None:
+        result_cache = cache.ResultCache(directory=tmp_path)
+
+        with pytest.raises(cache.CacheError, match="cannot be pickled"):
+            result_cache.put(key="stub_key", value=pipelines_helpers.make_lock())
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_clear(self, tmp_path: pathlib.Path) -> None:
+        result_cache = cache.ResultCache(directory=tmp_path)
+        result_cache.put(key="stub_key", value=1)
+
+        result_cache.clear()
+
+        assert result_cache.stats().entries == 0
+
+
+class TestRunWithCache:
+    def test_skips_unchanged_tasks(self, tmp_path: pathlib.Path) -> None:
+        calls = tmp_path / "calls.txt"
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": calls, "value": 1},
+                )
+            ],
+        )
+        stub_pipeline.cache = cache.ResultCache(directory=tmp_path / "cache")
+
+        first_results = stub_pipeline.run(use_cache=True)
+        second_results = stub_pipeline.run(use_cache=True)
+
+        assert get_calls(path=calls) == 1
+        assert first_results == second_results == {"stub_task": 1}
+        assert [attempt.status for attempt in stub_pipeline.runs[-1].attempts] == [
+            runs.Status.SKIPPED
+        ]
+
+    def test_does_not_fail_run_for_unpicklable_result(
+        self, tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.make_lock)],
+        )
+        stub_pipeline.cache = cache.ResultCache(directory=tmp_path / "cache")
+
+        stub_pipeline.run(use_cache=True)
+
+        assert stub_pipeline.runs[-1].status is runs.Status.SUCCEEDED
+        assert stub_pipeline.cache.stats().entries == 0
+        assert list((tmp_path / "cache").iterdir()) == []
+        assert "Task: stub_task will rerun" in caplog.text
+
+    def test_reruns_downstream_of_changed_task(self, tmp_path: pathlib.Path) -> None:
+        upstream_calls = tmp_path / "upstream_calls.txt"
+        downstream_calls = tmp_path / "downstream_calls.txt"
+        upstream_task = task.Task(
+            name="upstream_task",
+            action=pipelines_helpers.record_call,
+            parameters={"path": upstream_calls, "value": 1},
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                upstream_task,
+                task.Task(
+                    name="downstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": downstream_calls},
+                    depends_on=["upstream_task"],
+                ),
+            ],
+        )
+        stub_pipeline.cache = cache.ResultCache(directory=tmp_path / "cache")
+        stub_pipeline.run(use_cache=True)
+
+        upstream_task.parameters["value"] = 2
+        stub_pipeline.run(use_cache=True)
+
+        assert get_calls(path=upstream_calls) == 2
+        assert get_calls(path=downstream_calls) == 2
+
+    def test_reruns_tasks_that_cannot_be_fingerprinted(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        upstream_calls = tmp_path / "upstream_calls.txt"
+        downstream_calls = tmp_path / "downstream_calls.txt"
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="upstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": upstream_calls, "value": 1j},
+                ),
+                task.Task(
+                    name="downstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": downstream_calls},
+                    depends_on=["upstream_task"],
+                ),
+            ],
+        )
+        stub_pipeline.cache = cache.ResultCache(directory=tmp_path / "cache")
+
+        stub_pipeline.run(use_cache=True)
+        stub_pipeline.run(use_cache=True)
+
+        assert get_calls(path=upstream_calls) == 2
+        assert get_calls(path=downstream_calls) == 2
+        assert stub_pipeline.cache.stats().entries == 0
+
+    def test_does_not_use_cache_by_default(self, tmp_path: pathlib.Path) -> None:
+        calls = tmp_path / "calls.txt"
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": calls},
+                )
+            ],
+        )
+        stub_pipeline.cache = cache.ResultCache(directory=tmp_path / "cache")
+
+        stub_pipeline.run()
+        stub_pipeline.run()
+
+        assert get_calls(path=calls) == 2
+        assert stub_pipeline.cache.stats().entries == 0
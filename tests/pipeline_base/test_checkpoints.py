@@ -0,0 +1,165 @@
+import os
+import pathlib
+import threading
+
+import pytest
+
+from pipelines import checkpoints, pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_calls(path: pathlib.Path) -> int:
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+class TestCheckpoint:
+    def test_saves_results_as_tasks_complete(self, tmp_path: pathlib.Path) -> None:
+        checkpoint = checkpoints.Checkpoint(path=tmp_path / "checkpoint.sqlite")
+        checkpoint.start(options={"max_workers": 2})
+
+        checkpoint.complete(task_name="stub_task", result={"rows": 1})
+
+        assert checkpoint.options() == {"max_workers": 2}
+        assert checkpoint.completed() == {"stub_task": {"rows": 1}}
+
+    def test_raises_for_unpicklable_result(self, tmp_path: pathlib.Path) -> None:
+        checkpoint = checkpoints.Checkpoint(path=tmp_path / "checkpoint.sqlite")
+
+        with pytest.raises(checkpoints.CheckpointError, match="cannot be pickled"):
+            checkpoint.complete(task_name="stub_task", result=threading.Lock())
+
+    def test_unpicklable_options_leave_no_checkpoint(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        checkpoint = checkpoints.Checkpoint(path=tmp_path / "checkpoint.sqlite")
+
+        with pytest.raises(checkpoints.CheckpointError, match="cannot be pickled"):
+            checkpoint.start(options={"lock": threading.Lock()})
+
+        assert not checkpoint.exists()
+
+
+class TestPrune:
+    def test_keeps_most_recent_checkpoints(self, tmp_path: pathlib.Path) -> None:
+        saved: list[checkpoints.Checkpoint] = []
+        for index in range(3):
+            checkpoint = checkpoints.Checkpoint(
+                path=tmp_path / f"run_{index}" / "checkpoint.sqlite"
+            )
+            checkpoint.start(options={})
+            os.utime(checkpoint.path, (index, index))
+            saved.append(checkpoint)
+
+        checkpoints.prune(directory=tmp_path, keep=2)
+
+        assert [checkpoint.exists() for checkpoint in saved] == [False, True, True]
+        assert not (tmp_path / "run_0").exists()
+
+
+class TestResume:
+    def test_skips_completed_tasks(self, tmp_path: pathlib.Path) -> None:
+        calls = tmp_path / "calls.txt"
+        failure_flag = tmp_path / "fail"
+        failure_flag.touch()
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="upstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": calls, "value": 1},
+                ),
+                task.Task(
+                    name="downstream_task",
+                    action=pipelines_helpers.fail_if_exists,
+                    parameters={"path": failure_flag, "value": 2},
+                    depends_on=["upstream_task"],
+                    retries=0,
+                ),
+            ],
+        )
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run(run_time_parameters={"value": 3}, checkpoint=True)
+        run_id: str = stub_pipeline.runs[-1].run_id
+        failure_flag.unlink()
+
+        results = stub_pipeline.resume(run_id=run_id)
+
+        assert get_calls(path=calls) == 1
+        assert results == {"upstream_task": 3, "downstream_task": 3}
+        assert stub_pipeline.runs[-1].run_id == run_id
+        assert [attempt.status for attempt in stub_pipeline.runs[-1].attempts] == [
+            runs.Status.SKIPPED,
+            runs.Status.SUCCEEDED,
+        ]
+
+    def test_cannot_resume_successful_run(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+        stub_pipeline.run(checkpoint=True)
+
+        with pytest.raises(ValueError, match="has no checkpoint"):
+            stub_pipeline.resume(run_id=stub_pipeline.runs[-1].run_id)
+
+    def test_cannot_resume_run_without_checkpoint(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.fail_if_exists,
+                    parameters={"path": pathlib.Path(__file__), "value": 1},
+                )
+            ],
+        )
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run()
+
+        with pytest.raises(ValueError, match="has no checkpoint"):
+            stub_pipeline.resume(run_id=stub_pipeline.runs[-1].run_id)
+
+    def test_keeps_checkpoints_of_last_failed_runs(
+        self, project_root: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(checkpoints, "MAX_CHECKPOINTS", 2)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.fail_if_exists,
+                    parameters={"path": pathlib.Path(__file__), "value": 1},
+                )
+            ],
+        )
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="stub failure"):
+                stub_pipeline.run(checkpoint=True)
+
+        saved = list(
+            (project_root / ".pipelines" / "runs" / "stub_pipeline").glob(
+                "*/checkpoint.sqlite"
+            )
+        )
+        assert len(saved) == 2
+
+    def test_cannot_resume_run_with_unpicklable_options(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.fail_if_exists,
+                    parameters={"path": pathlib.Path(__file__)},
+                )
+            ],
+        )
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run(
+                run_time_parameters={"value": threading.Lock()}, checkpoint=True
+            )
+
+        with pytest.raises(ValueError, match="has no checkpoint"):
+            stub_pipeline.resume(run_id=stub_pipeline.runs[-1].run_id)
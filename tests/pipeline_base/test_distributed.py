@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from pipelines import distributed, executors, pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+@pytest.fixture
+def address(tmp_path, monkeypatch) -> Iterator[str]:
+    monkeypatch.setenv("PIPELINES_AUTHKEY", "stub_authkey")  # inherited by workers
+    socket_path = str(tmp_path / "coordinator.sock")
+    workers = [
+        multiprocessing.get_context("spawn").Process(
+            target=distributed.work,
+            kwargs={"address": socket_path, "heartbeat_seconds": 0.1},
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.start()
+    yield socket_path
+    for worker in workers:  # workers that never got a task are still connecting
+        worker.kill()
+        worker.join()
+
+
+class TestParseAddress:
+    def test_reads_host_and_port(self) -> None:
+        assert distributed.parse_address(address="localhost:7000") == (
+            "localhost",
+            7000,
+        )
+
+    def test_reads_anything_else_as_a_socket_path(self) -> None:
+        assert distributed.parse_address(address="/tmp/pipelines.sock") == (
+            "/tmp/pipelines.sock"
+        )
+
+
+class TestGetAuthkey:
+    def test_reads_environment(self, monkeypatch) -> None:
+        monkeypatch.setenv("PIPELINES_AUTHKEY", "stub_authkey")
+
+        assert distributed.get_authkey(address=("0.0.0.0", 7000)) == b"stub_authkey"
+
+    @pytest.mark.parametrize(
+        "address", [("localhost", 0), ("127.0.0.1", 0), ("::1", 0), "/tmp/stub.sock"]
+    )
+    def test_generates_key_for_local_address(self, address, monkeypatch) -> None:
+        monkeypatch.delenv("PIPELINES_AUTHKEY", raising=False)
+
+        authkey = distributed.get_authkey(address=address)
+
+        assert authkey != distributed.get_authkey(address=address)
+        assert len(authkey) == 32
+
+    @pytest.mark.parametrize("address", [("0.0.0.0", 7000), ("coordinator-host", 0)])
+    def test_requires_key_for_remote_address(self, address, monkeypatch) -> None:
+        monkeypatch.delenv("PIPELINES_AUTHKEY", raising=False)
+
+        with pytest.raises(ValueError, match="PIPELINES_AUTHKEY"):
+            distributed.get_authkey(address=address)
+
+    def test_worker_requires_key(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.delenv("PIPELINES_AUTHKEY", raising=False)
+
+        with pytest.raises(ValueError, match="PIPELINES_AUTHKEY"):
+            distributed.work(address=str(tmp_path / "coordinator.sock"))
+
+    def test_coordinator_accepts_worker_with_generated_key(
+        self, tmp_path, monkeypatch
+    ) -> None:
+        monkeypatch.delenv("PIPELINES_AUTHKEY", raising=False)
+        with distributed.Coordinator(address=str(tmp_path / "c.sock")) as coordinator:
+            worker = threading.Thread(
+                target=distributed.work,
+                kwargs={"address": coordinator.address, "authkey": coordinator.authkey},
+            )
+            worker.start()
+
+            assert coordinator.submit(pow, 2, 3).result(timeout=10) == 8
+
+        worker.join(timeout=10)
+        assert not worker.is_alive()
+
+
+class TestDistributedExecutor:
+    def test_runs_tasks_on_workers(self, address, tmp_path) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name=f"stub_task_{i}",
+                    action=pipelines_helpers.write_pid,
+                    parameters={"path": tmp_path / f"{i}.pid"},
+                )
+                for i in range(4)
+            ],
+        )
+
+        stub_pipeline.run(
+            executor=executors.Executors.DISTRIBUTED, address=address, checkpoint=False
+        )
+
+        pids = {int((tmp_path / f"{i}.pid").read_text()) for i in range(4)}
+        assert len(stub_pipeline.log) == 4
+        assert os.getpid() not in pids
+
+    def test_returns_results_in_dependency_order(self, address, tmp_path) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="upstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": tmp_path / "calls.txt", "value": 3},
+                ),
+                task.Task(
+                    name="downstream_task",
+                    action=pipelines_helpers.record_call,
+                    parameters={"path": tmp_path / "calls.txt", "value": 4},
+                    depends_on=["upstream_task"],
+                ),
+            ],
+        )
+
+        results = stub_pipeline.run(
+            executor="distributed", address=address, checkpoint=False
+        )
+
+        assert results == {"upstream_task": 3, "downstream_task": 4}
+        assert [node.name for node in stub_pipeline.log] == [
+            "upstream_task",
+            "downstream_task",
+        ]
+
+    def test_hands_lost_task_to_another_worker(self, address, tmp_path) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task",
+                    action=pipelines_helpers.exit_once,
+                    parameters={"path": tmp_path / "exited", "value": 1},
+                    retries=0,
+                )
+            ],
+        )
+
+        results = stub_pipeline.run(
+            executor="distributed", address=address, checkpoint=False
+        )
+
+        assert results == {"stub_task": 1}
+        assert [attempt.status for attempt in stub_pipeline.runs[-1].attempts] == [
+            runs.Status.SUCCEEDED
+        ]
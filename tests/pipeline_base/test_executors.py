@@ -0,0 +1,487 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent import futures
+from datetime import timedelta
+
+import pytest
+
+from pipelines import executors, pipeline, runs, task, timeouts
+from tests.pipeline_base import pipelines_helpers
+
+
+class TestThreads:
+    def test_runs_independent_tasks_concurrently(self) -> None:
+        barrier = threading.Barrier(parties=2)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name=f"stub_task_{i}",
+                    action=pipelines_helpers.wait_for_barrier,
+                    parameters={"barrier": barrier},
+                )
+                for i in range(2)
+            ],
+        )
+
+        stub_pipeline.run(executor="threads", max_workers=2)
+
+        assert len(stub_pipeline.log) == 2
+
+    def test_logs_tasks_in_completion_order(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        slow_task = task.Task(
+            name="slow_task",
+            action=pipelines_helpers.wait_until_logged,
+            parameters={"log": stub_pipeline.log},
+        )
+        fast_task = task.Task(name="fast_task", action=pipelines_helpers.stub_action)
+        stub_pipeline.tasks = [slow_task, fast_task]
+
+        stub_pipeline.run(executor=executors.Executors.THREADS, max_workers=2)
+
+        assert stub_pipeline.log == [fast_task, slow_task]
+
+    def test_runs_dependencies_first(self) -> None:
+        upstream_task = task.Task(
+            name="upstream_task", action=pipelines_helpers.stub_action
+        )
+        downstream_task = task.Task(
+            name="downstream_task",
+            action=pipelines_helpers.stub_action,
+            depends_on=["upstream_task"],
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[downstream_task, upstream_task]
+        )
+
+        stub_pipeline.run(executor="threads")
+
+        assert stub_pipeline.log == [upstream_task, downstream_task]
+
+    def test_stops_scheduling_after_failure(self) -> None:
+        failing_task = task.Task(
+            name="failing_task", action=pipelines_helpers.failing_action, retries=0
+        )
+        downstream_task = task.Task(
+            name="downstream_task",
+            action=pipelines_helpers.stub_action,
+            depends_on=["failing_task"],
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[failing_task, downstream_task]
+        )
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run(executor="threads")
+
+        assert stub_pipeline.log == []
+
+
+class TestProcesses:
+    def test_reuses_worker_processes(self, tmp_path) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name=f"stub_task_{i}",
+                    action=pipelines_helpers.write_pid,
+                    parameters={"path": tmp_path / f"stub_task_{i}.pid"},
+                )
+                for i in range(3)
+            ],
+        )
+
+        stub_pipeline.run(executor="processes", max_workers=1)
+
+        pids = {path.read_text() for path in tmp_path.glob("*.pid")}
+        assert len(stub_pipeline.log) == 3
+        assert len(pids) == 1
+        assert pids != {str(os.getpid())}
+
+    def test_raises_before_running_if_task_cannot_be_pickled(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(name="stub_task", action=pipelines_helpers.stub_action),
+                task.Task(
+                    name="unpicklable_task",
+                    action=pipelines_helpers.wait_for_event,
+                    parameters={"event": threading.Event()},
+                ),
+            ],
+        )
+
+        with pytest.raises(ValueError, match="unpicklable_task"):
+            stub_pipeline.run(executor="processes")
+
+        assert stub_pipeline.log == []
+
+
+class TestValidatePicklable:
+    def test_raises_for_unpicklable_action(self) -> None:
+        with pytest.raises(ValueError, match="action cannot be pickled"):
+            executors.validate_picklable(
+                task_name="stub_task", action=lambda: None, parameters={}
+            )
+
+    def test_add_task_accepts_unpicklable_parameters(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        event = threading.Event()
+        event.set()
+
+        stub_pipeline.add_task(
+            name="stub_task",
+            action=pipelines_helpers.wait_for_event,
+            parameters={"event": event},
+        )
+        stub_pipeline.run(executor="threads")
+
+        assert [node.name for node in stub_pipeline.log] == ["stub_task"]
+
+
+class TestAsync:
+    def test_awaits_coroutine_actions_concurrently(self) -> None:
+        first_event, second_event = asyncio.Event(), asyncio.Event()
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="first_task",
+                    action=pipelines_helpers.async_handshake,
+                    parameters={"own_event": first_event, "other_event": second_event},
+                ),
+                task.Task(
+                    name="second_task",
+                    action=pipelines_helpers.async_handshake,
+                    parameters={"own_event": second_event, "other_event": first_event},
+                ),
+            ],
+        )
+
+        asyncio.run(stub_pipeline.arun())
+
+        assert len(stub_pipeline.log) == 2
+
+    def test_honors_max_concurrency(self) -> None:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name=f"stub_task_{i}",
+                    action=pipelines_helpers.async_track_concurrency,
+                    parameters={"counter": counter},
+                )
+                for i in range(5)
+            ],
+        )
+
+        asyncio.run(stub_pipeline.arun(max_concurrency=2))
+
+        assert counter["peak"] == 2
+
+    def test_offloads_plain_functions(self, capfd) -> None:
+        upstream_task = task.Task(
+            name="upstream_task", action=pipelines_helpers.stub_action_prints_test
+        )
+        downstream_task = task.Task(
+            name="downstream_task",
+            action=pipelines_helpers.async_track_concurrency,
+            parameters={"counter": {"running": 0, "peak": 0}},
+            depends_on=["upstream_task"],
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[downstream_task, upstream_task]
+        )
+
+        asyncio.run(stub_pipeline.arun(max_workers=1))
+
+        assert capfd.readouterr().out.strip() == "test"
+        assert stub_pipeline.log == [upstream_task, downstream_task]
+
+    def test_stops_scheduling_after_failure(self) -> None:
+        failing_task = task.Task(
+            name="failing_task", action=pipelines_helpers.failing_action, retries=0
+        )
+        downstream_task = task.Task(
+            name="downstream_task",
+            action=pipelines_helpers.stub_action,
+            depends_on=["failing_task"],
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[failing_task, downstream_task]
+        )
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            asyncio.run(stub_pipeline.arun())
+
+        assert stub_pipeline.log == []
+
+
+class TestRetries:
+    def test_retries_failed_task(self) -> None:
+        attempts: dict[str, int] = {"count": 0}
+        flaky_task = task.Task(
+            name="flaky_task",
+            action=pipelines_helpers.flaky_action,
+            parameters={"attempts": attempts, "failures": 2},
+            retries=2,
+            retry_delay=timedelta(0),
+        )
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[flaky_task])
+
+        stub_pipeline.run(executor="threads", retry=True)
+
+        assert attempts["count"] == 3
+        assert stub_pipeline.log == [flaky_task]
+
+    def test_raises_once_retries_are_exhausted(self) -> None:
+        attempts: dict[str, int] = {"count": 0}
+        flaky_task = task.Task(
+            name="flaky_task",
+            action=pipelines_helpers.flaky_action,
+            parameters={"attempts": attempts, "failures": 3},
+            retries=2,
+            retry_delay=timedelta(0),
+        )
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[flaky_task])
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run(retry=True)
+
+        assert attempts["count"] == 3
+
+    def test_runs_independent_tasks_while_waiting_to_retry(self) -> None:
+        flaky_task = task.Task(
+            name="flaky_task",
+            action=pipelines_helpers.flaky_action,
+            parameters={"attempts": {"count": 0}, "failures": 1},
+            retries=1,
+            retry_delay=timedelta(seconds=0.2),
+        )
+        independent_task = task.Task(
+            name="independent_task", action=pipelines_helpers.stub_action
+        )
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[flaky_task, independent_task]
+        )
+
+        stub_pipeline.run(retry=True)
+
+        assert stub_pipeline.log == [independent_task, flaky_task]
+
+    def test_async_retries_failed_task(self) -> None:
+        attempts: dict[str, int] = {"count": 0}
+        flaky_task = task.Task(
+            name="flaky_task",
+            action=pipelines_helpers.flaky_action,
+            parameters={"attempts": attempts, "failures": 1},
+            retries=1,
+            retry_delay=timedelta(0),
+        )
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[flaky_task])
+
+        asyncio.run(stub_pipeline.arun(retry=True))
+
+        assert attempts["count"] == 2
+
+    def test_does_not_retry_by_default(self) -> None:
+        attempts: dict[str, int] = {"count": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="flaky_task",
+                    action=pipelines_helpers.flaky_action,
+                    parameters={"attempts": attempts, "failures": 1},
+                )
+            ],
+        )
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run()
+
+        assert attempts["count"] == 1
+
+    def test_backoff_grows_exponentially(self) -> None:
+        delay: float = executors.backoff_seconds(
+            retry_delay=timedelta(seconds=1), attempt=3
+        )
+
+        assert 2 <= delay <= 4
+
+
+def get_sleeping_pipeline(seconds: float = 5) -> pipeline.Pipeline:
+    return pipeline.Pipeline(
+        name="stub_pipeline",
+        tasks=[
+            task.Task(
+                name="sleeping_task",
+                action=pipelines_helpers.sleep_for,
+                parameters={"seconds": seconds},
+                retries=0,
+                timeout=timedelta(seconds=0.2),
+            )
+        ],
+    )
+
+
+class TestTimeouts:
+    @pytest.mark.parametrize("executor", ["serial", "threads", "processes"])
+    def test_fails_task_that_runs_too_long(self, executor) -> None:
+        stub_pipeline = get_sleeping_pipeline(seconds=1)
+        started = time.monotonic()
+
+        with pytest.raises(timeouts.TaskTimeoutError):
+            stub_pipeline.run(executor=executor)
+
+        assert time.monotonic() - started < 1
+        assert [attempt.status for attempt in stub_pipeline.runs[-1].attempts] == [
+            runs.Status.FAILED
+        ]
+
+    def test_serial_fails_task_off_main_thread(self) -> None:
+        stub_pipeline = get_sleeping_pipeline(seconds=1)
+        started = time.monotonic()
+
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            running = pool.submit(stub_pipeline.run, executor="serial")
+            with pytest.raises(timeouts.TaskTimeoutError):
+                running.result(timeout=5)
+
+        assert time.monotonic() - started < 1
+
+    def test_serial_backfill_fails_task_that_runs_too_long(self) -> None:
+        stub_pipeline = get_sleeping_pipeline(seconds=1)
+        stub_pipeline.tasks[0].action = pipelines_helpers.sleep_on_day
+        started = time.monotonic()
+
+        records = stub_pipeline.backfill(
+            start="2024-01-01", end="2024-01-01", executor="serial"
+        )
+
+        assert time.monotonic() - started < 1
+        (record,) = records.values()
+        assert record.status is runs.Status.FAILED
+        assert "TaskTimeoutError" in record.attempts[0].error
+
+    def test_retries_task_that_timed_out(self) -> None:
+        stub_pipeline = get_sleeping_pipeline(seconds=1)
+        stub_pipeline.tasks[0].retries = 1
+        stub_pipeline.tasks[0].retry_delay = timedelta(0)
+
+        with pytest.raises(timeouts.TaskTimeoutError):
+            stub_pipeline.run(retry=True)
+
+        assert len(stub_pipeline.runs[-1].attempts) == 2
+
+    def test_kills_src_script(self, tmp_path) -> None:
+        (tmp_path / "__main__.py").write_text("import time\ntime.sleep(5)\n")
+        started = time.monotonic()
+
+        with pytest.raises(timeouts.TaskTimeoutError):
+            executors.run_src(src=tmp_path, timeout=0.2)
+
+        assert time.monotonic() - started < 5
+
+    def test_async_cancels_coroutine(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="sleeping_task",
+                    action=pipelines_helpers.async_sleep_for,
+                    parameters={"seconds": 5},
+                    retries=0,
+                    timeout=timedelta(seconds=0.2),
+                )
+            ],
+        )
+
+        with pytest.raises(timeouts.TaskTimeoutError):
+            asyncio.run(stub_pipeline.arun())
+
+    def test_async_keeps_timeout_raised_by_action(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="timing_out_task",
+                    action=pipelines_helpers.async_raise_timeout,
+                    retries=0,
+                    timeout=timedelta(seconds=5),
+                )
+            ],
+        )
+
+        with pytest.raises(TimeoutError, match="stub timeout") as raised:
+            asyncio.run(stub_pipeline.arun())
+
+        assert not isinstance(raised.value, timeouts.TaskTimeoutError)
+
+
+class TestFailFast:
+    def test_cancels_running_tasks(self) -> None:
+        event = threading.Event()
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="failing_task",
+                    action=pipelines_helpers.failing_action,
+                    retries=0,
+                ),
+                task.Task(
+                    name="waiting_task",
+                    action=pipelines_helpers.wait_for_event,
+                    parameters={"event": event},
+                ),
+            ],
+        )
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run(executor="threads", max_workers=2, fail_fast=True)
+        cancelled = not event.is_set()
+        event.set()
+
+        assert cancelled
+        assert {
+            attempt.task_name: attempt.status
+            for attempt in stub_pipeline.runs[-1].attempts
+        } == {
+            "failing_task": runs.Status.FAILED,
+            "waiting_task": runs.Status.CANCELLED,
+        }
+
+    def test_async_cancels_running_tasks(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="failing_task",
+                    action=pipelines_helpers.failing_action,
+                    retries=0,
+                ),
+                task.Task(
+                    name="sleeping_task",
+                    action=pipelines_helpers.async_sleep_for,
+                    parameters={"seconds": 5},
+                ),
+            ],
+        )
+        started = time.monotonic()
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            asyncio.run(stub_pipeline.arun(fail_fast=True))
+
+        assert time.monotonic() - started < 5
+        assert {
+            attempt.task_name: attempt.status
+            for attempt in stub_pipeline.runs[-1].attempts
+        } == {
+            "failing_task": runs.Status.FAILED,
+            "sleeping_task": runs.Status.CANCELLED,
+        }
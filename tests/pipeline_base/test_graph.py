@@ -1,6 +1,8 @@
 import dataclasses
 
-from pipelines._internal import graph
+import pytest
+
+from pipelines._internal import csr, graph
 
 
 @dataclasses.dataclass
@@ -27,3 +29,315 @@ class TestDAG:
 
     def test_node_map(self) -> None:
         assert self.dag.node_map == {task.name: task for task in self.nodes}  # type: ignore[reportPrivateUsage]
+
+
+class TestReachability:
+    # a -> b -> d, a -> c -> d, e
+    nodes: list[StubNode] = [
+        StubNode(name="a", depends_on=[]),
+        StubNode(name="b", depends_on=["a"]),
+        StubNode(name="c", depends_on=["a"]),
+        StubNode(name="d", depends_on=["b", "c"]),
+        StubNode(name="e", depends_on=[]),
+    ]
+    reachability: graph.Reachability = graph.DAG(nodes=nodes).reachability
+
+    def test_upstream_includes_every_ancestor(self) -> None:
+        bits: int = self.reachability.upstream(names=["d"])
+
+        assert sorted(self.reachability.names_of(bits=bits)) == ["a", "b", "c", "d"]
+
+    def test_downstream_includes_every_descendant(self) -> None:
+        bits: int = self.reachability.downstream(names=["b", "e"])
+
+        assert sorted(self.reachability.names_of(bits=bits)) == ["b", "d", "e"]
+
+    def test_names_are_in_topological_order(self) -> None:
+        names: list[str] = self.reachability.names_of(
+            bits=self.reachability.bits(names=["d", "b", "a"])
+        )
+
+        assert names == ["a", "b", "d"]
+
+
+class TestGenerations:
+    def test_levels(self) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(nodes=list(TestReachability.nodes))
+
+        assert [sorted(generation) for generation in dag.generations] == [
+            ["a", "e"],
+            ["b", "c"],
+            ["d"],
+        ]
+        assert dag.widths == [2, 2, 1]
+        assert dag.level_of("d") == 2
+
+    def test_level_follows_deepest_dependency(self) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=["a"]),
+                StubNode(name="c", depends_on=["a", "b"]),
+            ]
+        )
+
+        assert dag.generations == [["a"], ["b"], ["c"]]
+
+    def test_add_drops_cached_levels(self) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=[
+                StubNode(name=node.name, depends_on=list(node.depends_on))
+                for node in TestReachability.nodes
+            ]
+        )
+        assert dag.widths == [2, 2, 1]
+
+        dag.add(node=StubNode(name="f", depends_on=["e"]))
+        dag.add_dependency(name="e", dependency="d")
+
+        assert dag.widths == [1, 2, 1, 1, 1]
+        assert dag.level_of("f") == 4
+
+
+class TestCache:
+    @staticmethod
+    def get_dag() -> graph.DAG[StubNode]:
+        return graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=["a"]),
+            ]
+        )
+
+    @staticmethod
+    def assert_matches_rebuilt(dag: graph.DAG[StubNode]) -> None:
+        rebuilt: graph.DAG[StubNode] = graph.DAG(nodes=list(dag.nodes))
+        assert set(dag.graph.nodes) == set(rebuilt.graph.nodes)
+        assert set(dag.graph.edges) == set(rebuilt.graph.edges)
+        assert dag.node_map == rebuilt.node_map
+        assert dag.roots == rebuilt.roots
+
+    def test_reuses_graph_and_order(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+
+        assert dag.graph is dag.graph
+        assert dag.order is dag.order
+        assert dag.node_map is dag.node_map
+
+    def test_add_updates_cached_graph(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        cached = dag.graph
+        assert dag.leaves == ["b"]
+
+        dag.add(node=StubNode(name="c", depends_on=["b"]))
+
+        assert dag.graph is cached
+        assert dag.leaves == ["c"]
+        assert dag.order == ["a", "b", "c"]
+        assert dag["c"].depends_on == ["b"]
+        self.assert_matches_rebuilt(dag=dag)
+
+    def test_remove_keeps_nodes_still_depended_on(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        assert dag.order == ["a", "b"]
+
+        dag.remove(name="a")
+
+        assert "a" not in dag.node_map
+        assert "a" in dag.graph  # b still depends on it
+        self.assert_matches_rebuilt(dag=dag)
+
+        dag.remove(name="b")
+
+        assert dag.order == []
+        self.assert_matches_rebuilt(dag=dag)
+
+    def test_invalidate_rebuilds_after_direct_changes(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        assert dag.roots == ["a"]
+
+        dag["a"].depends_on.append("b")
+        dag["b"].depends_on.clear()
+        dag.invalidate()
+
+        assert dag.roots == ["b"]
+        assert dag.order == ["b", "a"]
+
+
+class TestIncrementalOrder:
+    @staticmethod
+    def get_dag() -> graph.DAG[StubNode]:
+        return graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=["a"]),
+                StubNode(name="c", depends_on=[]),
+                StubNode(name="d", depends_on=["c"]),
+            ]
+        )
+
+    @staticmethod
+    def assert_is_topological(dag: graph.DAG[StubNode]) -> None:
+        positions: dict[str, int] = {
+            name: position for position, name in enumerate(dag.order)
+        }
+        assert sorted(dag.order) == sorted(dag.graph.nodes)
+        for dependency, name in dag.graph.edges:
+            assert positions[dependency] < positions[name]
+
+    def test_reorders_only_the_affected_nodes(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        order: list[str] = dag.order
+        assert order == ["a", "c", "b", "d"]
+
+        dag.add_dependency(name="a", dependency="d")
+
+        assert dag.order is order
+        assert dag.order == ["c", "d", "a", "b"]
+        assert dag["a"].depends_on == ["d"]
+        self.assert_is_topological(dag=dag)
+
+    def test_add_keeps_order(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        order: list[str] = dag.order
+
+        dag.add(node=StubNode(name="e", depends_on=["d"]))
+        dag.add_dependency(name="a", dependency="e")
+
+        assert dag.order is order
+        assert dag.order == ["c", "d", "e", "a", "b"]
+        self.assert_is_topological(dag=dag)
+
+    def test_raises_with_cycle_path(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        dag.add_dependency(name="c", dependency="b")
+        order: list[str] = list(dag.order)
+
+        with pytest.raises(graph.CycleError) as error:
+            dag.add_dependency(name="a", dependency="d")
+
+        assert error.value.path == ["d", "a", "b", "c", "d"]
+        assert dag.order == order
+        assert dag["a"].depends_on == []
+        self.assert_is_topological(dag=dag)
+
+    def test_raises_on_self_dependency(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+
+        with pytest.raises(graph.CycleError):
+            dag.add_dependency(name="a", dependency="a")
+
+    def test_remove_dependency_keeps_order(self) -> None:
+        dag: graph.DAG[StubNode] = self.get_dag()
+        order: list[str] = dag.order
+
+        dag.remove_dependency(name="b", dependency="a")
+
+        assert dag.order is order
+        assert dag.roots == ["a", "b", "c"]
+        self.assert_is_topological(dag=dag)
+
+    def test_add_rejects_cycle_unchanged(self) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=[StubNode(name="b", depends_on=["a"])]
+        )
+        order: list[str] = list(dag.order)
+
+        with pytest.raises(graph.CycleError) as error:
+            dag.add(node=StubNode(name="a", depends_on=["b"]))
+
+        assert error.value.path == ["b", "a", "b"]
+        assert [node.name for node in dag.nodes] == ["b"]
+        assert dag.order == order
+
+    @pytest.mark.parametrize("cached", [False, True])
+    def test_remove_dangling_dependency(self, cached: bool) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=["x"]),
+                StubNode(name="b", depends_on=[]),
+            ]
+        )
+        if cached:
+            assert "x" in dag.order
+
+        dag.remove_dependency(name="a", dependency="x")
+
+        assert dag["a"].depends_on == []
+        assert sorted(dag.order) == ["a", "b"]
+        self.assert_is_topological(dag=dag)
+
+    def test_sort_raises_with_cycle_path(self) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=["b"]),
+                StubNode(name="b", depends_on=["a"]),
+            ]
+        )
+
+        with pytest.raises(graph.CycleError, match="Check for dependency cycles"):
+            dag.order
+
+
+class TestCSRGraph:
+    # a -> b -> d, a -> c -> d, with x a dependency outside of the nodes
+    nodes: list[StubNode] = [
+        StubNode(name="a", depends_on=[]),
+        StubNode(name="b", depends_on=["a"]),
+        StubNode(name="c", depends_on=["a", "x"]),
+        StubNode(name="d", depends_on=["b", "c", "b"]),
+    ]
+    csr_graph: csr.CSRGraph = csr.CSRGraph.of(nodes=nodes)
+
+    def test_degrees(self) -> None:
+        assert self.csr_graph.out_degree(name="a") == 2
+        assert (
+            self.csr_graph.in_degree(name="d") == 2
+        )  # repeated dependencies count once
+        assert list(self.csr_graph.predecessors(name="c")) == ["a", "x"]
+        assert list(self.csr_graph.successors(name="x")) == ["c"]
+
+    def test_roots_and_leaves(self) -> None:
+        assert self.csr_graph.roots == ["a", "x"]
+        assert self.csr_graph.leaves == ["d"]
+
+    def test_generations(self) -> None:
+        assert self.csr_graph.generations() == [["a", "x"], ["b", "c"], ["d"]]
+        assert self.csr_graph.topological_order() == ["a", "x", "b", "c", "d"]
+
+    def test_raises_on_cycle(self) -> None:
+        cyclic: csr.CSRGraph = csr.CSRGraph.of(
+            nodes=[
+                StubNode(name="a", depends_on=["b"]),
+                StubNode(name="b", depends_on=["a"]),
+                StubNode(name="c", depends_on=[]),
+            ]
+        )
+
+        with pytest.raises(ValueError, match=r"Could not sort: \['a', 'b'\]"):
+            cyclic.topological_order()
+
+
+class TestBackends:
+    @pytest.mark.parametrize("backend", list(graph.Backends))
+    def test_backends_agree(self, backend: graph.Backends) -> None:
+        dag: graph.DAG[StubNode] = graph.DAG(
+            nodes=list(TestReachability.nodes), backend=backend
+        )
+
+        assert dag.roots == ["a", "e"]
+        assert sorted(dag.leaves) == ["d", "e"]
+        order: list[str] = [node.name for node in dag]
+        assert order.index("a") < order.index("b") < order.index("d")
+        assert sorted(dag.reachability.names_of(dag.reachability.upstream(["d"]))) == [
+            "a",
+            "b",
+            "c",
+            "d",
+        ]
+        assert dag.widths == [2, 2, 1]
+
+    def test_reads_default_backend_from_environment(self, monkeypatch) -> None:
+        monkeypatch.setenv("PIPELINES_GRAPH_BACKEND", "csr")
+
+        assert graph.DAG(nodes=[]).backend is graph.Backends.CSR
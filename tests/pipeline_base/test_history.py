@@ -0,0 +1,168 @@
+import pathlib
+
+import pytest
+
+from pipelines import history, pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def record_attempts(
+    run_history: history.History,
+    durations: list[float],
+    status: runs.Status = runs.Status.SUCCEEDED,
+) -> None:
+    "Records one run per duration, each with a single attempt of stub_task."
+    for duration in durations:
+        record = runs.RunRecord(pipeline_name=run_history.pipeline_name)
+        record.add(
+            runs.TaskAttempt(
+                task_name="stub_task",
+                attempt=1,
+                status=status,
+                queued_at=record.started_at,
+                started_at=record.started_at,
+                finished_at=record.started_at + duration,
+            )
+        )
+        record.finish(status=status)
+        run_history.record(record=record)
+
+
+@pytest.fixture
+def run_history(tmp_path: pathlib.Path) -> history.History:
+    return history.History(
+        path=tmp_path / "history.sqlite", pipeline_name="stub_pipeline"
+    )
+
+
+class TestHistory:
+    def test_typical_duration_is_median(self, run_history: history.History) -> None:
+        record_attempts(run_history=run_history, durations=[1.0, 5.0, 2.0])
+
+        assert run_history.typical_durations() == pytest.approx({"stub_task": 2.0})
+
+    def test_keeps_most_recent_samples(self, tmp_path: pathlib.Path) -> None:
+        run_history = history.History(
+            path=tmp_path / "history.sqlite",
+            pipeline_name="stub_pipeline",
+            max_samples=2,
+        )
+
+        record_attempts(run_history=run_history, durations=[1.0, 2.0, 3.0])
+
+        assert run_history.durations() == pytest.approx({"stub_task": [2.0, 3.0]})
+
+    def test_keys_durations_by_pipeline(self, run_history: history.History) -> None:
+        other_history = history.History(
+            path=run_history.path, pipeline_name="other_pipeline"
+        )
+
+        record_attempts(run_history=other_history, durations=[1.0])
+
+        assert run_history.durations() == {}
+
+    def test_run_records_durations(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+
+        stub_pipeline.run()
+
+        assert stub_pipeline.history.typical_durations().keys() == {"stub_task"}
+
+    def test_keeps_most_recent_runs(self, tmp_path: pathlib.Path) -> None:
+        run_history = history.History(
+            path=tmp_path / "history.sqlite",
+            pipeline_name="stub_pipeline",
+            max_runs=2,
+        )
+        other_history = history.History(
+            path=run_history.path, pipeline_name="other_pipeline", max_runs=2
+        )
+
+        record_attempts(run_history=other_history, durations=[1.0])
+        record_attempts(run_history=run_history, durations=[1.0, 2.0, 3.0])
+
+        assert run_history.durations() == pytest.approx({"stub_task": [2.0, 3.0]})
+        assert other_history.durations() == pytest.approx({"stub_task": [1.0]})
+
+    def test_failing_to_save_does_not_fail_run(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+        monkeypatch.setattr(history.History, "record", pipelines_helpers.lock_database)
+
+        stub_pipeline.run()
+
+        assert stub_pipeline.runs[-1].status is runs.Status.SUCCEEDED
+        assert "Cannot save run" in caplog.text
+
+    def test_failing_to_save_keeps_task_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="stub_task", action=pipelines_helpers.failing_action, retries=0
+                )
+            ],
+        )
+        monkeypatch.setattr(history.History, "record", pipelines_helpers.lock_database)
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run()
+
+
+class TestTaskStatistics:
+    def test_summarises_durations_and_failures(
+        self, run_history: history.History
+    ) -> None:
+        record_attempts(run_history=run_history, durations=[1.0, 2.0, 3.0, 4.0, 5.0])
+        record_attempts(
+            run_history=run_history, durations=[0.5], status=runs.Status.FAILED
+        )
+
+        statistics = run_history.task_statistics()["stub_task"]
+
+        assert statistics.samples == 5
+        assert statistics.p50_seconds == pytest.approx(3.0)
+        assert statistics.p95_seconds == pytest.approx(4.8)
+        assert statistics.failure_rate == pytest.approx(1 / 6)
+        assert statistics.trend_seconds_per_run == pytest.approx(1.0)
+
+    def test_ignores_skipped_attempts(self, run_history: history.History) -> None:
+        record_attempts(run_history=run_history, durations=[1.0])
+        record_attempts(
+            run_history=run_history, durations=[0.0], status=runs.Status.SKIPPED
+        )
+
+        statistics = run_history.task_statistics()["stub_task"]
+
+        assert statistics.failure_rate == 0.0
+        assert statistics.trend_seconds_per_run is None
+
+
+class TestOutliers:
+    def test_flags_unusual_latest_duration(self, run_history: history.History) -> None:
+        record_attempts(
+            run_history=run_history, durations=[10.0, 11.0, 9.0, 10.5, 9.5, 30.0]
+        )
+
+        [outlier] = run_history.outliers()
+
+        assert outlier.task_name == "stub_task"
+        assert outlier.seconds == pytest.approx(30.0)
+        assert outlier.typical_seconds == pytest.approx(10.0)
+        assert outlier.score > history.OUTLIER_THRESHOLD
+
+    def test_ignores_usual_latest_duration(self, run_history: history.History) -> None:
+        record_attempts(
+            run_history=run_history, durations=[10.0, 11.0, 9.0, 10.5, 9.5, 10.2]
+        )
+
+        assert run_history.outliers() == []
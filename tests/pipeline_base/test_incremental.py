@@ -0,0 +1,113 @@
+import pathlib
+
+import pytest
+
+from pipelines import cache, pipeline, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_calls(path: pathlib.Path) -> int:
+    return len(path.read_text().splitlines()) if path.exists() else 0
+
+
+@pytest.fixture
+def chained_pipeline(tmp_path: pathlib.Path) -> pipeline.Pipeline:
+    stub_pipeline = pipeline.Pipeline(
+        name="stub_pipeline",
+        tasks=[
+            task.Task(
+                name=name,
+                action=pipelines_helpers.record_call,
+                parameters={"path": tmp_path / f"{name}.txt"},
+                depends_on=depends_on,
+            )
+            for name, depends_on in [
+                ("extract", []),
+                ("transform", ["extract"]),
+                ("load", ["transform"]),
+            ]
+        ],
+    )
+    stub_pipeline.manifest = cache.Manifest(path=tmp_path / "manifest.json")
+    return stub_pipeline
+
+
+class TestIncremental:
+    def test_skips_unchanged_tasks(
+        self, chained_pipeline: pipeline.Pipeline, tmp_path: pathlib.Path
+    ) -> None:
+        chained_pipeline.run(incremental=True)
+        chained_pipeline.run(incremental=True)
+
+        for name in ["extract", "transform", "load"]:
+            assert get_calls(path=tmp_path / f"{name}.txt") == 1
+
+    def test_reruns_changed_task_and_descendants(
+        self, chained_pipeline: pipeline.Pipeline, tmp_path: pathlib.Path
+    ) -> None:
+        chained_pipeline.run(incremental=True)
+
+        chained_pipeline["transform"].parameters["value"] = 1
+        chained_pipeline.run(incremental=True)
+
+        assert get_calls(path=tmp_path / "extract.txt") == 1
+        assert get_calls(path=tmp_path / "transform.txt") == 2
+        assert get_calls(path=tmp_path / "load.txt") == 2
+
+    def test_reruns_task_with_changed_dependencies(
+        self, chained_pipeline: pipeline.Pipeline, tmp_path: pathlib.Path
+    ) -> None:
+        chained_pipeline.run(incremental=True)
+
+        chained_pipeline["load"].depends_on.append("extract")
+        chained_pipeline.run(incremental=True)
+
+        assert get_calls(path=tmp_path / "transform.txt") == 1
+        assert get_calls(path=tmp_path / "load.txt") == 2
+
+    def test_reruns_descendants_of_streamed_tasks(self, tmp_path: pathlib.Path) -> None:
+        progress: dict[str, int] = {"produced": 0, "consumed": 0, "lag": 0}
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(
+            name="extract",
+            action=pipelines_helpers.produce_batches,
+            parameters={"count": 3, "progress": progress},
+        )
+        stub_pipeline.add_task(
+            name="load",
+            action=pipelines_helpers.consume_batches,
+            parameters={"progress": progress},
+            streams_from="extract",
+        )
+        stub_pipeline.add_task(
+            name="report",
+            action=pipelines_helpers.record_call,
+            parameters={"path": tmp_path / "report.txt"},
+            after="load",
+        )
+        stub_pipeline.manifest = cache.Manifest(path=tmp_path / "manifest.json")
+        stub_pipeline.run(incremental=True)
+
+        stub_pipeline["extract"].parameters["count"] = 4
+        stub_pipeline.run(incremental=True)
+
+        assert get_calls(path=tmp_path / "report.txt") == 2
+
+    def test_does_not_record_failed_task(self, tmp_path: pathlib.Path) -> None:
+        attempts: dict[str, int] = {"count": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="flaky_task",
+                    action=pipelines_helpers.flaky_action,
+                    parameters={"attempts": attempts, "failures": 1},
+                    retries=0,
+                )
+            ],
+        )
+        stub_pipeline.manifest = cache.Manifest(path=tmp_path / "manifest.json")
+        with pytest.raises(RuntimeError):
+            stub_pipeline.run(incremental=True)
+
+        assert "flaky_task" not in stub_pipeline.manifest.load()
@@ -0,0 +1,217 @@
+import asyncio
+import functools
+import pathlib
+import threading
+
+import pytest
+
+from pipelines import cache, mapping, pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_mapped_task(**kwargs) -> task.Task:
+    return task.Task(
+        name="mapped_task",
+        action=pipelines_helpers.multiply,
+        parameters={"factor": 10},
+        map_over={"value": [1, 2, 3]},
+        **kwargs,
+    )
+
+
+class TestExpand:
+    def test_expands_instances_and_reduce_step(self) -> None:
+        upstream_task = task.Task(
+            name="upstream_task", action=pipelines_helpers.stub_action
+        )
+        mapped_task: task.Task = get_mapped_task(
+            depends_on=["upstream_task"], pool="warehouse"
+        )
+
+        expanded: list[task.Task] = mapping.expand(nodes=[upstream_task, mapped_task])
+
+        assert [node.name for node in expanded] == [
+            "upstream_task",
+            "mapped_task[0]",
+            "mapped_task[1]",
+            "mapped_task[2]",
+            "mapped_task",
+        ]
+        assert expanded[2].parameters == {"factor": 10, "value": 2}
+        assert expanded[2].depends_on == ["upstream_task"]
+        assert expanded[2].pool == "warehouse"
+        assert expanded[-1].depends_on == [
+            "mapped_task[0]",
+            "mapped_task[1]",
+            "mapped_task[2]",
+        ]
+        assert expanded[-1].action is mapping.collect
+
+    def test_maps_over_every_combination(self) -> None:
+        assert mapping.combinations(
+            map_over={"region": ["us", "eu"], "day": [1, 2]}
+        ) == [
+            {"region": "us", "day": 1},
+            {"region": "us", "day": 2},
+            {"region": "eu", "day": 1},
+            {"region": "eu", "day": 2},
+        ]
+
+
+class TestValidate:
+    @pytest.mark.parametrize(
+        "kwargs, match",
+        [
+            ({"action": None, "map_over": {"value": [1]}}, "has no action"),
+            ({"map_over": {}}, "over no parameters"),
+            ({"map_over": {"value": (1, 2)}}, "not a list"),
+            ({"reduce": pipelines_helpers.total}, "does not map over any parameters"),
+        ],
+    )
+    def test_rejects_invalid_mapping(self, kwargs, match: str) -> None:
+        invalid_task = task.Task(
+            **({"name": "stub_task", "action": pipelines_helpers.multiply} | kwargs)
+        )
+
+        with pytest.raises(ValueError, match=match):
+            mapping.validate(nodes=[invalid_task])
+
+    def test_add_task_rejects_streaming_mapped_task(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(
+            name="producer",
+            action=pipelines_helpers.produce_batches,
+            parameters={"count": 3, "progress": {"produced": 0}},
+        )
+
+        with pytest.raises(ValueError, match="Cannot map: consumer"):
+            stub_pipeline.add_task(
+                name="consumer",
+                action=pipelines_helpers.double_batches,
+                streams_from="producer",
+                map_over={"factor": [1, 2]},
+            )
+
+    def test_add_task_accepts_reduce_next_to_action(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+
+        stub_pipeline.add_task(
+            name="mapped_task",
+            action=pipelines_helpers.multiply,
+            map_over={"value": [1, 2]},
+            reduce=pipelines_helpers.total,
+        )
+
+        assert stub_pipeline["mapped_task"].reduce is pipelines_helpers.total
+
+    @pytest.mark.parametrize(
+        "reduce",
+        [sum, lambda results: results, mapping.collect, functools.partial(sum)],
+    )
+    def test_add_task_rejects_reduce_that_cannot_be_saved(self, reduce) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+
+        with pytest.raises(ValueError, match="as the reduce step of task: mapped"):
+            stub_pipeline.add_task(
+                name="mapped_task",
+                action=pipelines_helpers.multiply,
+                map_over={"value": [1, 2]},
+                reduce=reduce,
+            )
+        assert not stub_pipeline.tasks
+
+
+class TestRun:
+    def test_runs_instances_concurrently(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="mapped_task",
+                    action=pipelines_helpers.wait_for_barrier_on_day,
+                    parameters={"barrier": threading.Barrier(parties=3)},
+                    map_over={"run_day": ["2024-01-01", "2024-01-02", "2024-01-03"]},
+                )
+            ],
+        )
+
+        results = stub_pipeline.run(executor="threads", max_workers=3)
+
+        assert results["mapped_task"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert results["mapped_task[1]"] == "2024-01-02"
+
+    def test_incremental_reruns_instances_for_changed_reduce_step(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[get_mapped_task(reduce=pipelines_helpers.total)],
+        )
+        stub_pipeline.manifest = cache.Manifest(path=tmp_path / "manifest.json")
+        stub_pipeline.run(incremental=True)
+
+        stub_pipeline["mapped_task"].map_over["value"].append(4)
+        results = stub_pipeline.run(incremental=True)
+
+        assert results["mapped_task"] == 100
+
+    def test_incremental_skips_unchanged_mapped_task(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[get_mapped_task(reduce=pipelines_helpers.total)],
+        )
+        stub_pipeline.manifest = cache.Manifest(path=tmp_path / "manifest.json")
+        stub_pipeline.run(incremental=True)
+
+        results = stub_pipeline.run(incremental=True)
+
+        assert results == {}
+        assert {attempt.status for attempt in stub_pipeline.runs[-1].attempts} == {
+            runs.Status.SKIPPED
+        }
+
+    @pytest.mark.parametrize("executor", ["serial", "processes"])
+    def test_reduces_instance_results(self, executor: str) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                get_mapped_task(reduce=pipelines_helpers.total),
+                task.Task(
+                    name="downstream_task",
+                    action=pipelines_helpers.stub_action,
+                    depends_on=["mapped_task"],
+                ),
+            ],
+        )
+
+        results = stub_pipeline.run(executor=executor)
+
+        assert results["mapped_task"] == 60
+        assert [node.name for node in stub_pipeline.log][-2:] == [
+            "mapped_task",
+            "downstream_task",
+        ]
+
+    def test_async_reduces_instance_results(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[get_mapped_task(reduce=pipelines_helpers.total)],
+        )
+
+        results = asyncio.run(stub_pipeline.arun())
+
+        assert results["mapped_task"] == 60
+
+    def test_plans_every_instance(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[get_mapped_task()]
+        )
+
+        plan = stub_pipeline.plan(max_workers=4)
+
+        assert plan.waves == [
+            ["mapped_task[0]", "mapped_task[1]", "mapped_task[2]"],
+            ["mapped_task"],
+        ]
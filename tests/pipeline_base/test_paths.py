@@ -0,0 +1,46 @@
+import pathlib
+
+import pytest
+
+from pipelines import paths, pipeline, task
+from tests.pipeline_base import pipelines_helpers
+
+PACKAGE_PARENT: pathlib.Path = pathlib.Path(paths.__file__).parent.parent
+
+
+@pytest.fixture
+def without_project_root(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    monkeypatch.delenv("PROJECT_ROOT")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    return tmp_path
+
+
+class TestGetPath:
+    def test_writes_under_project_root(self, project_root: pathlib.Path) -> None:
+        assert paths.get_path("runs") == project_root / ".pipelines" / "runs"
+        assert paths.get_path("cache") == project_root / ".pipelines" / "cache"
+
+    def test_writes_to_user_directories_without_project_root(
+        self, without_project_root: pathlib.Path
+    ) -> None:
+        assert paths.get_path("runs") == (
+            without_project_root / "state" / "pipelines" / "runs"
+        )
+        assert paths.get_path("cache") == without_project_root / "cache" / "pipelines"
+
+    def test_run_does_not_write_next_to_package(
+        self, without_project_root: pathlib.Path
+    ) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+        existed: bool = (PACKAGE_PARENT / ".pipelines").exists()
+
+        stub_pipeline.run(use_cache=True)
+
+        assert (PACKAGE_PARENT / ".pipelines").exists() == existed
+        assert (without_project_root / "state" / "pipelines" / "runs").exists()
@@ -1,3 +1,4 @@
+import subprocess
 from datetime import timedelta
 
 import pytest
@@ -58,6 +59,77 @@ class TestPipeline:
 
         assert stub_pipeline.tasks == expected_tasks
 
+    def test_add_task_keeps_topological_order(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(name="load", action=pipelines_helpers.stub_action)
+        stub_pipeline.add_task(
+            name="report", action=pipelines_helpers.stub_action, after="load"
+        )
+        order: list[str] = stub_pipeline.dag.order
+
+        stub_pipeline.add_task(
+            name="extract", action=pipelines_helpers.stub_action, before="load"
+        )
+
+        assert stub_pipeline.dag.order is order
+        assert [node.name for node in stub_pipeline.dag] == [
+            "extract",
+            "load",
+            "report",
+        ]
+
+    def test_add_task_rejects_cycle(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(name="load", action=pipelines_helpers.stub_action)
+        stub_pipeline.add_task(
+            name="report", action=pipelines_helpers.stub_action, after="load"
+        )
+
+        with pytest.raises(ValueError, match="check -> load -> report -> check"):
+            stub_pipeline.add_task(
+                name="check",
+                action=pipelines_helpers.stub_action,
+                after="report",
+                before="load",
+            )
+
+        assert stub_pipeline.task_dict.keys() == {"load", "report"}
+        assert stub_pipeline["load"].depends_on == []
+        assert [node.name for node in stub_pipeline.dag] == ["load", "report"]
+
+    @pytest.mark.parametrize("ordered", [False, True])
+    def test_add_task_rejects_cycle_through_removed_task(self, ordered: bool) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(name="load", action=pipelines_helpers.stub_action)
+        stub_pipeline.add_task(
+            name="report", action=pipelines_helpers.stub_action, after="load"
+        )
+        if ordered:
+            list(stub_pipeline.dag)
+        stub_pipeline.remove_task(name="load")
+
+        with pytest.raises(ValueError, match="report -> load -> report"):
+            stub_pipeline.add_task(
+                name="load", action=pipelines_helpers.stub_action, after="report"
+            )
+
+        assert stub_pipeline.task_dict.keys() == {"report"}
+
+    def test_add_task_after_appending_to_tasks(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(name="load", action=pipelines_helpers.stub_action)
+        assert stub_pipeline.dag["load"].depends_on == []
+        stub_pipeline.tasks.append(
+            task.Task(name="report", action=pipelines_helpers.stub_action)
+        )
+
+        stub_pipeline.add_task(
+            name="check", action=pipelines_helpers.stub_action, before="report"
+        )
+
+        assert stub_pipeline["report"].depends_on == ["check"]
+        assert [node.name for node in stub_pipeline.dag][-1] == "report"
+
     def test_remove_task(self):
         stub_task_name = "stub_task"
         stub_pipeline = pipeline.Pipeline(
@@ -184,3 +256,58 @@ class TestPipeline:
             actual_output = capfd.readouterr().out.strip()
 
             assert actual_output == "test"
+
+        def test_raises_if_task_without_action_fails(self, tmp_path):
+            stub_script = tmp_path / "stub_script.py"
+            stub_script.write_text("raise SystemExit(3)")
+
+            stub_task = task.Task(name="stub_task", src=stub_script, retries=0)
+            stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[stub_task])
+
+            with pytest.raises(subprocess.CalledProcessError) as error:
+                stub_pipeline.run()
+
+            assert error.value.returncode == 3
+
+    class TestWarmInterpreters:
+        def test_streams_output(self, tmp_path, capfd):
+            stub_script = tmp_path / "stub_script.py"
+            stub_script.write_text(
+                "import sys\n"
+                "if __name__ == '__main__':\n"
+                "    print('test')\n"
+                "    print('error', file=sys.stderr)\n"
+            )
+
+            stub_task = task.Task(name="stub_task", src=stub_script)
+            stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[stub_task])
+
+            stub_pipeline.run(preload=[])
+
+            output = capfd.readouterr()
+            assert output.out.strip() == "test"
+            assert output.err.strip() == "error"
+
+        def test_preloads_modules(self, tmp_path, capfd):
+            stub_script = tmp_path / "stub_script.py"
+            stub_script.write_text("import sys\nprint('colorsys' in sys.modules)")
+
+            stub_task = task.Task(name="stub_task", src=stub_script)
+            stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[stub_task])
+
+            stub_pipeline.run(preload=["colorsys"])
+
+            assert capfd.readouterr().out.strip() == "True"
+
+        def test_propagates_exit_code(self, tmp_path):
+            stub_script = tmp_path / "stub_script.py"
+            stub_script.write_text("raise SystemExit(3)")
+
+            stub_task = task.Task(name="stub_task", src=stub_script, retries=0)
+            stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=[stub_task])
+
+            with pytest.raises(subprocess.CalledProcessError) as error:
+                stub_pipeline.run(executor="threads", preload=[])
+
+            assert error.value.returncode == 3
+            assert stub_pipeline.log == []
@@ -0,0 +1,129 @@
+import pytest
+
+from pipelines import pipeline, plans, task
+from pipelines._internal import graph
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_stub_dag() -> graph.DAG[task.Task]:
+    "a -> c, b -> c, with d independent."
+    return graph.DAG(
+        nodes=[
+            task.Task(name="a", action=pipelines_helpers.failing_action),
+            task.Task(name="b", action=pipelines_helpers.failing_action),
+            task.Task(
+                name="c", action=pipelines_helpers.failing_action, depends_on=["a", "b"]
+            ),
+            task.Task(name="d", action=pipelines_helpers.failing_action),
+        ]
+    )
+
+
+class TestSimulate:
+    def test_runs_ready_tasks_together(self) -> None:
+        plan = plans.simulate(
+            pipeline_name="stub_pipeline",
+            dag=get_stub_dag(),
+            workers=4,
+            durations={"a": 2.0, "b": 1.0, "c": 3.0, "d": 4.0},
+        )
+
+        assert plan.waves == [["a", "b", "d"], ["c"]]
+        assert plan.makespan == 5.0
+        assert plan.critical_path == ["a", "c"]
+        assert plan.critical_path_seconds == 5.0
+        assert plan.widths == [3, 1]
+        assert plan.parallelism == 3
+
+    def test_waits_for_free_workers(self) -> None:
+        plan = plans.simulate(
+            pipeline_name="stub_pipeline",
+            dag=get_stub_dag(),
+            workers=1,
+            durations={"a": 2.0, "b": 1.0, "c": 3.0, "d": 4.0},
+        )
+
+        assert plan.waves == [["a"], ["b"], ["d"], ["c"]]
+        assert plan.makespan == 10.0
+
+    def test_more_workers_than_widest_level_can_help(self) -> None:
+        "a runs alongside b, then alongside c and d, which both depend on b."
+        dag: graph.DAG[task.Task] = get_stub_dag()
+        dag.nodes[2].depends_on = ["b"]
+        dag.nodes[3].depends_on = ["b"]
+        durations: dict[str, float] = {"a": 10.0, "b": 1.0, "c": 5.0, "d": 5.0}
+
+        makespans: list[float] = [
+            plans.simulate(
+                pipeline_name="stub_pipeline",
+                dag=graph.DAG(nodes=dag.nodes),
+                workers=workers,
+                durations=durations,
+            ).makespan
+            for workers in [2, 3]
+        ]
+
+        assert graph.DAG(nodes=dag.nodes).widths == [2, 2]
+        assert makespans == [11.0, 10.0]
+
+    def test_waits_for_pool_slots(self) -> None:
+        dag: graph.DAG[task.Task] = get_stub_dag()
+        for node in dag.nodes:
+            node.pool = "warehouse" if node.name in ["a", "d"] else None
+
+        plan = plans.simulate(
+            pipeline_name="stub_pipeline",
+            dag=dag,
+            workers=4,
+            durations={"a": 2.0, "b": 1.0, "c": 3.0, "d": 4.0},
+            pool_sizes={"warehouse": 1},
+        )
+
+        assert plan.waves == [["a", "b"], ["d", "c"]]
+        assert plan.makespan == 6.0
+
+    def test_estimates_tasks_without_history(self) -> None:
+        plan = plans.simulate(
+            pipeline_name="stub_pipeline",
+            dag=get_stub_dag(),
+            workers=4,
+            durations={"a": 2.0, "b": 4.0},
+        )
+
+        assert {planned.task_name: planned.seconds for planned in plan.tasks} == {
+            "a": 2.0,
+            "b": 4.0,
+            "c": 3.0,
+            "d": 3.0,
+        }
+        assert [planned.task_name for planned in plan.tasks if planned.estimated] == [
+            "d",
+            "c",
+        ]
+
+    def test_raises_on_cycle(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                task.Task(name="a", depends_on=["b"]),
+                task.Task(name="b", depends_on=["a"]),
+            ]
+        )
+
+        with pytest.raises(ValueError, match="dependency cycles"):
+            plans.simulate(
+                pipeline_name="stub_pipeline", dag=dag, workers=1, durations={}
+            )
+
+
+class TestPlan:
+    def test_does_not_run_tasks(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=list(get_stub_dag().nodes)
+        )
+
+        plan = stub_pipeline.plan(max_workers=2)
+
+        assert plan.workers == 2
+        assert plan.makespan == 2.0
+        assert stub_pipeline.log == []
+        assert "Critical path, 2.0s: a -> c" in str(plan)
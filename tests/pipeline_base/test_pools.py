@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+import pytest
+
+from pipelines import executors, pipeline, pools, task
+from pipelines._internal import graph
+from tests.pipeline_base import pipelines_helpers
+
+
+class TestValidate:
+    def test_raises_for_pool_without_slots(self) -> None:
+        with pytest.raises(ValueError, match="Invalid size: 0 of pool: warehouse"):
+            pools.validate(nodes=[], sizes={"warehouse": 0})
+
+    def test_warns_about_pool_without_size(self, caplog) -> None:
+        stub_task = task.Task(
+            name="stub_task", action=pipelines_helpers.stub_action, pool="warehouse"
+        )
+
+        pools.validate(nodes=[stub_task], sizes={})
+
+        assert "Pool: warehouse has no size" in caplog.text
+
+
+class TestHasSlots:
+    def test_counts_running_tasks_of_the_pool(self) -> None:
+        running: list[task.Task] = [
+            task.Task(name="a", action=pipelines_helpers.stub_action, pool="warehouse"),
+            task.Task(name="b", action=pipelines_helpers.stub_action),
+        ]
+        candidate = task.Task(
+            name="c", action=pipelines_helpers.stub_action, pool="warehouse"
+        )
+
+        assert pools.has_slots(
+            candidates=[candidate], running=running, sizes={"warehouse": 2}
+        )
+        assert not pools.has_slots(
+            candidates=[candidate], running=running, sizes={"warehouse": 1}
+        )
+
+    def test_empty_pool_has_room_for_larger_group(self) -> None:
+        candidates: list[task.Task] = [
+            task.Task(
+                name=f"stub_task_{i}",
+                action=pipelines_helpers.stub_action,
+                pool="warehouse",
+            )
+            for i in range(3)
+        ]
+
+        assert pools.has_slots(
+            candidates=candidates, running=[], sizes={"warehouse": 1}
+        )
+
+
+class TestPools:
+    @staticmethod
+    def _get_tasks(action, parameters) -> list[task.Task]:
+        "Four tasks in the warehouse pool and two outside of any pool."
+        return [
+            task.Task(
+                name=f"stub_task_{i}",
+                action=action,
+                parameters=parameters,
+                pool="warehouse" if i < 4 else None,
+            )
+            for i in range(6)
+        ]
+
+    @pytest.mark.parametrize("size", [1, 2])
+    def test_limits_running_tasks_of_a_pool(self, size: int) -> None:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        pool_counter: dict[str, int] = {"running": 0, "peak": 0}
+        lock = threading.Lock()
+        tasks: list[task.Task] = self._get_tasks(
+            action=pipelines_helpers.track_concurrency,
+            parameters={"counter": pool_counter, "lock": lock},
+        )
+        for node in tasks[4:]:
+            node.parameters = {"counter": counter, "lock": lock}
+
+        executors.LocalExecutor(
+            executor=executors.Executors.THREADS,
+            max_workers=6,
+            pools={"warehouse": size},
+        ).run(dag=graph.DAG(nodes=tasks), run_time_parameters={}, on_complete=print)
+
+        assert pool_counter["peak"] == size
+        assert counter["peak"] == 2
+
+    def test_async_limits_running_tasks_of_a_pool(self) -> None:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=self._get_tasks(
+                action=pipelines_helpers.async_track_concurrency,
+                parameters={"counter": counter},
+            )[:4],
+        )
+
+        asyncio.run(stub_pipeline.arun(pools={"warehouse": 2}))
+
+        assert counter["peak"] == 2
+        assert len(stub_pipeline.log) == 4
+
+    def test_run_rejects_pool_without_slots(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(
+            name="stub_task", action=pipelines_helpers.stub_action, pool="warehouse"
+        )
+
+        with pytest.raises(ValueError, match="Pools need at least one slot"):
+            stub_pipeline.run(pools={"warehouse": 0})
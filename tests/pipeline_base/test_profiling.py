@@ -0,0 +1,89 @@
+import pstats
+import threading
+
+import pytest
+
+from pipelines import paths, pipeline, profiling, task
+from tests.pipeline_base import pipelines_helpers
+
+
+@pytest.fixture
+def stub_pipeline() -> pipeline.Pipeline:
+    return pipeline.Pipeline(
+        name="stub_pipeline",
+        tasks=[
+            task.Task(name="stub_task", action=pipelines_helpers.stub_action),
+            task.Task(name="other_task", action=pipelines_helpers.stub_action),
+        ],
+    )
+
+
+def get_run_directory(stub_pipeline: pipeline.Pipeline):
+    return paths.get_path("runs") / stub_pipeline.name / stub_pipeline.runs[-1].run_id
+
+
+class TestProfile:
+    def test_writes_reports_for_chosen_tasks(
+        self, stub_pipeline: pipeline.Pipeline
+    ) -> None:
+        stub_pipeline.run(profile=["stub_task"])
+
+        run_directory = get_run_directory(stub_pipeline=stub_pipeline)
+        assert sorted(path.name for path in run_directory.iterdir()) == [
+            "stub_task.allocations.txt",
+            "stub_task.pstats",
+        ]
+        assert "stub_action" in str(
+            pstats.Stats(str(run_directory / "stub_task.pstats")).stats
+        )
+
+    def test_profiles_in_worker_processes(
+        self, stub_pipeline: pipeline.Pipeline
+    ) -> None:
+        stub_pipeline.run(executor="processes", profile=True, profilers=["cpu"])
+
+        run_directory = get_run_directory(stub_pipeline=stub_pipeline)
+        assert sorted(path.name for path in run_directory.iterdir()) == [
+            "other_task.pstats",
+            "stub_task.pstats",
+        ]
+
+    def test_profiles_concurrent_threads(self) -> None:
+        barrier = threading.Barrier(parties=2)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name=name,
+                    action=pipelines_helpers.wait_for_barrier_on_day,
+                    parameters={"run_day": name, "barrier": barrier},
+                )
+                for name in ["stub_task", "other_task"]
+            ],
+        )
+
+        results = stub_pipeline.run(executor="threads", profile=True)
+
+        run_directory = get_run_directory(stub_pipeline=stub_pipeline)
+        reports: list[str] = sorted(path.name for path in run_directory.iterdir())
+        assert results == {"stub_task": "stub_task", "other_task": "other_task"}
+        assert len(stub_pipeline.runs[-1].attempts) == 2
+        assert {
+            "other_task.allocations.txt",
+            "stub_task.allocations.txt",
+        } <= set(reports)
+        assert len([report for report in reports if report.endswith(".pstats")]) == 1
+
+    def test_disabled_by_default(self, stub_pipeline: pipeline.Pipeline) -> None:
+        stub_pipeline.run()
+
+        assert not get_run_directory(stub_pipeline=stub_pipeline).exists()
+
+    def test_leaves_unchosen_actions_unwrapped(self, tmp_path) -> None:
+        profile = profiling.Profile(directory=tmp_path, task_names=["stub_task"])
+
+        action = profile.wrap(
+            task_name="other_task", action=pipelines_helpers.stub_action
+        )
+
+        assert action is pipelines_helpers.stub_action
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from pipelines import executors, pipeline, resources, task
+from pipelines._internal import graph
+from tests.pipeline_base import pipelines_helpers
+
+
+class TestParseMemory:
+    @pytest.mark.parametrize(
+        "quantity, expected",
+        [
+            ("512", 512),
+            ("200M", 200 * 10**6),
+            ("512Mi", 512 * 2**20),
+            ("1.5Gi", 3 * 2**29),
+            (None, 0),
+        ],
+    )
+    def test_parses_kubernetes_quantities(
+        self, quantity: str | None, expected: int
+    ) -> None:
+        assert resources.parse_memory(quantity=quantity) == expected
+
+    def test_raises_for_unknown_unit(self) -> None:
+        with pytest.raises(ValueError, match="Invalid memory quantity: 1 gallon"):
+            resources.parse_memory(quantity="1 gallon")
+
+    def test_add_task_rejects_invalid_memory(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+
+        with pytest.raises(ValueError, match="Invalid memory quantity"):
+            stub_pipeline.add_task(
+                name="stub_task", action=pipelines_helpers.stub_action, memory="lots"
+            )
+
+
+class TestMachineCapacity:
+    def test_reads_available_memory(self, tmp_path, monkeypatch) -> None:
+        meminfo = tmp_path / "meminfo"
+        meminfo.write_text("MemTotal:  2048 kB\nMemAvailable:  1024 kB\n")
+        monkeypatch.setattr(resources, "MEMINFO", meminfo)
+
+        assert resources.machine_capacity().memory == 2**20
+
+    def test_memory_is_unbounded_without_meminfo(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(resources, "MEMINFO", tmp_path / "missing")
+
+        assert resources.machine_capacity().memory == float("inf")
+
+
+class TestPacking:
+    @staticmethod
+    def _run(capacity: resources.Capacity, **requests) -> int:
+        counter: dict[str, int] = {"running": 0, "peak": 0}
+        lock = threading.Lock()
+        tasks: list[task.Task] = [
+            task.Task(
+                name=f"stub_task_{i}",
+                action=pipelines_helpers.track_concurrency,
+                parameters={"counter": counter, "lock": lock},
+                **requests,
+            )
+            for i in range(4)
+        ]
+        executors.LocalExecutor(
+            executor=executors.Executors.THREADS, max_workers=4, capacity=capacity
+        ).run(dag=graph.DAG(nodes=tasks), run_time_parameters={}, on_complete=print)
+        return counter["peak"]
+
+    def test_packs_tasks_by_cpu(self) -> None:
+        assert self._run(capacity=resources.Capacity(cpu=2, memory=2**30), cpu=1) == 2
+
+    def test_packs_tasks_by_memory(self) -> None:
+        peak: int = self._run(
+            capacity=resources.Capacity(cpu=8, memory=2**30), memory="600Mi"
+        )
+
+        assert peak == 1
+
+    def test_runs_oversized_task_alone(self) -> None:
+        assert self._run(capacity=resources.Capacity(cpu=2, memory=2**30), cpu=4) == 1
+
+    def test_tasks_without_requests_use_worker_count(self) -> None:
+        assert self._run(capacity=resources.Capacity(cpu=1, memory=0)) == 4
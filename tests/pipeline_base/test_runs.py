@@ -0,0 +1,120 @@
+import asyncio
+import pathlib
+import subprocess
+import sys
+from datetime import timedelta
+
+import pytest
+
+from pipelines import pipeline, runs, task
+from tests.pipeline_base import pipelines_helpers
+
+
+class TestRunRecords:
+    def test_records_successful_attempt(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+
+        stub_pipeline.run(executor="processes")
+
+        record: runs.RunRecord = stub_pipeline.runs[-1]
+        (attempt,) = record.attempts
+        assert record.status is runs.Status.SUCCEEDED
+        assert attempt.status is runs.Status.SUCCEEDED
+        assert attempt.attempt == 1
+        assert (
+            record.started_at
+            <= attempt.queued_at
+            <= attempt.started_at
+            <= attempt.finished_at
+            <= record.finished_at
+        )
+        assert attempt.cpu_seconds is not None and attempt.cpu_seconds >= 0
+        assert attempt.peak_rss_bytes > 0
+
+    def test_records_failed_attempts_and_retries(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="failing_task",
+                    action=pipelines_helpers.failing_action,
+                    retries=1,
+                    retry_delay=timedelta(0),
+                )
+            ],
+        )
+
+        with pytest.raises(RuntimeError):
+            stub_pipeline.run(retry=True)
+
+        record: runs.RunRecord = stub_pipeline.runs[-1]
+        assert record.status is runs.Status.FAILED
+        assert [attempt.attempt for attempt in record.attempts] == [1, 2]
+        assert {attempt.error for attempt in record.attempts} == {
+            "RuntimeError('stub failure')"
+        }
+
+    def test_records_src_task_usage(self, tmp_path: pathlib.Path) -> None:
+        stub_script = tmp_path / "stub_script.py"
+        stub_script.write_text("if __name__ == '__main__': pass")
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline", tasks=[task.Task(name="stub_task", src=stub_script)]
+        )
+
+        stub_pipeline.run()
+
+        assert stub_pipeline.runs[-1].attempts[0].peak_rss_bytes > 0
+
+    def test_records_async_attempts(self) -> None:
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+
+        asyncio.run(stub_pipeline.arun())
+
+        assert stub_pipeline.runs[-1].attempts_of(task_name="stub_task")[0].usage
+
+    def test_keeps_a_bounded_number_of_runs(self, monkeypatch) -> None:
+        monkeypatch.setattr(runs, "MAX_RUNS", 2)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+
+        for _ in range(3):
+            stub_pipeline.run()
+
+        assert len(stub_pipeline.runs) == 2
+        assert len(stub_pipeline.log) == 1
+
+
+class TestWithoutResourceModule:
+    def test_imports_without_resource_module(self) -> None:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.modules['resource'] = None; import pipelines.pipeline",
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_records_no_usage(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setitem(sys.modules, "resource", None)
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[task.Task(name="stub_task", action=pipelines_helpers.stub_action)],
+        )
+
+        stub_pipeline.run()
+
+        (attempt,) = stub_pipeline.runs[-1].attempts
+        assert attempt.status is runs.Status.SUCCEEDED
+        assert attempt.usage is None
@@ -0,0 +1,147 @@
+import dataclasses
+
+from pipelines._internal import graph, scheduler
+
+
+@dataclasses.dataclass
+class StubNode:
+    name: str
+    depends_on: list[str]
+
+
+class TestScheduler:
+    def test_roots_are_ready(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=[]),
+                StubNode(name="c", depends_on=["a", "b"]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+
+        assert [node.name for node in dag_scheduler.take_ready()] == ["a", "b"]
+        assert dag_scheduler.running == {"a", "b"}
+
+    def test_node_is_ready_once_all_dependencies_are_done(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=[]),
+                StubNode(name="c", depends_on=["a", "b"]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+        list(dag_scheduler.take_ready())
+
+        assert dag_scheduler.mark_done(name="a") == []
+        assert dag_scheduler.mark_done(name="b") == ["c"]
+        assert [node.name for node in dag_scheduler.take_ready()] == ["c"]
+
+    def test_take_ready_respects_limit(self) -> None:
+        dag = graph.DAG(
+            nodes=[StubNode(name=name, depends_on=[]) for name in ["a", "b", "c"]]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+
+        assert len(list(dag_scheduler.take_ready(limit=2))) == 2
+        assert dag_scheduler.pending == {"c"}
+
+    def test_passes_over_nodes_that_do_not_fit(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="big", depends_on=[]),
+                StubNode(name="big_child", depends_on=["big"]),
+                StubNode(name="small", depends_on=[]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+
+        taken = dag_scheduler.take_ready(fits=lambda node: node.name != "big")
+
+        assert [node.name for node in taken] == ["small"]
+        assert dag_scheduler.pending == {"big", "big_child"}
+        assert [node.name for node in dag_scheduler.take_ready()] == ["big"]
+
+    def test_taken_nodes_are_not_handed_out_again(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=["a"]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+        list(dag_scheduler.take_ready())
+        dag_scheduler.take(names=["b"])
+
+        assert dag_scheduler.mark_done(name="a") == []
+        assert list(dag_scheduler.take_ready()) == []
+        assert dag_scheduler.running == {"b"}
+
+    def test_ignores_dependencies_outside_of_dag(self) -> None:
+        dag = graph.DAG(nodes=[StubNode(name="b", depends_on=["a"])])
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+
+        assert [node.name for node in dag_scheduler.take_ready()] == ["b"]
+
+    def test_finished(self) -> None:
+        dag = graph.DAG(nodes=[StubNode(name="a", depends_on=[])])
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+        list(dag_scheduler.take_ready())
+
+        dag_scheduler.mark_done(name="a")
+
+        assert dag_scheduler.finished
+
+    def test_hands_out_longest_chain_first(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="short", depends_on=[]),
+                StubNode(name="long_1", depends_on=[]),
+                StubNode(name="long_2", depends_on=["long_1"]),
+                StubNode(name="long_3", depends_on=["long_2"]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(dag=dag)
+
+        assert [node.name for node in dag_scheduler.take_ready(limit=1)] == ["long_1"]
+
+    def test_weights_chains_by_duration(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="short", depends_on=[]),
+                StubNode(name="long_1", depends_on=[]),
+                StubNode(name="long_2", depends_on=["long_1"]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(
+            dag=dag, durations={"short": 10.0, "long_1": 1.0, "long_2": 1.0}
+        )
+
+        assert [node.name for node in dag_scheduler.take_ready(limit=1)] == ["short"]
+
+
+class TestCriticalPathLengths:
+    def test_defaults_to_mean_known_duration(self) -> None:
+        lengths = scheduler.critical_path_lengths(
+            downstream={"a": ["b"], "b": []},
+            upstream={"a": set(), "b": {"a"}},
+            durations={"b": 4.0},
+        )
+
+        assert lengths == {"a": 8.0, "b": 4.0}
+
+    def test_critical_path_follows_longest_durations(self) -> None:
+        dag = graph.DAG(
+            nodes=[
+                StubNode(name="a", depends_on=[]),
+                StubNode(name="b", depends_on=["a"]),
+                StubNode(name="c", depends_on=["a"]),
+                StubNode(name="d", depends_on=[]),
+            ]
+        )
+        dag_scheduler = scheduler.Scheduler(
+            dag=dag, durations={"a": 1.0, "b": 1.0, "c": 5.0, "d": 5.0}
+        )
+
+        assert dag_scheduler.critical_path() == ["a", "c"]
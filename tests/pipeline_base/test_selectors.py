@@ -0,0 +1,95 @@
+import pytest
+
+from pipelines import pipeline, selectors, task
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_stub_tasks() -> list[task.Task]:
+    "extract -> clean -> report, extract -> audit, with export independent."
+    return [
+        task.Task(name="extract", action=pipelines_helpers.stub_action, tags=["daily"]),
+        task.Task(
+            name="clean",
+            action=pipelines_helpers.stub_action,
+            depends_on=["extract"],
+            tags=["daily"],
+        ),
+        task.Task(
+            name="report", action=pipelines_helpers.stub_action, depends_on=["clean"]
+        ),
+        task.Task(
+            name="audit",
+            action=pipelines_helpers.stub_action,
+            depends_on=["extract"],
+            tags=["weekly"],
+        ),
+        task.Task(name="export", action=pipelines_helpers.stub_action, tags=["daily"]),
+    ]
+
+
+class TestSelect:
+    @pytest.mark.parametrize(
+        "selected, expected",
+        [
+            (["clean"], ["clean"]),
+            (["+report"], ["extract", "clean", "report"]),
+            (["extract+"], ["extract", "clean", "report", "audit"]),
+            (["+clean+"], ["extract", "clean", "report"]),
+            (["tag:daily"], ["extract", "clean", "export"]),
+            (["tag:weekly+"], ["audit"]),
+            (["report", "audit"], ["report", "audit"]),
+            (["report audit"], ["report", "audit"]),
+            (["tag:daily,+report"], ["extract", "clean"]),
+            (["extract+,+report audit"], ["extract", "clean", "report", "audit"]),
+        ],
+    )
+    def test_selects_tasks(self, selected: list[str], expected: list[str]) -> None:
+        nodes: list[task.Task] = selectors.select(
+            selectors=selected, nodes=get_stub_tasks()
+        )
+
+        assert [node.name for node in nodes] == expected
+
+    @pytest.mark.parametrize("selector", ["missing", "+tag:monthly", "+"])
+    def test_raises_for_selector_without_tasks(self, selector: str) -> None:
+        with pytest.raises(ValueError, match="Invalid selector"):
+            selectors.select(selectors=[selector], nodes=get_stub_tasks())
+
+
+class TestPipeline:
+    def test_select_returns_task_names(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=get_stub_tasks())
+
+        assert stub_pipeline.select(selectors="+report") == [
+            "extract",
+            "clean",
+            "report",
+        ]
+
+    def test_select_reuses_reachability_index(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=get_stub_tasks())
+        stub_pipeline.select(selectors="+report")
+        reachability = stub_pipeline.dag.reachability
+
+        stub_pipeline.select(selectors="extract+")
+
+        assert stub_pipeline.dag.reachability is reachability
+
+    def test_runs_selected_tasks_with_their_upstream(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline", tasks=get_stub_tasks())
+
+        stub_pipeline.run(task_names=["+report"])
+
+        assert [node.name for node in stub_pipeline.log] == [
+            "extract",
+            "clean",
+            "report",
+        ]
+
+    def test_add_task_sets_tags(self) -> None:
+        stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+        stub_pipeline.add_task(
+            name="stub_task", action=pipelines_helpers.stub_action, tags=["daily"]
+        )
+
+        assert stub_pipeline.select(selectors="tag:daily") == ["stub_task"]
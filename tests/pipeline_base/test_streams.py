@@ -0,0 +1,117 @@
+import pytest
+
+from pipelines import executors, pipeline, streams, task
+from pipelines._internal import graph
+from tests.pipeline_base import pipelines_helpers
+
+
+def get_progress() -> dict[str, int]:
+    return {"produced": 0, "consumed": 0, "lag": 0}
+
+
+def get_streaming_pipeline(
+    progress: dict[str, int], count: int = 100
+) -> pipeline.Pipeline:
+    stub_pipeline = pipeline.Pipeline(name="stub_pipeline")
+    stub_pipeline.add_task(
+        name="extract",
+        action=pipelines_helpers.produce_batches,
+        parameters={"count": count, "progress": progress},
+    )
+    stub_pipeline.add_task(
+        name="transform",
+        action=pipelines_helpers.double_batches,
+        streams_from="extract",
+    )
+    stub_pipeline.add_task(
+        name="load",
+        action=pipelines_helpers.consume_batches,
+        parameters={"progress": progress},
+        streams_from="transform",
+    )
+    return stub_pipeline
+
+
+class TestStreams:
+    def test_streams_batches_between_tasks(self) -> None:
+        progress = get_progress()
+        stub_pipeline = get_streaming_pipeline(progress=progress, count=10)
+
+        results = stub_pipeline.run()
+
+        assert results == {"extract": None, "transform": None, "load": 90}
+        assert [node.name for node in stub_pipeline.log] == [
+            "extract",
+            "transform",
+            "load",
+        ]
+
+    def test_bounds_batches_waiting_between_stages(self) -> None:
+        progress = get_progress()
+        stub_pipeline = get_streaming_pipeline(progress=progress)
+
+        executors.LocalExecutor(stream_depth=2).run(
+            dag=graph.DAG(nodes=stub_pipeline.tasks),
+            run_time_parameters={},
+            on_complete=print,
+        )
+
+        assert progress["consumed"] == 100
+        # each of the two queues, plus a batch held by each of the three stages
+        assert progress["lag"] <= 2 * 2 + 3
+
+    def test_downstream_of_stream_waits_for_it(self) -> None:
+        progress = get_progress()
+        stub_pipeline = get_streaming_pipeline(progress=progress, count=10)
+        stub_pipeline.add_task(
+            name="report", action=pipelines_helpers.stub_action, after="load"
+        )
+
+        stub_pipeline.run(executor="threads")
+
+        assert [node.name for node in stub_pipeline.log][-1] == "report"
+
+    def test_failed_stage_fails_the_group(self) -> None:
+        progress = get_progress()
+        stub_pipeline = pipeline.Pipeline(
+            name="stub_pipeline",
+            tasks=[
+                task.Task(
+                    name="extract",
+                    action=pipelines_helpers.produce_batches,
+                    parameters={"count": 1000, "progress": progress},
+                    retries=0,
+                ),
+                task.Task(
+                    name="load",
+                    action=pipelines_helpers.fail_on_batch,
+                    depends_on=["extract"],
+                    streams_from="extract",
+                ),
+            ],
+        )
+
+        with pytest.raises(RuntimeError, match="stub failure"):
+            stub_pipeline.run()
+
+        assert progress["produced"] < 1000
+        assert stub_pipeline.log == []
+
+    def test_streaming_task_cannot_have_other_dependencies(self) -> None:
+        stub_pipeline = get_streaming_pipeline(progress=get_progress())
+
+        with pytest.raises(ValueError, match="can only depend on the task they stream"):
+            stub_pipeline.add_task(
+                name="other_load",
+                action=pipelines_helpers.consume_batches,
+                after="load",
+                streams_from="transform",
+            )
+
+    def test_groups_chains_head_first(self) -> None:
+        stub_pipeline = get_streaming_pipeline(progress=get_progress())
+
+        assert {
+            head: [member.name for member in members]
+            for head, members in streams.groups(nodes=stub_pipeline.tasks).items()
+        } == {"extract": ["extract", "transform", "load"]}
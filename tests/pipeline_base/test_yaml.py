@@ -62,6 +62,43 @@ class TestTask:
 
         assert actual_task == expected_task
 
+    def test_round_trips_optional_fields(self) -> None:
+        compiler = yaml.Yaml()
+        stub_task = task.Task(
+            name="stub_task",
+            action=pipelines_helpers.stub_action,
+            src=pathlib.Path(__file__).parent,
+            cpu=0.5,
+            memory="512Mi",
+            timeout=timedelta(minutes=30),
+            pool="warehouse",
+            tags=["daily", "sales"],
+        )
+
+        artifact: str = compiler.compile(object=stub_task)
+
+        assert "cpu: 0.5\n" in artifact
+        assert "timeout: 1800.0\n" in artifact
+        assert "memory: 512Mi\n" in artifact
+        assert "pool: warehouse\n" in artifact
+        assert "tags:\n- daily\n- sales\n" in artifact
+        assert compiler.decompile(artifact=artifact, object=task.Task) == stub_task
+
+    def test_round_trips_mapped_task(self) -> None:
+        compiler = yaml.Yaml()
+        stub_task = task.Task(
+            name="stub_task",
+            action=pipelines_helpers.multiply,
+            src=pathlib.Path(__file__).parent,
+            map_over={"value": [1, 2, 3]},
+            reduce=pipelines_helpers.total,
+        )
+
+        artifact: str = compiler.compile(object=stub_task)
+
+        assert "reduce: total\n" in artifact
+        assert compiler.decompile(artifact=artifact, object=task.Task) == stub_task
+
 
 class TestPipeline:
     def test_can_compile_single_task(self) -> None: